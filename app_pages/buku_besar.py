@@ -0,0 +1,3 @@
+from buffabook.views.journal import show_buku_besar
+
+show_buku_besar()
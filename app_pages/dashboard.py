@@ -0,0 +1,3 @@
+from buffabook.views.dashboard import show_dashboard
+
+show_dashboard()
@@ -0,0 +1,3 @@
+from buffabook.views.journal import show_jurnal_umum
+
+show_jurnal_umum()
@@ -0,0 +1,3 @@
+from buffabook.views.journal import show_jurnal_penyesuaian
+
+show_jurnal_penyesuaian()
@@ -0,0 +1,3 @@
+from buffabook.views.journal import show_view_jurnal
+
+show_view_jurnal()
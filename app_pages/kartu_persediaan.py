@@ -0,0 +1,3 @@
+from buffabook.views.inventory import show_kartu_persediaan
+
+show_kartu_persediaan()
@@ -0,0 +1,3 @@
+from buffabook.views.reports import show_laba_rugi
+
+show_laba_rugi()
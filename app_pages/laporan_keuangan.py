@@ -0,0 +1,3 @@
+from buffabook.views.reports import show_laporan_keuangan
+
+show_laporan_keuangan()
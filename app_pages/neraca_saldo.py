@@ -0,0 +1,3 @@
+from buffabook.views.journal import show_neraca_saldo
+
+show_neraca_saldo()
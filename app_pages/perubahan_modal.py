@@ -0,0 +1,3 @@
+from buffabook.views.reports import show_perubahan_modal
+
+show_perubahan_modal()
@@ -0,0 +1,3 @@
+from buffabook.views.reports import show_neraca
+
+show_neraca()
@@ -0,0 +1,3 @@
+from buffabook.views.inventory import show_ringkasan_penjualan
+
+show_ringkasan_penjualan()
@@ -0,0 +1 @@
+"""BuffaBook - sistem informasi akuntansi peternakan kerbau"""
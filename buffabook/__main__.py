@@ -0,0 +1,3 @@
+from buffabook.cli import main
+
+raise SystemExit(main())
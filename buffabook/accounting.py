@@ -0,0 +1,391 @@
+"""Bagan akun, posting jurnal, Buku Besar, saldo dan indeks pencarian jurnal"""
+import streamlit as st
+from openpyxl import Workbook, load_workbook
+import pandas as pd
+import numpy as np
+import os
+import re
+import uuid
+import logging
+
+from buffabook.tenant import journal_file, search_db_file, tenant_dir, write_lock
+from buffabook.db import connection, ensure_schema, transaction
+from buffabook.values import from_sen, to_sen, to_sen_column
+from buffabook.storage import AGE_CLASSES, ANIMAL_SEXES, _iso_date, _read_sheets, animal_product_name, save_workbook
+
+logger = logging.getLogger('buffabook.accounting')
+
+# Kolom ID Transaksi: ID tetap di baris pertama setiap transaksi (tidak bergeser saat baris lain dihapus)
+JOURNAL_HEADER = ["Tanggal", "Akun", "Debit", "Kredit", "Keterangan", "ID Transaksi"]
+
+ACCOUNTS = {
+    "1-10000": "Kas",
+    "1-11000": "Piutang",
+    "1-12000": "Persediaan Kerbau Dewasa Jantan",
+    "1-12100": "Persediaan Kerbau Dewasa Betina",
+    "1-12200": "Persediaan Kerbau Remaja Jantan",
+    "1-12300": "Persediaan Kerbau Remaja Betina",
+    "1-12400": "Persediaan Anak Kerbau Jantan",
+    "1-12500": "Persediaan Anak Kerbau Betina",
+    "1-20000": "Kendaraan",
+    "1-21000": "Kandang",
+    "1-22000": "Peralatan",
+    "1-23000": "Akumulasi Penyusutan Kendaraan",
+    "1-23100": "Akumulasi Penyusutan Kandang",
+    "1-23200": "Akumulasi Penyusutan Peralatan",
+    "2-10000": "Utang Usaha",
+    "2-20000": "Utang Bank",
+    "2-30000": "Pendapatan Diterima di Muka",
+    "2-31000": "Utang Gaji",
+    "3-30000": "Modal",
+    "3-40000": "Prive",
+    "4-40000": "Pendapatan",
+    "5-50000": "HPP",
+    "6-60000": "Beban Pakan",
+    "6-60100": "Beban Listrik & Air",
+    "6-60200": "Beban Gaji",
+    "6-60300": "Beban Lain-lain",
+    "6-60400": "Beban Penyusutan Kendaraan",
+    "6-60500": "Beban Penyusutan Kandang",
+    "6-60600": "Beban Penyusutan Peralatan",
+    "6-60700": "Beban Perlengkapan",
+    "6-60800": "Beban Selisih Persediaan"
+}
+    
+def get_inventory_account(product_name):
+    """Mengembalikan akun persediaan berdasarkan nama produk"""
+    product_to_account = {
+        "Kerbau Dewasa Jantan": "1-12000 - Persediaan Kerbau Dewasa Jantan",
+        "Kerbau Dewasa Betina": "1-12100 - Persediaan Kerbau Dewasa Betina", 
+        "Kerbau Remaja Jantan": "1-12200 - Persediaan Kerbau Remaja Jantan",
+        "Kerbau Remaja Betina": "1-12300 - Persediaan Kerbau Remaja Betina",
+        "Anak Kerbau Jantan": "1-12400 - Persediaan Anak Kerbau Jantan",
+        "Anak Kerbau Betina": "1-12500 - Persediaan Anak Kerbau Betina"
+    }
+    
+    for key, account in product_to_account.items():
+        if key.lower() in product_name.lower():
+            return account
+    
+    return "1-12000 - Persediaan Kerbau Dewasa Jantan"
+
+def create_journal_workbook():
+    """Create journal_ledger.xlsx if not exists"""
+    if os.path.exists(journal_file()):
+        return
+    with write_lock():
+        if not os.path.exists(journal_file()):
+            tenant_dir(create=True)
+            wb = Workbook()
+        
+            # Jurnal Umum sheet
+            ws_journal = wb.active
+            ws_journal.title = "Jurnal Umum"
+            ws_journal.append(JOURNAL_HEADER)
+        
+            # Buku Besar sheet
+            ws_ledger = wb.create_sheet("Buku Besar")
+            ws_ledger.append(["Akun", "Tanggal", "Keterangan", "Debit", "Kredit", "Saldo"])
+        
+            save_journal_workbook(wb)
+
+def post_journal_entry(wb_journal, date_str, keterangan, lines, balances=None):
+    """Tulis satu transaksi majemuk ke Jurnal Umum dan Buku Besar (belum disimpan).
+    
+    lines: list (akun, debit, kredit). Baris debit ditulis lebih dulu, lalu kredit.
+    balances: saldo per akun (sen) dari ledger_balances_sen; berikan saat memposting banyak
+    transaksi sekaligus agar Buku Besar tidak dipindai ulang tiap transaksi.
+    Return ID transaksi yang ditulis di kolom ID Transaksi.
+    """
+    ws_journal = wb_journal['Jurnal Umum']
+    ws_ledger = wb_journal['Buku Besar']
+    # File lama belum punya kolom ID Transaksi
+    if ws_journal.cell(row=1, column=6).value is None:
+        ws_journal.cell(row=1, column=6, value=JOURNAL_HEADER[5])
+    txn_id = uuid.uuid4().hex[:12]
+    
+    debit_lines = [line for line in lines if line[1]]
+    credit_lines = [line for line in lines if line[2]]
+    ordered = debit_lines + credit_lines
+    
+    for i, (account, debit, kredit) in enumerate(ordered):
+        ws_journal.append([
+            date_str if i == 0 else "",
+            account,
+            debit,
+            kredit,
+            keterangan if i == 0 else "",
+            txn_id if i == 0 else ""
+        ])
+    ws_journal.append(["", "", "", "", ""])
+    
+    if balances is None:
+        balances = ledger_balances_sen(ws_ledger)
+    for account, debit, kredit in ordered:
+        append_ledger_line(ws_ledger, balances, account, date_str, keterangan, debit, kredit)
+    return txn_id
+
+# ========== FULL-TEXT SEARCH JURNAL (SQLite FTS5) ==========
+
+SEARCH_SCHEMA = (
+    """
+        CREATE VIRTUAL TABLE IF NOT EXISTS journal_fts USING fts5(
+            keterangan, akun, produk, txn_id UNINDEXED, tanggal UNINDEXED,
+            tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+        )
+    """,
+    'CREATE TABLE IF NOT EXISTS search_meta (key TEXT PRIMARY KEY, value TEXT)',
+)
+
+def _search_db():
+    """File indeks pencarian tenant aktif (skema dibuat sekali per proses); satu dokumen FTS5 per transaksi jurnal"""
+    path = search_db_file()
+    ensure_schema(path, *SEARCH_SCHEMA)
+    return path
+
+def _journal_documents(ws_journal, min_row=2):
+    """Dokumen pencarian untuk transaksi yang dimulai pada/setelah min_row.
+    ID transaksi = nomor baris pertamanya di Jurnal Umum (sama dengan kolom ID di indeks query)"""
+    products = [animal_product_name(age_class, sex) for age_class in AGE_CLASSES for sex in ANIMAL_SEXES]
+    transactions = []
+    for i, row in enumerate(ws_journal.iter_rows(min_row=min_row, max_col=5, values_only=True), min_row):
+        if row[0] not in (None, ''):
+            transactions.append((i, _iso_date(row[0]), str(row[4] or ''), []))
+        if row[1] and transactions:
+            transactions[-1][3].append(str(row[1]))
+    
+    documents = []
+    for txn_id, tanggal, keterangan, accounts in transactions:
+        text = f"{keterangan} {' '.join(accounts)}".lower()
+        produk = ' | '.join(product for product in products if product.lower() in text)
+        documents.append((keterangan, ' | '.join(accounts), produk, txn_id, tanggal))
+    return documents
+
+def sync_journal_search(wb_journal, previous_mtime=None, rebuild=False, path=None, mtime=None):
+    """Perbarui indeks pencarian setelah journal_ledger.xlsx disimpan.
+    
+    Posting hanya menambah baris di akhir jurnal, jadi cukup mengindeks transaksi setelah
+    baris terakhir yang sudah terindeks. Hapus/reset (baris bergeser) atau file yang berubah
+    di luar aplikasi membuat indeks dibangun ulang penuh.
+    mtime: mtime file saat wb_journal dibaca/disimpan (default: mtime file sekarang).
+    """
+    path = path or journal_file()
+    if mtime is None:
+        mtime = os.path.getmtime(path)
+    ws_journal = wb_journal['Jurnal Umum']
+    try:
+        with transaction(_search_db()) as conn:
+            meta = dict(conn.execute('SELECT key, value FROM search_meta'))
+            indexed_rows = int(meta.get('indexed_rows', 0))
+            if (rebuild or ws_journal.max_row < indexed_rows
+                    or meta.get('mtime') != (repr(previous_mtime) if previous_mtime is not None else None)):
+                conn.execute('DELETE FROM journal_fts')
+                indexed_rows = 1
+            conn.executemany('INSERT INTO journal_fts (keterangan, akun, produk, txn_id, tanggal) VALUES (?, ?, ?, ?, ?)',
+                             _journal_documents(ws_journal, indexed_rows + 1))
+            conn.executemany('INSERT OR REPLACE INTO search_meta (key, value) VALUES (?, ?)',
+                             [('indexed_rows', str(ws_journal.max_row)), ('mtime', repr(mtime))])
+    except Exception:
+        # Indeks tidak boleh menggagalkan posting; tanpa meta, pencarian berikutnya membangun ulang
+        logger.exception("Indeks pencarian jurnal gagal diperbarui")
+        try:
+            with transaction(_search_db()) as conn:
+                conn.execute('DELETE FROM search_meta')
+        except Exception:
+            logger.exception("Meta indeks pencarian jurnal gagal dikosongkan")
+
+def save_journal_workbook(wb_journal, rebuild=False, path=None):
+    """Simpan journal_ledger.xlsx lalu perbarui indeks pencarian secara inkremental"""
+    path = path or journal_file()
+    previous_mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    save_workbook(wb_journal, path)
+    sync_journal_search(wb_journal, previous_mtime, rebuild, path)
+
+def ensure_journal_search(path=None):
+    """Bangun ulang indeks jika jurnal berubah tanpa lewat save_journal_workbook"""
+    path = path or journal_file()
+    create_journal_workbook()
+    with connection(_search_db()) as conn:
+        row = conn.execute("SELECT value FROM search_meta WHERE key = 'mtime'").fetchone()
+    mtime = os.path.getmtime(path)
+    if row is None or row[0] != repr(mtime):
+        # Catat mtime sebelum membaca: jika jurnal disimpan selama rebuild, mtime yang tercatat
+        # sudah usang dan pencarian berikutnya membangun ulang lagi
+        wb = load_workbook(path)
+        try:
+            sync_journal_search(wb, rebuild=True, path=path, mtime=mtime)
+        finally:
+            wb.close()
+
+def search_journal(query, limit=50, path=None):
+    """Cari transaksi jurnal; setiap kata dicocokkan sebagai prefix (AND).
+    Return DataFrame txn_id, tanggal, keterangan urut relevansi"""
+    path = path or journal_file()
+    terms = re.findall(r'\w+', query.lower())
+    if not terms:
+        return pd.DataFrame(columns=['txn_id', 'tanggal', 'keterangan'])
+    ensure_journal_search(path)
+    with connection(_search_db()) as conn:
+        rows = conn.execute(
+            'SELECT txn_id, tanggal, keterangan FROM journal_fts WHERE journal_fts MATCH ? ORDER BY rank LIMIT ?',
+            (' '.join(f'"{term}"*' for term in terms), limit)).fetchall()
+    return pd.DataFrame(rows, columns=['txn_id', 'tanggal', 'keterangan'])
+
+def ledger_balances_sen(ws_ledger):
+    """Saldo per akun di Buku Besar (debit - kredit), dalam sen.
+    Dihitung dari mutasi, bukan kolom Saldo, agar saldo lama yang salah tanda tidak terbawa."""
+    balances = {}
+    for row in ws_ledger.iter_rows(min_row=2, max_col=5, values_only=True):
+        if row and row[0]:
+            balances[row[0]] = balances.get(row[0], 0) + to_sen(row[3] or 0) - to_sen(row[4] or 0)
+    return balances
+
+def append_ledger_line(ws_ledger, balances, account, date_str, keterangan, debit, kredit):
+    """Tambah satu baris Buku Besar; saldo berjalan (debit - kredit) dihitung dalam sen"""
+    balance = balances.get(account, 0) + to_sen(debit) - to_sen(kredit)
+    balances[account] = balance
+    ws_ledger.append([account, date_str, keterangan, debit, kredit, from_sen(balance)])
+
+def ledger_running_balances_sen(accounts, debit_sen, kredit_sen):
+    """Saldo berjalan (debit - kredit) seluruh baris Buku Besar sekaligus: cumsum int64 per akun"""
+    movement = debit_sen - kredit_sen
+    return pd.Series(movement).groupby(np.asarray(accounts)).cumsum().to_numpy(dtype='int64')
+
+def compute_ledger_balances(path):
+    """Saldo akhir per akun (debit - kredit) dari mutasi Buku Besar tanpa cache Streamlit
+    (juga dipakai di proses worker). Kolom Saldo tersimpan tidak dipakai: file lama bisa bercampur tanda."""
+    ledger = _read_sheets(path, ['Buku Besar'], [6])['Buku Besar']
+    ledger = ledger[ledger[0].notna() & (ledger[0].astype(str) != '')]
+    accounts = ledger[0].astype(str)
+    movement = pd.Series(to_sen_column(ledger[3]) - to_sen_column(ledger[4]), index=ledger.index)
+    # Urut sesuai kemunculan pertama akun
+    latest = movement.groupby(accounts, sort=False).sum().astype('int64')
+    # astype(str): Buku Besar kosong (farm baru) menghasilkan indeks float tanpa accessor .str
+    names = latest.index.to_series().astype(str)
+    parts = names.str.split(' - ', n=1, expand=True).reindex(columns=[0, 1])
+    return pd.DataFrame({
+        'account': names.values,
+        'account_num': parts[0].fillna(names).astype(str).str.strip().values,
+        'account_name': parts[1].fillna(names).values,
+        'saldo_sen': latest.values,
+    })
+
+@st.cache_data(show_spinner=False)
+def _ledger_balances_cached(journal_mtime, path):
+    return compute_ledger_balances(path)
+
+def load_ledger_balances(path=None):
+    """Saldo terakhir per akun (kolom saldo_sen int64), di-cache sampai file jurnal berubah"""
+    path = path or journal_file()
+    create_journal_workbook()
+    return _ledger_balances_cached(os.path.getmtime(path), path)
+
+def ledger_balance_dict(balances):
+    """Bentuk dict akun -> {account_num, account_name, latest_saldo} untuk tampilan per baris"""
+    return {
+        account: {'account_num': num, 'account_name': name, 'latest_saldo': from_sen(sen)}
+        for account, num, name, sen in zip(balances['account'], balances['account_num'],
+                                           balances['account_name'], balances['saldo_sen'])
+    }
+
+def statement_totals_sen(balances):
+    """Total tiap kelompok akun laporan keuangan dalam sen, dihitung dengan mask vectorized"""
+    num = balances['account_num'].astype(str)
+    nominal = balances['saldo_sen'].abs()
+    is_accumulation = balances['account_name'].astype(str).str.lower().str.contains(
+        'akumulasi|accumulation|penyusutan|depreciation')
+    is_fixed = num.str.startswith(('1-2', '12'))
+    
+    def total(mask):
+        return int(nominal[mask].sum())
+    
+    return {
+        'pendapatan': total(num.str.startswith('4')),
+        'hpp': total(num.str.startswith('5')),
+        'beban': total(num.str.startswith('6')),
+        'modal_awal': total(num.isin(['3-30000', '30000'])),
+        'prive': total(num.isin(['3-40000', '40000'])),
+        'aset_lancar': total(num.str.startswith(('1-1', '11'))),
+        'aset_tetap_bruto': total(is_fixed & ~is_accumulation),
+        'akumulasi_penyusutan': total(is_fixed & is_accumulation),
+        'liabilitas_pendek': total(num.str.startswith(('2-1', '21'))),
+        'liabilitas_panjang': total(num.str.startswith(('2-2', '22'))),
+    }
+
+def delete_journal_transaction(keterangan, row_indices):
+    """Hapus satu transaksi lengkap berdasarkan keterangan"""
+    try:
+        with write_lock():
+            wb = load_workbook(journal_file())
+            ws_journal = wb['Jurnal Umum']
+            ws_ledger = wb['Buku Besar']
+ 
+            for row_idx in sorted(row_indices, reverse=True):
+                if row_idx <= ws_journal.max_row:
+                    ws_journal.delete_rows(row_idx)
+
+            rows_to_delete_ledger = []
+        
+            for i, row in enumerate(ws_ledger.iter_rows(min_row=2, values_only=True), 2):
+                if row and row[2] and str(row[2]) == str(keterangan):
+                    rows_to_delete_ledger.append(i)
+
+            for row_idx in sorted(rows_to_delete_ledger, reverse=True):
+                if row_idx <= ws_ledger.max_row:
+                    ws_ledger.delete_rows(row_idx)
+
+            recalculate_all_ledger_balances_ws(ws_ledger)
+        
+            # Baris jurnal bergeser, indeks pencarian dibangun ulang
+            save_journal_workbook(wb, rebuild=True)
+            wb.close()
+        
+        return True
+        
+    except Exception as e:
+        st.error(f"Error dalam delete_journal_transaction: {e}")
+        return False
+
+def recalculate_ledger_ws(ws_ledger):
+    """Hitung ulang semua saldo berjalan di Buku Besar; exception diteruskan ke pemanggil"""
+    rows = [row for row in ws_ledger.iter_rows(min_row=2, values_only=False) if row[0].value]
+    if not rows:
+        return
+    
+    accounts = [str(row[0].value) for row in rows]
+    debit_sen = to_sen_column([row[3].value for row in rows])
+    kredit_sen = to_sen_column([row[4].value for row in rows])
+    
+    # Konvensi sama dengan append_ledger_line: debit - kredit; tampilan memakai nilai absolut
+    # untuk akun bersaldo normal kredit
+    balances = ledger_running_balances_sen(accounts, debit_sen, kredit_sen)
+    for row, balance in zip(rows, balances):
+        row[5].value = from_sen(balance)
+
+def recalculate_all_ledger_balances_ws(ws_ledger):
+    """Hitung ulang semua saldo di Buku Besar (versi dengan worksheet)"""
+    try:
+        recalculate_ledger_ws(ws_ledger)
+        return True
+        
+    except Exception as e:
+        st.error(f"Error dalam recalculate_all_ledger_balances_ws: {e}")
+        return False
+
+def recalculate_all_ledger_balances():
+    """Hitung ulang semua saldo di Buku Besar (versi standalone)"""
+    try:
+        with write_lock():
+            wb = load_workbook(journal_file())
+            ws_ledger = wb['Buku Besar']
+        
+            success = recalculate_all_ledger_balances_ws(ws_ledger)
+        
+            save_journal_workbook(wb)
+            wb.close()
+        
+        return success
+        
+    except Exception as e:
+        st.error(f"Error dalam recalculate_all_ledger_balances: {e}")
+        return False
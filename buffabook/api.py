@@ -0,0 +1,616 @@
+"""API akuntansi tanpa UI: posting pembelian, penjualan dan jurnal, hitung ulang saldo, neraca saldo
+dan laba rugi. Dipakai halaman Streamlit, skrip, batch job dan pengujian.
+
+Fungsi mengembalikan dataclass hasil dan melempar AccountingError (tidak memanggil st.error/st.rerun).
+Data yang dipakai adalah milik tenant aktif; di luar Streamlit pilih farm dengan tenant.use_tenant().
+"""
+import streamlit as st
+import openpyxl
+from openpyxl import load_workbook
+import pandas as pd
+import os
+import math
+from dataclasses import dataclass
+from datetime import datetime, date as date_type
+
+from buffabook.tenant import data_file, journal_file, write_lock
+from buffabook.values import (
+    DEFAULT_UNIT, format_rupiah, from_sen, safe_parse_int_from_qtytext, safe_parse_price, to_rupiah, to_sen,
+    to_sen_column
+)
+from buffabook.storage import DEFAULT_LOCATION, _read_sheets, animal_product_name, rollback_on_error, save_workbook
+from buffabook.accounting import (
+    ACCOUNTS, create_journal_workbook, get_inventory_account, ledger_balances_sen, post_journal_entry,
+    recalculate_ledger_ws, save_journal_workbook
+)
+from buffabook.inventory import (
+    STOCK_VARIANCE_ACCOUNT, _animal_iso_date, _ensure_adjustment_sheet, _ensure_animal_sheet, _location_index_apply,
+    _registry_index_add, _registry_index_remove, commit_reserved_stock, load_animal_registry, load_location_index, product_locations, untagged_stock_error
+)
+
+PAYMENT_METHODS = ("Tunai", "Kredit")
+# Akun yang boleh dipakai di jurnal, dengan format pilihan di form Jurnal Umum ('1-10000 - Kas')
+ACCOUNT_LABELS = frozenset(f"{code} - {name}" for code, name in ACCOUNTS.items())
+
+
+# ========== EXCEPTION ==========
+class AccountingError(Exception):
+    """Transaksi ditolak oleh aturan akuntansi/persediaan"""
+
+class ValidationError(AccountingError, ValueError):
+    """Input transaksi tidak valid"""
+
+class UnbalancedEntryError(ValidationError):
+    """Total debit tidak sama dengan total kredit"""
+
+class InsufficientStockError(AccountingError):
+    """Stok tidak cukup untuk penjualan"""
+
+
+# ========== TIPE HASIL ==========
+@dataclass(frozen=True)
+class JournalLine:
+    account: str
+    debit: float = 0
+    kredit: float = 0
+
+@dataclass(frozen=True)
+class PostedEntry:
+    """Satu transaksi yang sudah tertulis di Jurnal Umum dan Buku Besar.
+    txn_id = isi kolom ID Transaksi; tetap sama walau transaksi lain dihapus"""
+    date: str
+    keterangan: str
+    lines: tuple
+    txn_id: str = None
+
+@dataclass(frozen=True)
+class PurchaseResult:
+    entry: PostedEntry
+    product_name: str
+    quantity: int
+    unit: str
+    total: float
+    average_price: float
+
+@dataclass(frozen=True)
+class SaleOrder:
+    """Satu baris penjualan; date/timestamp kosong = hari ini/saat posting"""
+    product_name: str
+    quantity: int
+    price: float
+    payment_method: str = "Tunai"
+    location: str = DEFAULT_LOCATION
+    unit: str = DEFAULT_UNIT
+    date: object = None
+    timestamp: str = None
+
+@dataclass(frozen=True)
+class PurchaseOrder:
+    """Satu pembelian untuk post_group; argumen sama dengan post_purchase"""
+    product_name: str
+    quantity: int
+    price: float
+    unit: str = DEFAULT_UNIT
+    payment_method: str = "Tunai"
+    location: str = DEFAULT_LOCATION
+    date: object = None
+
+@dataclass(frozen=True)
+class JournalPosting:
+    """Satu jurnal majemuk untuk post_group; argumen sama dengan post_journal"""
+    date: object
+    keterangan: str
+    lines: tuple
+
+@dataclass(frozen=True)
+class SaleBatchResult:
+    entries: tuple
+    total_sales: float
+    total_hpp: float
+
+@dataclass(frozen=True)
+class AnimalResult:
+    """Hasil pendaftaran/perubahan status ternak; entry = jurnal yang ikut diposting (atau None)"""
+    tag: str
+    product_name: str
+    status: str
+    entry: PostedEntry = None
+
+@dataclass(frozen=True)
+class TrialBalance:
+    """Neraca saldo; rows: DataFrame account, debit, kredit (Rupiah)"""
+    as_of: str
+    rows: pd.DataFrame
+    total_debit: float
+    total_kredit: float
+
+    @property
+    def balanced(self):
+        return self.total_debit == self.total_kredit
+
+@dataclass(frozen=True)
+class IncomeStatement:
+    """Laba rugi periode [start, end]; accounts: DataFrame account, amount (Rupiah)"""
+    start: str
+    end: str
+    pendapatan: float
+    hpp: float
+    beban: float
+    accounts: pd.DataFrame
+
+    @property
+    def laba_kotor(self):
+        return from_sen(to_sen(self.pendapatan) - to_sen(self.hpp))
+
+    @property
+    def laba_bersih(self):
+        return from_sen(to_sen(self.pendapatan) - to_sen(self.hpp) - to_sen(self.beban))
+
+
+def _date_str(value):
+    """date/datetime/teks ISO -> 'YYYY-MM-DD'; None = hari ini. Teks yang bukan tanggal valid ditolak"""
+    if value is None:
+        return datetime.now().strftime('%Y-%m-%d')
+    if isinstance(value, (datetime, date_type)):
+        return value.strftime('%Y-%m-%d')
+    text = str(value).strip()
+    try:
+        # 'YYYY-MM-DD', atau 'YYYY-MM-DD HH:MM:SS' seperti tanggal yang tersimpan di Excel
+        parsed = date_type.fromisoformat(text) if len(text) <= 10 else datetime.fromisoformat(text).date()
+    except ValueError:
+        raise ValidationError(f"Tanggal tidak valid: {text!r} (format YYYY-MM-DD)") from None
+    return parsed.strftime('%Y-%m-%d')
+
+def _check_payment_method(payment_method):
+    if payment_method not in PAYMENT_METHODS:
+        raise ValidationError(f"Metode pembayaran harus salah satu dari {', '.join(PAYMENT_METHODS)}")
+
+
+# ========== POSTING ==========
+def _validate_journal_lines(lines):
+    """Normalisasi ke JournalLine dan cek aturan double-entry"""
+    lines = [line if isinstance(line, JournalLine) else JournalLine(*line) for line in lines]
+    lines = [line for line in lines if line.account and (line.debit or line.kredit)]
+    unknown = sorted({line.account for line in lines} - ACCOUNT_LABELS)
+    if unknown:
+        raise ValidationError(f"Akun tidak ada di bagan akun: {', '.join(unknown)}")
+    if any(line.debit < 0 or line.kredit < 0 or (line.debit and line.kredit) for line in lines):
+        raise ValidationError("Setiap baris harus berisi debit atau kredit positif, bukan keduanya")
+
+    total_debit = sum(to_sen(line.debit) for line in lines)
+    total_kredit = sum(to_sen(line.kredit) for line in lines)
+    if total_debit == 0 or total_kredit == 0:
+        raise ValidationError("Nominal debit dan kredit harus lebih dari 0")
+    if total_debit != total_kredit:
+        raise UnbalancedEntryError(f"Tidak Balance! Total Debit ({format_rupiah(from_sen(total_debit))}) "
+                                   f"≠ Total Kredit ({format_rupiah(from_sen(total_kredit))})")
+    return lines
+
+def _post_entries(entries):
+    """Tulis beberapa (tanggal, keterangan, lines) ke jurnal dalam satu kali buka/simpan file"""
+    with write_lock():
+        create_journal_workbook()
+        wb_journal = load_workbook(journal_file())
+        try:
+            balances = ledger_balances_sen(wb_journal['Buku Besar'])
+            posted = []
+            for date_str, keterangan, lines in entries:
+                txn_id = post_journal_entry(wb_journal, date_str, keterangan,
+                                            [(line.account, line.debit, line.kredit) for line in lines], balances)
+                posted.append(PostedEntry(date_str, keterangan, tuple(lines), txn_id))
+            save_journal_workbook(wb_journal)
+        finally:
+            wb_journal.close()
+    return posted
+
+def post_journal(date, keterangan, lines):
+    """Posting satu jurnal majemuk. lines: JournalLine atau tuple (akun, debit, kredit)"""
+    lines = _validate_journal_lines(lines)
+    return _post_entries([(_date_str(date), keterangan, lines)])[0]
+
+def _check_price(price, label="Harga"):
+    # NaN/inf lolos dari perbandingan < 0 lalu gagal sebagai ValueError di to_rupiah
+    if not math.isfinite(price):
+        raise ValidationError(f"{label} harus berupa angka")
+    if price < 0:
+        raise ValidationError(f"{label} tidak boleh negatif")
+
+def _apply_purchase(wb, order, timestamp):
+    """Tulis pembelian ke Inventory dan Purchases (belum disimpan).
+    Return (entri jurnal, harga rata-rata baru)"""
+    product_name, quantity, price, unit = order.product_name, order.quantity, order.price, order.unit
+    if not product_name or not product_name.strip():
+        raise ValidationError("Nama produk tidak boleh kosong!")
+    if quantity <= 0:
+        raise ValidationError("Jumlah harus lebih dari 0")
+    _check_price(price)
+    _check_payment_method(order.payment_method)
+
+    date_str = _date_str(order.date)
+    total_price = price * quantity
+    ws_inventory = wb['Inventory']
+    average_price = float(price)
+    for row in ws_inventory.iter_rows(min_row=2, values_only=False):
+        if row[0].value and str(row[0].value).strip().lower() == product_name.strip().lower():
+            qty_lama = safe_parse_int_from_qtytext(row[1].value)
+            # Nilai ditambah sebesar yang dijurnal agar tetap sama dengan saldo akun persediaan
+            total_value = (safe_parse_price(row[3].value) if row[3].value else 0) + total_price
+            total_qty = qty_lama + quantity
+            if total_qty != 0:
+                average_price = total_value / total_qty
+
+            row[1].value = total_qty
+            row[2].value = to_rupiah(average_price)
+            row[3].value = to_rupiah(total_value)
+            if len(row) < 5 or not row[4].value:
+                ws_inventory.cell(row=row[0].row, column=5, value=unit)
+            break
+    else:
+        ws_inventory.append([product_name, quantity, to_rupiah(price), to_rupiah(total_price), unit])
+
+    wb['Purchases'].append([
+        date_str, product_name, quantity, to_rupiah(price), to_rupiah(total_price), timestamp,
+        order.payment_method, (order.location or DEFAULT_LOCATION).strip(), unit
+    ])
+
+    credit_account = "1-10000 - Kas" if order.payment_method == "Tunai" else "2-10000 - Utang Usaha"
+    lines = [JournalLine(get_inventory_account(product_name), debit=total_price),
+             JournalLine(credit_account, kredit=total_price)]
+    return (date_str, f"Pembelian {product_name} - {quantity} {unit}", lines), to_rupiah(average_price)
+
+def post_purchase(product_name, quantity, price, unit=DEFAULT_UNIT, payment_method="Tunai",
+                  location=DEFAULT_LOCATION, date=None):
+    """Catat pembelian: stok Inventory (harga rata-rata tertimbang), baris Purchases,
+    lalu jurnal Persediaan pada Kas (tunai) atau Utang Usaha (kredit)"""
+    order = PurchaseOrder(product_name, quantity, price, unit, payment_method, location, date)
+    # Jurnal gagal -> databasesia.xlsx dikembalikan, jadi stok tidak berubah tanpa jurnal
+    with write_lock(), rollback_on_error(data_file()):
+        wb = openpyxl.load_workbook(data_file())
+        try:
+            entry, average_price = _apply_purchase(wb, order, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            save_workbook(wb, data_file())
+        finally:
+            wb.close()
+
+        posted = _post_entries([entry])[0]
+    return PurchaseResult(posted, product_name, quantity, unit, price * quantity, average_price)
+
+def _check_sale_orders(orders):
+    for order in orders:
+        if order.quantity <= 0:
+            raise ValidationError(f"Jumlah {order.product_name} harus lebih dari 0")
+        _check_price(order.price, f"Harga jual {order.product_name}")
+        _check_payment_method(order.payment_method)
+        # Tanggal dicek sebelum stok dikurangi, bukan saat baris Sales ditulis
+        _date_str(order.date)
+
+def _apply_sales(wb, orders, timestamp, released_tags=None):
+    """Kurangi stok dan tulis baris Sales (belum disimpan). Stok kurang menolak semua pesanan.
+    released_tags: produk -> ekor ber-ear tag yang ikut terjual (penjualan lewat registri).
+    Return (entri jurnal per pesanan, total penjualan sen, total HPP sen)"""
+    stock_orders = [{'product_name': order.product_name, 'quantity': order.quantity,
+                     'location': order.location or DEFAULT_LOCATION} for order in orders]
+    demands = {}
+    for order in orders:
+        demands[order.product_name] = demands.get(order.product_name, 0) + order.quantity
+    stock_error = untagged_stock_error(wb['Inventory'], demands, released_tags)
+    if stock_error:
+        raise InsufficientStockError(stock_error)
+    # Stok baru benar-benar dikurangi di sini; HPP final ditulis ke stock_orders
+    stock_error = commit_reserved_stock(wb['Inventory'], stock_orders)
+    if stock_error:
+        raise InsufficientStockError(stock_error)
+
+    ws_sales = wb['Sales']
+    for order, stock_order in zip(orders, stock_orders):
+        ws_sales.append([
+            _date_str(order.date), order.product_name, order.quantity, to_rupiah(order.price),
+            to_rupiah(order.price * order.quantity), order.timestamp or timestamp, order.payment_method,
+            stock_order['location'], order.unit
+        ])
+
+    entries = []
+    total_sales_sen = total_hpp_sen = 0
+    for order, stock_order in zip(orders, stock_orders):
+        total_sales = order.price * order.quantity
+        total_hpp = stock_order['total_hpp']
+        total_sales_sen += to_sen(total_sales)
+        total_hpp_sen += to_sen(total_hpp)
+        debit_account = "1-10000 - Kas" if order.payment_method == "Tunai" else "1-11000 - Piutang"
+        inventory_account = get_inventory_account(order.product_name)
+        entries.append((_date_str(order.date), f"Penjualan {order.product_name} - {order.quantity} {order.unit}", [
+            JournalLine(debit_account, debit=total_sales),
+            JournalLine("5-50000 - HPP", debit=total_hpp),
+            JournalLine("4-40000 - Pendapatan", kredit=total_sales),
+            JournalLine(inventory_account, kredit=total_hpp),
+        ]))
+    return entries, total_sales_sen, total_hpp_sen
+
+def post_sale_batch(orders):
+    """Simpan sekumpulan penjualan: kurangi stok (HPP = harga rata-rata saat stok dikurangi),
+    tulis baris Sales, lalu satu jurnal per penjualan (Kas/Piutang + HPP pada Pendapatan + Persediaan).
+    Semua atau tidak sama sekali: stok kurang membatalkan seluruh batch."""
+    orders = list(orders)
+    if not orders:
+        raise ValidationError("Daftar penjualan kosong")
+    _check_sale_orders(orders)
+
+    with write_lock(), rollback_on_error(data_file()):
+        wb = openpyxl.load_workbook(data_file())
+        try:
+            entries, total_sales_sen, total_hpp_sen = _apply_sales(wb, orders, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            save_workbook(wb, data_file())
+        finally:
+            wb.close()
+
+        posted = _post_entries(entries)
+    return SaleBatchResult(tuple(posted), from_sen(total_sales_sen), from_sen(total_hpp_sen))
+
+def post_group(operations):
+    """Group commit: posting banyak PurchaseOrder / SaleOrder / JournalPosting dengan satu kali
+    buka-simpan databasesia.xlsx dan satu kali buka-simpan journal_ledger.xlsx.
+
+    Setiap operasi berdiri sendiri dan diproses berurutan (penjualan melihat stok dari pembelian
+    sebelumnya di grup yang sama); operasi yang ditolak tidak menggagalkan yang lain.
+    Return list sejajar operations: PurchaseResult, SaleBatchResult, PostedEntry, atau AccountingError.
+    """
+    operations = list(operations)
+    results = [None] * len(operations)
+    entries = []            # (indeks operasi, entri jurnal)
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    with write_lock(), rollback_on_error(data_file()):
+        stock_ops = [i for i, op in enumerate(operations) if isinstance(op, (PurchaseOrder, SaleOrder))]
+        if stock_ops:
+            index = load_location_index()
+            # Indeks lokasi diperbarui per operasi agar cek stok per kandang melihat grup ini,
+            # lalu dibangun ulang dari file setelahnya (juga jika penyimpanan gagal)
+            with index['lock']:
+                wb = openpyxl.load_workbook(data_file())
+                try:
+                    for i in stock_ops:
+                        op = operations[i]
+                        try:
+                            if isinstance(op, PurchaseOrder):
+                                entry, average_price = _apply_purchase(wb, op, timestamp)
+                                results[i] = average_price
+                                location_change = op.quantity
+                            else:
+                                _check_sale_orders([op])
+                                [entry], total_sales_sen, total_hpp_sen = _apply_sales(wb, [op], timestamp)
+                                results[i] = (total_sales_sen, total_hpp_sen)
+                                location_change = -op.quantity
+                        except AccountingError as e:
+                            results[i] = e
+                            continue
+                        _location_index_apply(index, op.product_name, (op.location or DEFAULT_LOCATION).strip(),
+                                              location_change)
+                        entries.append((i, entry))
+                    save_workbook(wb, data_file())
+                finally:
+                    wb.close()
+                    index['mtime'] = None
+
+        for i, op in enumerate(operations):
+            if isinstance(op, JournalPosting):
+                try:
+                    entries.append((i, (_date_str(op.date), op.keterangan, _validate_journal_lines(op.lines))))
+                except AccountingError as e:
+                    results[i] = e
+            elif not isinstance(op, (PurchaseOrder, SaleOrder)):
+                results[i] = ValidationError(f"Operasi tidak dikenal: {type(op).__name__}")
+
+        posted = _post_entries([entry for _, entry in entries]) if entries else []
+    for (i, _), entry in zip(entries, posted):
+        op = operations[i]
+        if isinstance(op, PurchaseOrder):
+            results[i] = PurchaseResult(entry, op.product_name, op.quantity, op.unit,
+                                        op.price * op.quantity, results[i])
+        elif isinstance(op, SaleOrder):
+            total_sales_sen, total_hpp_sen = results[i]
+            results[i] = SaleBatchResult((entry,), from_sen(total_sales_sen), from_sen(total_hpp_sen))
+        else:
+            results[i] = entry
+    return results
+
+# ========== REGISTRI TERNAK ==========
+def _inventory_row(ws_inventory, product_name):
+    key = product_name.strip().lower()
+    for row in ws_inventory.iter_rows(min_row=2, values_only=False):
+        if row[0].value and str(row[0].value).strip().lower() == key:
+            return row
+    return None
+
+def _apply_write_off(wb, product_name, location, date_str, keterangan, timestamp):
+    """Keluarkan satu ekor dari Inventory sebesar harga rata-rata, dicatat di Adjustments seperti selisih opname.
+    Return entri jurnal (beban selisih persediaan pada akun persediaan)"""
+    row = _inventory_row(wb['Inventory'], product_name)
+    stock = safe_parse_int_from_qtytext(row[1].value) if row else 0
+    if stock < 1:
+        raise InsufficientStockError(f"Stok {product_name} di Inventory hanya {stock} ekor")
+    located = product_locations(product_name).get(location, 0)
+    if located < 1:
+        raise InsufficientStockError(f"Stok {product_name} di {location} hanya {located} ekor")
+
+    avg_price = safe_parse_price(row[2].value) if row[2].value else 0
+    new_qty = stock - 1
+    total = safe_parse_price(row[3].value) if row[3].value else 0
+    # Ekor terakhir mengeluarkan seluruh sisa nilai (termasuk sisa pembulatan harga rata-rata)
+    cost = avg_price if new_qty > 0 else total
+    row[1].value = new_qty
+    row[3].value = to_rupiah(total - cost) if new_qty > 0 else 0
+    _ensure_adjustment_sheet(wb).append([
+        date_str, product_name, location, -1, to_rupiah(avg_price), to_rupiah(-cost), timestamp, DEFAULT_UNIT
+    ])
+    return (date_str, keterangan, [JournalLine(STOCK_VARIANCE_ACCOUNT, debit=cost),
+                                   JournalLine(get_inventory_account(product_name), kredit=cost)])
+
+def register_animal(tag, age_class, sex, birth_date, purchase_date, cost, record_purchase=False,
+                    payment_method="Tunai", location=DEFAULT_LOCATION):
+    """Daftarkan ternak per ear tag. Registri selalu bersandar pada stok Inventory:
+    - record_purchase=True: sekaligus dicatat sebagai pembelian 1 ekor (Inventory, Purchases, jurnal)
+    - record_purchase=False: menandai stok kelas tersebut yang sudah ada dan belum punya ear tag
+    """
+    tag = str(tag).strip()
+    if not tag:
+        raise ValidationError("Ear tag tidak boleh kosong!")
+    _check_price(cost, "Biaya perolehan")
+    product_name = animal_product_name(age_class, sex)
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    with write_lock(), rollback_on_error(data_file()):
+        registry = load_animal_registry()
+        with registry['lock']:
+            if tag in registry['by_tag']:
+                raise ValidationError(f"Ear tag {tag} sudah terdaftar")
+            wb = openpyxl.load_workbook(data_file())
+            try:
+                entry = None
+                if record_purchase:
+                    entry, _ = _apply_purchase(wb, PurchaseOrder(product_name, 1, cost, DEFAULT_UNIT, payment_method,
+                                                                 location, purchase_date), timestamp)
+                else:
+                    row = _inventory_row(wb['Inventory'], product_name)
+                    stock = safe_parse_int_from_qtytext(row[1].value) if row else 0
+                    tagged = registry['class_totals'].get(product_name, {}).get('count', 0)
+                    if stock - tagged < 1:
+                        raise InsufficientStockError(
+                            f"Stok {product_name} di Inventory {stock} ekor dan {tagged} ekor sudah terdaftar; "
+                            f"catat sebagai pembelian baru atau input pembelian lebih dulu")
+
+                ws_animals = _ensure_animal_sheet(wb)
+                ws_animals.append([
+                    tag, age_class, sex, _animal_iso_date(birth_date), _animal_iso_date(purchase_date),
+                    to_rupiah(cost), "Aktif", ''
+                ])
+                row_index = ws_animals.max_row
+                save_workbook(wb, data_file())
+            finally:
+                wb.close()
+            posted = _post_entries([entry])[0] if entry else None
+            # Perbarui indeks registri di tempat (setelah jurnal tersimpan), tanpa membaca ulang sheet Animals
+            _registry_index_add(registry, {
+                'row_index': row_index,
+                'tag': tag,
+                'age_class': age_class,
+                'sex': sex,
+                'product_name': product_name,
+                'birth_date': _animal_iso_date(birth_date),
+                'purchase_date': _animal_iso_date(purchase_date),
+                'cost': float(to_rupiah(cost)),
+                'status': "Aktif",
+                'status_date': '',
+            })
+            registry['mtime'] = os.path.getmtime(data_file())
+    return AnimalResult(tag, product_name, "Aktif", posted)
+
+def update_animal_status(tag, status, status_date, price=0, payment_method="Tunai", location=DEFAULT_LOCATION):
+    """Keluarkan ternak aktif dari registri lewat jalur stok yang sama:
+    - Terjual: penjualan 1 ekor seharga price (Sales, HPP, jurnal penjualan)
+    - Mati: stok dikeluarkan sebesar harga rata-rata ke Beban Selisih Persediaan
+    """
+    if status not in ("Terjual", "Mati"):
+        raise ValidationError("Status baru harus Terjual atau Mati")
+    date_str = _date_str(status_date)
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    with write_lock(), rollback_on_error(data_file()):
+        registry = load_animal_registry()
+        with registry['lock']:
+            record = registry['by_tag'].get(str(tag).strip())
+            if record is None:
+                raise ValidationError(f"Ear tag {tag} tidak ditemukan")
+            if record['status'] != "Aktif":
+                raise ValidationError(f"Ear tag {tag} sudah berstatus {record['status']}; koreksi lewat hapus transaksi")
+            product_name = record['product_name']
+
+            wb = openpyxl.load_workbook(data_file())
+            try:
+                if status == "Terjual":
+                    if price <= 0:
+                        raise ValidationError("Harga jual harus lebih dari 0")
+                    order = SaleOrder(product_name, 1, price, payment_method, location, DEFAULT_UNIT, date_str)
+                    _check_sale_orders([order])
+                    [entry], _, _ = _apply_sales(wb, [order], timestamp, released_tags={product_name: 1})
+                else:
+                    entry = _apply_write_off(wb, product_name, location, date_str,
+                                             f"Ternak mati {record['tag']} - {product_name}", timestamp)
+                ws_animals = _ensure_animal_sheet(wb)
+                ws_animals.cell(row=record['row_index'], column=7, value=status)
+                ws_animals.cell(row=record['row_index'], column=8, value=date_str)
+                save_workbook(wb, data_file())
+            finally:
+                wb.close()
+            posted = _post_entries([entry])[0]
+            _registry_index_remove(registry, record)
+            _registry_index_add(registry, {**record, 'status': status, 'status_date': date_str})
+            registry['mtime'] = os.path.getmtime(data_file())
+    return AnimalResult(record['tag'], product_name, status, posted)
+
+def recalculate_ledger():
+    """Hitung ulang semua saldo berjalan Buku Besar dan simpan"""
+    with write_lock():
+        create_journal_workbook()
+        wb = load_workbook(journal_file())
+        try:
+            recalculate_ledger_ws(wb['Buku Besar'])
+            save_journal_workbook(wb)
+        finally:
+            wb.close()
+
+
+# ========== LAPORAN ==========
+@st.cache_data(max_entries=16, show_spinner=False)
+def _ledger_movements(journal_mtime, path):
+    """Mutasi Buku Besar per baris dalam sen: account, tanggal, debit_sen, kredit_sen"""
+    ledger = _read_sheets(path, ['Buku Besar'], [6])['Buku Besar']
+    ledger = ledger[ledger[0].notna() & (ledger[0].astype(str) != '')]
+    return pd.DataFrame({
+        'account': ledger[0].astype(str).values,
+        'tanggal': ledger[1].fillna('').astype(str).str[:10].values,
+        'debit_sen': to_sen_column(ledger[3]),
+        'kredit_sen': to_sen_column(ledger[4]),
+    })
+
+def _movements(start=None, end=None):
+    create_journal_workbook()
+    path = journal_file()
+    movements = _ledger_movements(os.path.getmtime(path), path)
+    if start is not None:
+        movements = movements[movements['tanggal'] >= _date_str(start)]
+    if end is not None:
+        movements = movements[movements['tanggal'] <= _date_str(end)]
+    return movements
+
+def trial_balance(as_of=None):
+    """Neraca saldo per tanggal as_of (None = semua transaksi), dari mutasi debit - kredit per akun"""
+    movements = _movements(end=as_of)
+    net = (movements['debit_sen'] - movements['kredit_sen']).groupby(movements['account'], sort=True).sum()
+    debit_sen = net.clip(lower=0)
+    kredit_sen = (-net).clip(lower=0)
+    rows = pd.DataFrame({
+        'account': net.index,
+        'debit': debit_sen.values / 100,
+        'kredit': kredit_sen.values / 100,
+    })
+    return TrialBalance(_date_str(as_of) if as_of is not None else None, rows,
+                        from_sen(debit_sen.sum()), from_sen(kredit_sen.sum()))
+
+def income_statement(start=None, end=None):
+    """Laba rugi dari mutasi akun 4 (pendapatan), 5 (HPP) dan 6 (beban) pada periode [start, end]"""
+    movements = _movements(start, end)
+    codes = movements['account'].str.split(' - ').str[0].str.strip()
+    movements = movements[codes.str.startswith(('4', '5', '6'))]
+    codes = codes[movements.index]
+    # Pendapatan bersaldo normal kredit, HPP dan beban bersaldo normal debit
+    sign = codes.str.startswith('4').map({True: -1, False: 1})
+    amount_sen = ((movements['debit_sen'] - movements['kredit_sen']) * sign).groupby(movements['account'], sort=True).sum()
+    group_sen = amount_sen.groupby(amount_sen.index.str[0]).sum()
+    return IncomeStatement(
+        _date_str(start) if start is not None else None,
+        _date_str(end) if end is not None else None,
+        from_sen(group_sen.get('4', 0)),
+        from_sen(group_sen.get('5', 0)),
+        from_sen(group_sen.get('6', 0)),
+        pd.DataFrame({'account': amount_sen.index, 'amount': amount_sen.values / 100}),
+    )
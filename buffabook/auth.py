@@ -0,0 +1,437 @@
+"""Autentikasi pengguna (SQLite buffabook_auth.db) dan halaman login/daftar"""
+import streamlit as st
+import sqlite3
+import hashlib
+import hmac
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from buffabook.db import connection, ensure_schema, transaction
+from buffabook.tenant import LEGACY_TENANT, tenant_for_email
+
+
+AUTH_DB = 'buffabook_auth.db'
+USERS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        tenant TEXT,
+        role TEXT NOT NULL DEFAULT 'farm'
+    )
+'''
+# Peran akun: hanya kantor pusat yang boleh melihat konsolidasi semua farm
+ROLE_FARM = 'farm'
+ROLE_HEAD_OFFICE = 'kantor_pusat'
+ROLES = (ROLE_FARM, ROLE_HEAD_OFFICE)
+# Token sesi disimpan sebagai hash; token asli hanya ada di URL pengguna.
+# client_hash mengikat token ke IP + user agent browser yang login
+SESSIONS_SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS sessions (
+        token_hash TEXT PRIMARY KEY,
+        email TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        expires_at REAL NOT NULL,
+        client_hash TEXT
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at)',
+)
+SESSION_PARAM = 'sesi'
+# Token ada di URL (riwayat browser, link yang dibagikan): umurnya pendek dan diganti setiap dipakai
+SESSION_TTL_SECONDS = 12 * 3600
+SESSION_CACHE_SIZE = 1024
+
+def init_auth_db():
+    """Initialize SQLite database for authentication"""
+    ensure_schema(AUTH_DB, USERS_SCHEMA, *SESSIONS_SCHEMA)
+    # Database lama belum punya kolom tenant; akun lamanya tetap di data bersama (LEGACY_TENANT)
+    with transaction(AUTH_DB) as conn:
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(users)')]
+        if 'tenant' not in columns:
+            conn.execute('ALTER TABLE users ADD COLUMN tenant TEXT')
+        if 'role' not in columns:
+            conn.execute(f"ALTER TABLE users ADD COLUMN role TEXT NOT NULL DEFAULT '{ROLE_FARM}'")
+            # Semua akun lama menjadi farm; kantor pusat diberikan eksplisit lewat
+            # set_user_role (python -m buffabook peran EMAIL kantor_pusat)
+        # Sesi lama tanpa ikatan klien tidak bisa dipulihkan lagi (login ulang sekali)
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(sessions)')]
+        if 'client_hash' not in columns:
+            conn.execute('ALTER TABLE sessions ADD COLUMN client_hash TEXT')
+
+def hash_password(password):
+    """Hash password using SHA-256"""
+    return hashlib.sha256(password.encode()).hexdigest()
+
+def create_user(email, password):
+    """Create new user in database"""
+    try:
+        password_hash = hash_password(password)
+        with transaction(AUTH_DB) as conn:
+            conn.execute('INSERT INTO users (email, password_hash, tenant) VALUES (?, ?, ?)',
+                         (email, password_hash, tenant_for_email(email)))
+        return True
+    except sqlite3.IntegrityError:
+        return False  
+    except Exception as e:
+        st.error(f"Error creating user: {e}")
+        return False
+
+def verify_user(email, password):
+    """Verify user credentials"""
+    try:
+        password_hash = hash_password(password)
+        with connection(AUTH_DB) as conn:
+            user = conn.execute('SELECT 1 FROM users WHERE email = ? AND password_hash = ?',
+                                (email, password_hash)).fetchone()
+        return user is not None
+    except Exception as e:
+        st.error(f"Error verifying user: {e}")
+        return False
+
+# ========== PEMBATASAN PERCOBAAN LOGIN (TOKEN BUCKET) ==========
+# scope -> (kapasitas, token terisi ulang per detik)
+LOGIN_RATE_LIMITS = {
+    'email': (5, 1 / 60),     # 5 percobaan beruntun, lalu 1 per menit per email
+    'client': (20, 1 / 6),    # 20 percobaan beruntun, lalu 1 per 6 detik per klien
+}
+LOGIN_BACKOFF_AFTER = 3            # gagal beruntun sebelum jeda bertingkat berlaku
+LOGIN_BACKOFF_MAX_SECONDS = 15 * 60
+LOGIN_BUCKET_LIMIT = 10000         # batas jumlah bucket di memori
+LOGIN_BUCKET_IDLE_SECONDS = 3600
+
+@st.cache_resource
+def get_login_buckets():
+    """Token bucket login in-memory, dibagi ke semua sesi.
+    (scope, kunci) -> {'tokens', 'updated', 'failures', 'blocked_until'}; urut dari yang paling lama tidak dipakai"""
+    return {'lock': threading.Lock(), 'buckets': OrderedDict()}
+
+def _login_client_id():
+    """Identitas klien untuk pembatasan: IP, atau ID sesi browser jika IP tidak tersedia"""
+    client = st.context.ip_address
+    if not client:
+        if 'login_client_id' not in st.session_state:
+            st.session_state.login_client_id = secrets.token_hex(8)
+        client = st.session_state.login_client_id
+    return client
+
+def _login_bucket(buckets, key, now):
+    """Ambil bucket (buat jika belum ada) dan isi ulang token sesuai waktu berlalu"""
+    capacity, rate = LOGIN_RATE_LIMITS[key[0]]
+    bucket = buckets.get(key)
+    if bucket is None:
+        bucket = buckets[key] = {'tokens': capacity, 'updated': now, 'failures': 0, 'blocked_until': 0.0}
+    else:
+        bucket['tokens'] = min(capacity, bucket['tokens'] + (now - bucket['updated']) * rate)
+        bucket['updated'] = now
+        buckets.move_to_end(key)
+    return bucket
+
+def _evict_login_buckets(buckets, now):
+    """Buang bucket yang lama tidak dipakai; ukuran tetap dibatasi LOGIN_BUCKET_LIMIT"""
+    while buckets:
+        key, bucket = next(iter(buckets.items()))
+        idle = now - bucket['updated'] > LOGIN_BUCKET_IDLE_SECONDS and bucket['blocked_until'] <= now
+        if not idle and len(buckets) <= LOGIN_BUCKET_LIMIT:
+            break
+        del buckets[key]
+
+def take_login_attempt(email):
+    """Ambil satu token dari bucket email dan bucket klien.
+    Return (diizinkan, detik tunggu); token hanya dipotong jika kedua bucket mengizinkan."""
+    store = get_login_buckets()
+    now = time.time()
+    keys = [('email', email.strip().lower()), ('client', _login_client_id())]
+    with store['lock']:
+        buckets = store['buckets']
+        _evict_login_buckets(buckets, now)
+        wait = 0.0
+        for key in keys:
+            bucket = _login_bucket(buckets, key, now)
+            rate = LOGIN_RATE_LIMITS[key[0]][1]
+            wait = max(wait, bucket['blocked_until'] - now, (1 - bucket['tokens']) / rate)
+        if wait > 0:
+            return False, wait
+        for key in keys:
+            buckets[key]['tokens'] -= 1
+        return True, 0.0
+
+def record_login_result(email, success):
+    """Catat hasil verifikasi: gagal beruntun menambah jeda (2, 4, 8, ... detik), berhasil mereset"""
+    store = get_login_buckets()
+    now = time.time()
+    with store['lock']:
+        bucket = store['buckets'].get(('email', email.strip().lower()))
+        if bucket is None:
+            return
+        if success:
+            bucket['failures'] = 0
+            bucket['blocked_until'] = 0.0
+            return
+        bucket['failures'] += 1
+        if bucket['failures'] >= LOGIN_BACKOFF_AFTER:
+            delay = min(2 ** (bucket['failures'] - LOGIN_BACKOFF_AFTER + 1), LOGIN_BACKOFF_MAX_SECONDS)
+            bucket['blocked_until'] = now + delay
+
+# ========== SESI LOGIN PERSISTEN ==========
+@st.cache_resource
+def get_session_cache():
+    """LRU sesi aktif in-memory (token_hash -> (email, expires_at, client_hash)), dibagi ke semua sesi"""
+    return {'lock': threading.Lock(), 'entries': OrderedDict()}
+
+def _token_hash(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def _client_hash():
+    """Sidik klien: hash IP + user agent browser saat ini"""
+    try:
+        ip_address = st.context.ip_address or ''
+        user_agent = st.context.headers.get('User-Agent', '')
+    except Exception:
+        # Di luar server Streamlit tidak ada konteks request
+        ip_address = user_agent = ''
+    return hashlib.sha256(f"{ip_address}|{user_agent}".encode()).hexdigest()
+
+def _cache_session(token_hash, email, expires_at, client_hash):
+    cache = get_session_cache()
+    with cache['lock']:
+        cache['entries'][token_hash] = (email, expires_at, client_hash)
+        cache['entries'].move_to_end(token_hash)
+        while len(cache['entries']) > SESSION_CACHE_SIZE:
+            cache['entries'].popitem(last=False)
+
+def create_session(email):
+    """Buat token sesi baru untuk email, terikat ke klien saat ini; return token (hanya hash-nya yang disimpan)"""
+    token = secrets.token_urlsafe(32)
+    token_hash = _token_hash(token)
+    client_hash = _client_hash()
+    now = time.time()
+    expires_at = now + SESSION_TTL_SECONDS
+    with transaction(AUTH_DB) as conn:
+        conn.execute('DELETE FROM sessions WHERE expires_at <= ?', (now,))
+        conn.execute('INSERT INTO sessions (token_hash, email, created_at, expires_at, client_hash) '
+                     'VALUES (?, ?, ?, ?, ?)', (token_hash, email, now, expires_at, client_hash))
+    _cache_session(token_hash, email, expires_at, client_hash)
+    return token
+
+def session_user(token):
+    """Email pemilik token sesi yang masih berlaku untuk klien ini, atau None.
+    Sesi aktif dilayani dari LRU; database hanya dibaca saat cache miss."""
+    token_hash = _token_hash(token)
+    client_hash = _client_hash()
+    now = time.time()
+    cache = get_session_cache()
+    with cache['lock']:
+        cached = cache['entries'].get(token_hash)
+        if cached is not None:
+            if cached[1] > now:
+                cache['entries'].move_to_end(token_hash)
+                return cached[0] if hmac.compare_digest(cached[2] or '', client_hash) else None
+            del cache['entries'][token_hash]
+    
+    with connection(AUTH_DB) as conn:
+        row = conn.execute('SELECT email, expires_at, client_hash FROM sessions WHERE token_hash = ? AND expires_at > ?',
+                           (token_hash, now)).fetchone()
+    if row is None:
+        return None
+    _cache_session(token_hash, *row)
+    return row[0] if hmac.compare_digest(row[2] or '', client_hash) else None
+
+def end_session(token):
+    """Cabut token sesi (logout)"""
+    token_hash = _token_hash(token)
+    with transaction(AUTH_DB) as conn:
+        conn.execute('DELETE FROM sessions WHERE token_hash = ?', (token_hash,))
+    cache = get_session_cache()
+    with cache['lock']:
+        cache['entries'].pop(token_hash, None)
+
+def restore_login():
+    """Pulihkan login dari token di URL (refresh / tab baru) tanpa cek password ulang,
+    dan pastikan token tetap ada di URL setelah pindah halaman.
+    Token yang dipakai untuk memulihkan langsung dicabut dan diganti token baru, sehingga
+    token lama di riwayat browser atau link yang dibagikan tidak bisa dipakai lagi."""
+    token = st.session_state.get('session_token') or st.query_params.get(SESSION_PARAM)
+    if not token:
+        return
+    if not st.session_state.logged_in:
+        email = session_user(token)
+        if email is None:
+            st.query_params.pop(SESSION_PARAM, None)
+            return
+        end_session(token)
+        token = create_session(email)
+        st.session_state.logged_in = True
+        st.session_state.user_email = email
+        st.session_state.tenant = user_tenant(email)
+        st.session_state.session_token = token
+    if st.query_params.get(SESSION_PARAM) != token:
+        st.query_params[SESSION_PARAM] = token
+
+def logout():
+    """Akhiri sesi login saat ini"""
+    token = st.session_state.get('session_token')
+    if token:
+        end_session(token)
+    st.query_params.pop(SESSION_PARAM, None)
+    st.session_state.logged_in = False
+    st.session_state.user_email = None
+    st.session_state.tenant = None
+    st.session_state.session_token = None
+
+def user_tenant(email):
+    """Tenant (direktori data farm) milik akun"""
+    with connection(AUTH_DB) as conn:
+        row = conn.execute('SELECT tenant FROM users WHERE email = ?', (email,)).fetchone()
+    return (row[0] if row else None) or LEGACY_TENANT
+
+def user_role(email):
+    """Peran akun (ROLE_FARM / ROLE_HEAD_OFFICE); akun tidak dikenal = ROLE_FARM"""
+    with connection(AUTH_DB) as conn:
+        row = conn.execute('SELECT role FROM users WHERE email = ?', (email,)).fetchone()
+    return row[0] if row else ROLE_FARM
+
+def set_user_role(email, role):
+    """Ubah peran akun. Return False jika email tidak terdaftar"""
+    if role not in ROLES:
+        raise ValueError(f"Peran harus salah satu dari {', '.join(ROLES)}")
+    with transaction(AUTH_DB) as conn:
+        return conn.execute('UPDATE users SET role = ? WHERE email = ?', (role, email)).rowcount > 0
+
+def is_head_office():
+    """Akun yang login berperan kantor pusat; dibaca dari database agar pencabutan langsung berlaku"""
+    email = st.session_state.get('user_email')
+    return bool(email) and user_role(email) == ROLE_HEAD_OFFICE
+
+def tenant_owners():
+    """tenant -> email pemiliknya, untuk label entitas di laporan konsolidasi"""
+    with connection(AUTH_DB) as conn:
+        return dict(conn.execute('SELECT tenant, email FROM users WHERE tenant IS NOT NULL'))
+
+def is_valid_email(email):
+    """Validate email format"""
+    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    return re.match(pattern, email) is not None
+
+def show_auth_page():
+    """Halaman login/daftar untuk pengguna yang belum masuk"""
+    st.markdown("""
+    <style>
+        /* Set background color on main Streamlit app container for auth page */
+        [data-testid="stAppViewContainer"] {
+            background-color: #FDF3B9 !important;
+        }
+        .auth-container {
+            background: #FDF3B9 ;
+            padding: 2rem;
+            border-radius: 10px;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+            margin: 2rem auto;
+            max-width: 400px;
+        }
+        .auth-header {
+            text-align: center;
+            color: #80644B;
+            margin-bottom: 2rem;
+        }
+        .stButton>button {
+            width: 100%;
+            background-color: #8B6F47 ;
+            color: white ;
+            border: none ;
+        }
+        .stButton>button:hover {
+            background-color: #5A4634 ;
+        }
+        .switch-auth {
+            text-align: center;
+            margin-top: 1rem;
+        }
+        .switch-auth button {
+            background: none ;
+            border: none;
+            color: #8B6F47;
+            text-decoration: underline;
+            cursor: pointer;
+        }
+    </style>
+    """, unsafe_allow_html=True)
+    
+    st.markdown('<div class="auth-header"><h1>🐃 BuffaBook</h1><p>Sistem Pencatatan Peternakan Kerbau</p></div>', unsafe_allow_html=True)
+    
+    if st.session_state.show_login:
+        st.subheader("🔐 Login")
+        
+        with st.form("login_form"):
+            email = st.text_input("Email", placeholder="nama@email.com")
+            password = st.text_input("Password", type="password", placeholder="Minimal 6 karakter")
+            login_submit = st.form_submit_button("Login")
+            
+            if login_submit:
+                if not email or not password:
+                    st.error("Email dan password harus diisi!")
+                elif not is_valid_email(email):
+                    st.error("Format email tidak valid!")
+                elif len(password) < 6:
+                    st.error("Password minimal 6 karakter!")
+                else:
+                    allowed, wait = take_login_attempt(email)
+                    if not allowed:
+                        st.error(f"Terlalu banyak percobaan login. Coba lagi dalam {int(wait) + 1} detik.")
+                    elif verify_user(email, password):
+                        record_login_result(email, True)
+                        st.session_state.logged_in = True
+                        st.session_state.user_email = email
+                        st.session_state.tenant = user_tenant(email)
+                        st.session_state.session_token = create_session(email)
+                        st.query_params[SESSION_PARAM] = st.session_state.session_token
+                        st.success("Login berhasil!")
+                        st.rerun()
+                    else:
+                        record_login_result(email, False)
+                        st.error("Email atau password salah!")
+        
+        st.markdown('<div class="switch-auth">', unsafe_allow_html=True)
+        if st.button("Belum punya akun? Daftar di sini"):
+            st.session_state.show_login = False
+            st.rerun()
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    else:
+        st.subheader("📝 Register")
+        
+        with st.form("register_form"):
+            email = st.text_input("Email", placeholder="nama@email.com")
+            password = st.text_input("Password", type="password", placeholder="Minimal 6 karakter")
+            confirm_password = st.text_input("Konfirmasi Password", type="password", placeholder="Ulangi password")
+            register_submit = st.form_submit_button("Daftar")
+            
+            if register_submit:
+                if not email or not password or not confirm_password:
+                    st.error("Semua field harus diisi!")
+                elif not is_valid_email(email):
+                    st.error("Format email tidak valid!")
+                elif len(password) < 6:
+                    st.error("Password minimal 6 karakter!")
+                elif password != confirm_password:
+                    st.error("Password dan konfirmasi password tidak sama!")
+                else:
+                    if create_user(email, password):
+                        st.success("Pendaftaran berhasil! Silakan login.")
+                        st.session_state.show_login = True
+                        st.rerun()
+                    else:
+                        st.error("Email sudah terdaftar! Silakan gunakan email lain.")
+        
+        st.markdown('<div class="switch-auth">', unsafe_allow_html=True)
+        if st.button("Sudah punya akun? Login di sini"):
+            st.session_state.show_login = True
+            st.rerun()
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,44 @@
+"""Inisialisasi sekali per proses: skema database, file data dan pemanasan cache"""
+import streamlit as st
+import threading
+
+from buffabook.auth import init_auth_db
+from buffabook.tenant import data_file, use_tenant
+
+
+@st.cache_resource(show_spinner=False)
+def bootstrap_auth():
+    """Skema database login cukup dibuat sekali per proses, bukan setiap rerun"""
+    init_auth_db()
+    return True
+
+def _warm_caches(tenant):
+    """Bangun indeks query dan indeks pencarian tenant sebelum halaman pertama memintanya"""
+    from buffabook.accounting import ensure_journal_search
+    from buffabook.queries import load_history_index, load_journal_index, load_ledger_index
+
+    with use_tenant(tenant):
+        for warm in (load_journal_index, load_ledger_index, load_history_index, ensure_journal_search):
+            try:
+                warm()
+            except Exception:
+                # Pemanasan hanya optimasi; halaman akan membangun ulang indeks jika gagal
+                pass
+
+@st.cache_resource(show_spinner=False)
+def bootstrap_data(tenant):
+    """Pastikan file Excel tenant ada dan skemanya sudah dimigrasi, sekali per proses per tenant.
+    pandas/openpyxl baru diimpor di sini (setelah login), lalu cache indeks
+    dipanaskan di thread latar belakang."""
+    from buffabook.storage import create_workbook_if_not_exists, migrate_typed_schema
+    from buffabook.accounting import create_journal_workbook
+
+    with use_tenant(tenant):
+        create_workbook_if_not_exists()
+        create_journal_workbook()
+        migrate_typed_schema(data_file())
+
+    warmer = threading.Thread(target=_warm_caches, args=(tenant,), name=f"buffabook-warm-{tenant or 'default'}",
+                              daemon=True)
+    warmer.start()
+    return warmer
@@ -0,0 +1,297 @@
+"""Perintah batch tanpa browser (cron): hitung ulang saldo, export jurnal, laporan dan import pembelian.
+
+Contoh:
+    python -m buffabook recalc --all-farms
+    python -m buffabook export-jurnal -o jurnal.csv
+    python -m buffabook neraca-saldo --as-of 2025-12-31
+    python -m buffabook laba-rugi --start 2025-12-01 --end 2025-12-31
+    python -m buffabook import-pembelian pembelian.csv --farm budi_1a2b3c4d
+    python -m buffabook peran pemilik@contoh.com kantor_pusat
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import streamlit.logger
+
+EXIT_OK = 0
+EXIT_FAILED = 1        # sebagian/seluruh pekerjaan gagal
+EXIT_USAGE = 2         # argumen salah (juga dipakai argparse)
+
+IMPORT_COLUMNS = ['tanggal', 'produk', 'jumlah', 'harga', 'satuan', 'metode', 'lokasi']
+
+
+def _progress(message):
+    """Progress ke stderr agar stdout tetap bersih untuk data CSV"""
+    print(message, file=sys.stderr, flush=True)
+
+@contextmanager
+def _output(path):
+    """File tujuan CSV, atau stdout jika '-'"""
+    if path == '-':
+        yield sys.stdout
+        sys.stdout.flush()
+    else:
+        with open(path, 'w', newline='', encoding='utf-8') as handle:
+            yield handle
+
+def _farms(args, allow_new=False):
+    """Tenant yang diproses: --all-farms, --farm, atau data bersama di direktori aplikasi.
+    --farm harus farm yang sudah punya jurnal; allow_new (perintah yang menulis) juga menerima
+    farm milik akun terdaftar yang belum pernah dibuka. Return None jika farm tidak dikenal."""
+    from buffabook.tenant import LEGACY_TENANT, list_tenants
+    if getattr(args, 'all_farms', False):
+        return list_tenants()
+    farm = args.farm or LEGACY_TENANT
+    known = list_tenants()
+    if allow_new:
+        from buffabook.auth import AUTH_DB, init_auth_db, tenant_owners
+        known.append(LEGACY_TENANT)
+        if os.path.exists(AUTH_DB):
+            init_auth_db()
+            known += list(tenant_owners())
+    if farm not in known:
+        _progress(f"Farm tidak ditemukan: {farm or 'data bersama'} "
+                  f"(farm yang ada: {', '.join(tenant or 'data bersama' for tenant in list_tenants()) or '-'})")
+        return None
+    return [farm]
+
+def _amount(value):
+    return '' if value in (None, '', 0) else value
+
+
+# ========== PERINTAH ==========
+def cmd_recalc(args):
+    """Hitung Ulang Saldo Buku Besar untuk satu atau semua farm"""
+    from buffabook.api import recalculate_ledger
+    from buffabook.tenant import use_tenant
+
+    farms = _farms(args)
+    if farms is None:
+        return EXIT_USAGE
+    failed = 0
+    for i, farm in enumerate(farms, 1):
+        started = time.perf_counter()
+        try:
+            with use_tenant(farm):
+                recalculate_ledger()
+            _progress(f"[{i}/{len(farms)}] {farm or 'data bersama'}: saldo dihitung ulang "
+                      f"({time.perf_counter() - started:.1f} s)")
+        except Exception as e:
+            failed += 1
+            _progress(f"[{i}/{len(farms)}] {farm or 'data bersama'}: GAGAL - {e}")
+    return EXIT_FAILED if failed else EXIT_OK
+
+def cmd_export_jurnal(args):
+    """Export Jurnal Umum ke CSV baris per baris (workbook read-only, tidak dimuat seluruhnya)"""
+    from openpyxl import load_workbook
+    from buffabook.tenant import journal_file, use_tenant
+
+    farms = _farms(args)
+    if farms is None:
+        return EXIT_USAGE
+    with use_tenant(farms[0]):
+        path = journal_file()
+    if not os.path.exists(path):
+        _progress(f"File jurnal tidak ditemukan: {path}")
+        return EXIT_FAILED
+
+    wb = load_workbook(path, read_only=True)
+    try:
+        with _output(args.output) as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['Tanggal', 'Akun', 'Debit', 'Kredit', 'Keterangan'])
+            tanggal = keterangan = ''
+            count = 0
+            for row in wb['Jurnal Umum'].iter_rows(min_row=2, max_col=5, values_only=True):
+                row = tuple(row) + (None,) * (5 - len(row))
+                if not any(value not in (None, '') for value in row[:4]):
+                    continue
+                # Baris bertanggal membuka transaksi; baris berikutnya mewarisi tanggal & keterangan
+                if row[0] not in (None, ''):
+                    tanggal, keterangan = str(row[0])[:10], row[4] or ''
+                writer.writerow([tanggal, row[1] or '', _amount(row[2]), _amount(row[3]), keterangan])
+                count += 1
+                if count % 10000 == 0:
+                    _progress(f"{count} baris diexport...")
+    finally:
+        wb.close()
+    _progress(f"Selesai: {count} baris Jurnal Umum")
+    return EXIT_OK
+
+def cmd_neraca_saldo(args):
+    """Neraca saldo per tanggal ke CSV"""
+    from buffabook.api import trial_balance
+    from buffabook.tenant import use_tenant
+
+    farms = _farms(args)
+    if farms is None:
+        return EXIT_USAGE
+    with use_tenant(farms[0]):
+        result = trial_balance(args.as_of)
+    with _output(args.output) as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['Akun', 'Debit', 'Kredit'])
+        for account, debit, kredit in result.rows[['account', 'debit', 'kredit']].itertuples(index=False):
+            writer.writerow([account, _amount(debit), _amount(kredit)])
+        writer.writerow(['Total', result.total_debit, result.total_kredit])
+    if not result.balanced:
+        _progress(f"PERINGATAN: neraca saldo tidak balance (debit {result.total_debit}, kredit {result.total_kredit})")
+        return EXIT_FAILED
+    return EXIT_OK
+
+def cmd_laba_rugi(args):
+    """Laba rugi periode ke CSV: rincian per akun lalu total"""
+    from buffabook.api import income_statement
+    from buffabook.tenant import use_tenant
+
+    farms = _farms(args)
+    if farms is None:
+        return EXIT_USAGE
+    with use_tenant(farms[0]):
+        result = income_statement(args.start, args.end)
+    with _output(args.output) as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['Akun', 'Jumlah'])
+        for account, amount in result.accounts[['account', 'amount']].itertuples(index=False):
+            writer.writerow([account, amount])
+        writer.writerow(['Total Pendapatan', result.pendapatan])
+        writer.writerow(['Total HPP', result.hpp])
+        writer.writerow(['Total Beban', result.beban])
+        writer.writerow(['Laba Kotor', result.laba_kotor])
+        writer.writerow(['Laba Bersih', result.laba_bersih])
+    return EXIT_OK
+
+def cmd_import_pembelian(args):
+    """Import pembelian dari CSV (kolom: tanggal, produk, jumlah, harga, satuan, metode, lokasi).
+    Dibaca baris per baris; baris gagal dilaporkan dan dilewati."""
+    from buffabook.accounting import create_journal_workbook
+    from buffabook.api import AccountingError, post_purchase
+    from buffabook.storage import DEFAULT_LOCATION, create_workbook_if_not_exists
+    from buffabook.tenant import use_tenant
+    from buffabook.values import DEFAULT_UNIT, safe_parse_int_from_qtytext, safe_parse_price
+
+    farms = _farms(args, allow_new=True)
+    if farms is None:
+        return EXIT_USAGE
+    imported = failed = 0
+    with open(args.file, newline='', encoding='utf-8-sig') as handle, use_tenant(farms[0]):
+        # Farm baru yang belum pernah dibuka di aplikasi belum punya file Excel
+        create_workbook_if_not_exists()
+        create_journal_workbook()
+        reader = csv.DictReader(handle)
+        missing = [column for column in ('produk', 'jumlah', 'harga') if column not in (reader.fieldnames or [])]
+        if missing:
+            _progress(f"Kolom wajib tidak ada: {', '.join(missing)} (kolom: {', '.join(IMPORT_COLUMNS)})")
+            return EXIT_USAGE
+        for line_no, row in enumerate(reader, 2):
+            try:
+                post_purchase(
+                    row['produk'],
+                    safe_parse_int_from_qtytext(row['jumlah']),
+                    safe_parse_price(row['harga']),
+                    unit=row.get('satuan') or DEFAULT_UNIT,
+                    payment_method=row.get('metode') or "Tunai",
+                    location=row.get('lokasi') or DEFAULT_LOCATION,
+                    date=row.get('tanggal') or None,
+                )
+                imported += 1
+            except (AccountingError, ValueError) as e:
+                failed += 1
+                _progress(f"Baris {line_no}: dilewati - {e}")
+            if (imported + failed) % 100 == 0:
+                _progress(f"{imported + failed} baris diproses...")
+    _progress(f"Selesai: {imported} pembelian diimport, {failed} gagal")
+    return EXIT_FAILED if failed else EXIT_OK
+
+def cmd_peran(args):
+    """Ubah peran akun: kantor_pusat melihat laporan konsolidasi semua farm, farm hanya datanya sendiri"""
+    from buffabook.auth import init_auth_db, set_user_role
+
+    init_auth_db()
+    if not set_user_role(args.email.strip(), args.role):
+        _progress(f"Akun tidak ditemukan: {args.email}")
+        return EXIT_FAILED
+    _progress(f"{args.email}: peran sekarang {args.role}")
+    return EXIT_OK
+
+def cmd_serve(args):
+    """Layanan HTTP JSON untuk posting dari aplikasi lain (lihat buffabook.server)"""
+    from buffabook.server import serve
+
+    token = args.token or os.environ.get('BUFFABOOK_API_TOKEN')
+    _progress(f"Layanan posting berjalan di http://{args.host}:{args.port}/api/posting"
+              f"{' (dengan token)' if token else ''}; Ctrl+C untuk berhenti")
+    serve(args.host, args.port, token)
+    return EXIT_OK
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m buffabook', description="Pekerjaan batch BuffaBook")
+    parser.add_argument('--data-dir', default='.', help="Direktori aplikasi berisi file data (default: direktori kerja)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_farm(command, allow_all=False):
+        command.add_argument('--farm', help="ID tenant (default: data bersama di direktori aplikasi)")
+        if allow_all:
+            command.add_argument('--all-farms', action='store_true', help="Proses semua farm")
+
+    recalc = commands.add_parser('recalc', help="Hitung ulang saldo Buku Besar")
+    add_farm(recalc, allow_all=True)
+    recalc.set_defaults(handler=cmd_recalc)
+
+    export = commands.add_parser('export-jurnal', help="Export Jurnal Umum ke CSV")
+    add_farm(export)
+    export.add_argument('-o', '--output', default='-', help="File CSV tujuan (default: stdout)")
+    export.set_defaults(handler=cmd_export_jurnal)
+
+    neraca = commands.add_parser('neraca-saldo', help="Neraca saldo ke CSV")
+    add_farm(neraca)
+    neraca.add_argument('--as-of', help="Tanggal (YYYY-MM-DD); default semua transaksi")
+    neraca.add_argument('-o', '--output', default='-')
+    neraca.set_defaults(handler=cmd_neraca_saldo)
+
+    laba_rugi = commands.add_parser('laba-rugi', help="Laporan laba rugi ke CSV")
+    add_farm(laba_rugi)
+    laba_rugi.add_argument('--start', help="Awal periode (YYYY-MM-DD)")
+    laba_rugi.add_argument('--end', help="Akhir periode (YYYY-MM-DD)")
+    laba_rugi.add_argument('-o', '--output', default='-')
+    laba_rugi.set_defaults(handler=cmd_laba_rugi)
+
+    importer = commands.add_parser('import-pembelian', help="Import pembelian dari CSV")
+    add_farm(importer)
+    importer.add_argument('file', help=f"CSV dengan kolom {', '.join(IMPORT_COLUMNS)}")
+    importer.set_defaults(handler=cmd_import_pembelian)
+
+    role = commands.add_parser('peran', help="Ubah peran akun (kantor_pusat / farm)")
+    role.add_argument('email')
+    role.add_argument('role', choices=['farm', 'kantor_pusat'])
+    role.set_defaults(handler=cmd_peran)
+
+    server = commands.add_parser('serve', help="Layanan HTTP JSON untuk posting dari aplikasi lain")
+    server.add_argument('--host', default='127.0.0.1', help="Alamat (default: hanya komputer ini)")
+    server.add_argument('--port', type=int, default=8600)
+    server.add_argument('--token', help="Token Bearer wajib (atau env BUFFABOOK_API_TOKEN)")
+    server.set_defaults(handler=cmd_serve)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # Tanpa server Streamlit: sembunyikan peringatan "No runtime found" dari cache
+    streamlit.logger.set_log_level('ERROR')
+    try:
+        os.chdir(args.data_dir)
+    except OSError as e:
+        _progress(f"Direktori data tidak bisa dibuka: {e}")
+        return EXIT_USAGE
+    try:
+        return args.handler(args)
+    except KeyboardInterrupt:
+        _progress("Dibatalkan")
+        return EXIT_FAILED
+    except Exception as e:
+        _progress(f"Error: {e}")
+        return EXIT_FAILED
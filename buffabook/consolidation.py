@@ -0,0 +1,73 @@
+"""Konsolidasi laporan keuangan beberapa farm: neraca saldo tiap entitas dihitung paralel di process pool"""
+import streamlit as st
+import pandas as pd
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from buffabook.accounting import ACCOUNTS, compute_ledger_balances
+
+CONSOLIDATION_WORKERS = min(8, os.cpu_count() or 1)
+
+
+@st.cache_resource
+def get_consolidation_pool():
+    """Process pool bersama. 'spawn' agar worker tidak mewarisi thread dan lock server Streamlit"""
+    return ProcessPoolExecutor(max_workers=CONSOLIDATION_WORKERS,
+                               mp_context=multiprocessing.get_context('spawn'))
+
+@st.cache_resource
+def get_entity_balance_cache():
+    """Neraca saldo terakhir per file jurnal: path -> (mtime, DataFrame)"""
+    return {'lock': threading.Lock(), 'results': {}}
+
+def _entity_trial_balance(path):
+    """Dijalankan di proses worker: saldo per akun satu entitas"""
+    return compute_ledger_balances(path)[['account_num', 'account_name', 'saldo_sen']]
+
+def entity_balances(paths):
+    """Neraca saldo tiap file jurnal. Hanya file yang berubah yang dihitung ulang;
+    jika lebih dari satu, semuanya dikirim ke process pool sekaligus."""
+    cache = get_entity_balance_cache()
+    mtimes = {path: os.path.getmtime(path) for path in paths}
+    with cache['lock']:
+        stale = [path for path in paths if cache['results'].get(path, (None,))[0] != mtimes[path]]
+
+    if len(stale) > 1:
+        computed = list(get_consolidation_pool().map(_entity_trial_balance, stale))
+    else:
+        # Satu file tidak sebanding dengan ongkos kirim ke proses lain
+        computed = [_entity_trial_balance(path) for path in stale]
+
+    with cache['lock']:
+        for path, balances in zip(stale, computed):
+            cache['results'][path] = (mtimes[path], balances)
+        return {path: cache['results'][path][1] for path in paths}
+
+def consolidate(entities):
+    """Gabungkan neraca saldo beberapa entitas ke bagan akun bersama (kode akun).
+
+    entities: dict nama entitas -> path journal_ledger.xlsx
+    Return (balances, by_entity):
+    - balances: saldo konsolidasi dengan kolom yang sama seperti load_ledger_balances()
+    - by_entity: saldo_sen per akun (baris) x entitas (kolom)
+    """
+    frames = entity_balances(list(entities.values()))
+    combined = pd.concat([frames[path].assign(entitas=name) for name, path in entities.items()],
+                         ignore_index=True)
+    # Nama akun mengikuti bagan akun standar; akun di luar bagan memakai nama dari entitas pertama
+    names = combined.groupby('account_num', sort=True)['account_name'].first()
+    names = names.index.to_series().map(ACCOUNTS).fillna(names)
+
+    by_entity = combined.pivot_table(index='account_num', columns='entitas', values='saldo_sen',
+                                     aggfunc='sum', fill_value=0).reindex(columns=list(entities))
+    by_entity = by_entity.fillna(0).astype('int64')
+    by_entity.columns.name = None
+    balances = pd.DataFrame({
+        'account': by_entity.index + ' - ' + names.reindex(by_entity.index).values,
+        'account_num': by_entity.index,
+        'account_name': names.reindex(by_entity.index).values,
+        'saldo_sen': by_entity.sum(axis=1).values,
+    })
+    return balances.reset_index(drop=True), by_entity
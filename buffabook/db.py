@@ -0,0 +1,92 @@
+"""Akses SQLite bersama: pool koneksi WAL, statement cache dan transaksi berbasis context manager"""
+import sqlite3
+import threading
+import queue
+from contextlib import contextmanager
+
+POOL_SIZE = 8
+BUSY_TIMEOUT_SECONDS = 5.0
+STATEMENT_CACHE_SIZE = 128
+
+_pools = {}
+_schemas_ready = set()
+_lock = threading.Lock()
+_schema_lock = threading.Lock()
+_local = threading.local()
+
+
+def _open_connection(path):
+    """Koneksi baru dalam mode WAL: pembaca tidak menunggu penulis, penulis tidak memblokir pembaca.
+    isolation_level=None -> transaksi hanya lewat transaction(), bukan BEGIN implisit"""
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None,
+                           check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+def _pool(path):
+    with _lock:
+        if path not in _pools:
+            _pools[path] = queue.LifoQueue(maxsize=POOL_SIZE)
+        return _pools[path]
+
+@contextmanager
+def connection(path):
+    """Pinjam koneksi dari pool untuk file database `path`.
+
+    Pemanggilan bersarang di thread yang sama memakai koneksi yang sama, jadi fungsi
+    yang saling memanggil ikut dalam satu transaksi. Koneksi dikembalikan ke pool
+    (bukan ditutup) agar statement cache-nya terpakai ulang oleh rerun berikutnya.
+    """
+    active = getattr(_local, 'active', None)
+    if active is None:
+        active = _local.active = {}
+    if path in active:
+        yield active[path]
+        return
+
+    pool = _pool(path)
+    try:
+        conn = pool.get_nowait()
+    except queue.Empty:
+        conn = _open_connection(path)
+    active[path] = conn
+    try:
+        yield conn
+    finally:
+        del active[path]
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+@contextmanager
+def transaction(path):
+    """BEGIN IMMEDIATE ... COMMIT; rollback otomatis jika terjadi exception.
+    Transaksi bersarang bergabung dengan transaksi terluar."""
+    with connection(path) as conn:
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+def ensure_schema(path, *statements):
+    """Jalankan DDL (CREATE ... IF NOT EXISTS) sekali per proses untuk setiap file database"""
+    key = (path, statements)
+    if key in _schemas_ready:
+        return
+    with _schema_lock:
+        if key in _schemas_ready:
+            return
+        with transaction(path) as conn:
+            for statement in statements:
+                conn.execute(statement)
+        _schemas_ready.add(key)
@@ -0,0 +1,950 @@
+"""Persediaan: transaksi, reservasi stok, registri ternak, lokasi, stock opname, reklasifikasi, rekonsiliasi"""
+import streamlit as st
+import openpyxl
+from openpyxl import load_workbook
+import pandas as pd
+import os
+from datetime import datetime, date as date_type
+import bisect
+import threading
+import time
+import uuid
+
+from buffabook.tenant import current_tenant, data_file, journal_file, write_lock
+from buffabook.values import (
+    DEFAULT_UNIT, from_sen, parse_qty_column, parse_rupiah_column, safe_parse_int_from_qtytext,
+    safe_parse_price, to_rupiah, to_sen, to_sen_column
+)
+from buffabook.storage import (
+    ADJUSTMENT_SHEET_HEADER, AGE_CLASSES, ANIMAL_SHEET_HEADER, DEFAULT_LOCATION, RECLASS_SHEET_HEADER,
+    TRANSFER_SHEET_HEADER, _read_sheets, _row_location, animal_product_name, rollback_on_error, save_workbook
+)
+from buffabook.accounting import (
+    create_journal_workbook, get_inventory_account, post_journal_entry, save_journal_workbook
+)
+
+
+def delete_purchase_transaction(purchase_data):
+    """Hapus transaksi pembelian dari semua sistem"""
+    try:
+        with write_lock():
+            # 1. Hapus dari database pembelian
+            wb = openpyxl.load_workbook(data_file())
+            ws_purchases = wb['Purchases']
+        
+            # Hapus baris dari purchases
+            ws_purchases.delete_rows(purchase_data['row_index'])
+        
+            # 2. Update inventory (kurangi stok dan hitung ulang average cost)
+            ws_inventory = wb['Inventory']
+            product_name = purchase_data['product_name']
+            quantity_to_remove = safe_parse_int_from_qtytext(purchase_data['quantity'])
+            price_to_remove = safe_parse_price(purchase_data['price'])
+            total_to_remove = safe_parse_price(purchase_data['total'])
+        
+            # Cari produk di inventory
+            for row in ws_inventory.iter_rows(min_row=2, values_only=False):
+                if row[0].value and str(row[0].value).strip().lower() == product_name.strip().lower():
+                    current_qty = safe_parse_int_from_qtytext(row[1].value)
+                    current_avg_price = safe_parse_price(row[2].value) if row[2].value else 0
+                
+                    # Hitung quantity baru
+                    new_qty = current_qty - quantity_to_remove
+                
+                    if new_qty <= 0:
+                        # Hapus produk dari inventory jika stok habis
+                        ws_inventory.delete_rows(row[0].row)
+                    else:
+                        # Hitung average price baru
+                        if new_qty > 0:
+                            # Total value sebelum penghapusan
+                            total_value_before = current_avg_price * current_qty
+                            # Total value yang dihapus
+                            total_value_removed = price_to_remove * quantity_to_remove
+                            # Total value setelah penghapusan
+                            total_value_after = total_value_before - total_value_removed
+                            # Average price baru
+                            new_avg_price = total_value_after / new_qty
+                        
+                            # Update inventory
+                            row[1].value = new_qty
+                            row[2].value = to_rupiah(new_avg_price)
+                            row[3].value = to_rupiah(total_value_after)
+                
+                    break
+        
+            save_workbook(wb, data_file())
+            wb.close()
+        
+            return True
+        
+    except Exception as e:
+        st.error(f"Error dalam delete_purchase_transaction: {e}")
+        return False
+
+def delete_sales_transaction(sale_data):
+    """Hapus transaksi penjualan dari semua sistem"""
+    try:
+        with write_lock():
+            # 1. Hapus dari database penjualan
+            wb = openpyxl.load_workbook(data_file())
+            ws_sales = wb['Sales']
+        
+            # Hapus baris dari sales
+            ws_sales.delete_rows(sale_data['row_index'])
+        
+            # 2. Update inventory (tambahkan kembali stok yang terjual)
+            ws_inventory = wb['Inventory']
+            product_name = sale_data['product_name']
+            quantity_to_restore = safe_parse_int_from_qtytext(sale_data['quantity'])
+            selling_price = safe_parse_price(sale_data['price'])
+        
+            # Cari produk di inventory untuk mendapatkan HPP
+            hpp_price = 0
+            product_found = False
+        
+            for row in ws_inventory.iter_rows(min_row=2, values_only=False):
+                if row[0].value and str(row[0].value).strip().lower() == product_name.strip().lower():
+                    current_qty = safe_parse_int_from_qtytext(row[1].value)
+                    current_avg_price = safe_parse_price(row[2].value) if row[2].value else 0
+                
+                    # Kembalikan stok
+                    new_qty = current_qty + quantity_to_restore
+                
+                    # Hitung average price baru (gunakan harga average yang ada)
+                    new_avg_price = current_avg_price  # Tetap menggunakan average price yang ada
+                
+                    # Update inventory
+                    row[1].value = new_qty
+                    row[2].value = to_rupiah(new_avg_price)
+                    row[3].value = to_rupiah(new_avg_price * new_qty)
+                
+                    hpp_price = current_avg_price
+                    product_found = True
+                    break
+        
+            # Jika produk tidak ditemukan, buat baru
+            if not product_found:
+                ws_inventory.append([
+                    product_name,
+                    quantity_to_restore,
+                    to_rupiah(hpp_price),
+                    to_rupiah(hpp_price * quantity_to_restore),
+                    sale_data.get('unit') or DEFAULT_UNIT
+                ])
+        
+            save_workbook(wb, data_file())
+            wb.close()
+        
+            return True
+        
+    except Exception as e:
+        st.error(f"Error dalam delete_sales_transaction: {e}")
+        return False
+
+# Reservasi stok untuk daftar penjualan sementara
+RESERVATION_TTL_SECONDS = 30 * 60
+
+@st.cache_resource
+def get_stock_reservations(tenant):
+    """Penyimpanan reservasi stok in-memory per tenant, dibagi ke semua sesi farm tersebut"""
+    return {'lock': threading.Lock(), 'holds': {}}
+
+def get_reservation_owner():
+    """ID pemilik reservasi untuk sesi browser saat ini"""
+    if 'reservation_owner' not in st.session_state:
+        st.session_state.reservation_owner = uuid.uuid4().hex
+    return st.session_state.reservation_owner
+
+def _prune_expired_reservations(holds, now):
+    expired = [owner for owner, hold in holds.items() if now - hold['touched'] > RESERVATION_TTL_SECONDS]
+    for owner in expired:
+        del holds[owner]
+
+def reserve_stock(product_name, quantity, stock_on_hand, location, located_on_hand):
+    """Tahan stok untuk sesi ini jika tersedia, per produk dan per kandang.
+    Reservasi semua sesi (termasuk daftar sesi ini) dihitung di kedua batas, jadi dua sesi
+    tidak bisa memesan ekor yang sama di satu kandang. Return (berhasil, stok_tersedia)"""
+    store = get_stock_reservations(current_tenant())
+    owner = get_reservation_owner()
+    key = (product_name.strip().lower(), location)
+    now = time.time()
+    with store['lock']:
+        holds = store['holds']
+        _prune_expired_reservations(holds, now)
+        reserved_product = sum(qty for hold in holds.values()
+                               for (product, _), qty in hold['items'].items() if product == key[0])
+        reserved_here = sum(hold['items'].get(key, 0) for hold in holds.values())
+        available = min(stock_on_hand - reserved_product, located_on_hand - reserved_here)
+        if available < quantity:
+            return False, available
+        hold = holds.setdefault(owner, {'items': {}, 'touched': now})
+        hold['items'][key] = hold['items'].get(key, 0) + quantity
+        hold['touched'] = now
+        return True, available - quantity
+
+def release_reservations(owner=None):
+    """Lepaskan semua reservasi milik sesi ini"""
+    store = get_stock_reservations(current_tenant())
+    owner = owner or get_reservation_owner()
+    with store['lock']:
+        store['holds'].pop(owner, None)
+
+def commit_reserved_stock(ws_inventory, order_list):
+    """Kurangi stok Inventory untuk semua pesanan. Return pesan error atau None"""
+    inventory_rows = {}
+    for row in ws_inventory.iter_rows(min_row=2, values_only=False):
+        if row[0].value:
+            inventory_rows[str(row[0].value).strip().lower()] = row
+
+    required = {}
+    for order in order_list:
+        key = order['product_name'].strip().lower()
+        required[key] = required.get(key, 0) + safe_parse_int_from_qtytext(order['quantity'])
+
+    for key, quantity in required.items():
+        row = inventory_rows.get(key)
+        stock = safe_parse_int_from_qtytext(row[1].value) if row else 0
+        if stock < quantity:
+            return f"Stok {key} hanya {stock} ekor, pesanan {quantity} ekor"
+
+    required_by_location = {}
+    for order in order_list:
+        pair = (order['product_name'], order.get('location', DEFAULT_LOCATION))
+        required_by_location[pair] = required_by_location.get(pair, 0) + safe_parse_int_from_qtytext(order['quantity'])
+    for (product_name, location), quantity in required_by_location.items():
+        located = product_locations(product_name).get(location, 0)
+        if located < quantity:
+            return f"Stok {product_name} di {location} hanya {located} ekor, pesanan {quantity} ekor"
+
+    sell_out_remainder = {}
+    for key, quantity in required.items():
+        row = inventory_rows[key]
+        hpp_price = safe_parse_price(row[2].value) if row[2].value else 0
+        new_stock = safe_parse_int_from_qtytext(row[1].value) - quantity
+        # Nilai dikurangi sebesar HPP yang dijurnal, bukan dihitung ulang dari harga rata-rata yang sudah dibulatkan,
+        # agar nilai Inventory tetap sama dengan saldo akun persediaan di Buku Besar
+        new_total = (safe_parse_price(row[3].value) if row[3].value else 0) - hpp_price * quantity
+        row[1].value = new_stock
+        row[3].value = to_rupiah(new_total) if new_stock > 0 else 0
+        if new_stock == 0:
+            sell_out_remainder[key] = new_total
+
+    # HPP final diambil dari harga rata-rata saat stok benar-benar dikurangi
+    for order in order_list:
+        row = inventory_rows[order['product_name'].strip().lower()]
+        hpp_price = safe_parse_price(row[2].value) if row[2].value else 0
+        order['hpp_price'] = hpp_price
+        order['total_hpp'] = hpp_price * safe_parse_int_from_qtytext(order['quantity'])
+    # Stok habis: sisa pembulatan nilai ikut menjadi HPP pesanan terakhir produk itu
+    for order in reversed(order_list):
+        remainder = sell_out_remainder.pop(order['product_name'].strip().lower(), 0)
+        order['total_hpp'] += remainder
+
+    return None
+
+@st.cache_resource
+def get_animal_registry(tenant):
+    """Indeks registri ternak in-memory per tenant, dibagi ke semua sesi farm tersebut.
+
+    - by_tag: ear tag -> record (lookup O(1))
+    - tags_sorted: ear tag terurut untuk pencarian prefix (O(log n))
+    - birth_index: (tanggal lahir, ear tag) terurut untuk ternak aktif
+    - class_totals: nama produk -> jumlah ekor dan total biaya ternak aktif
+    """
+    return {
+        'lock': threading.RLock(),
+        'mtime': None,
+        'by_tag': {},
+        'tags_sorted': [],
+        'birth_index': [],
+        'class_totals': {},
+    }
+
+def _animal_iso_date(value):
+    if isinstance(value, (datetime, date_type)):
+        return value.strftime('%Y-%m-%d')
+    return str(value).strip() if value else ''
+
+def _registry_index_add(registry, record):
+    registry['by_tag'][record['tag']] = record
+    bisect.insort(registry['tags_sorted'], record['tag'])
+    if record['status'] == "Aktif":
+        if record['birth_date']:
+            bisect.insort(registry['birth_index'], (record['birth_date'], record['tag']))
+        totals = registry['class_totals'].setdefault(record['product_name'], {'count': 0, 'cost': 0.0})
+        totals['count'] += 1
+        totals['cost'] += record['cost']
+
+def _registry_index_remove(registry, record):
+    del registry['by_tag'][record['tag']]
+    tags = registry['tags_sorted']
+    del tags[bisect.bisect_left(tags, record['tag'])]
+    if record['status'] == "Aktif":
+        if record['birth_date']:
+            births = registry['birth_index']
+            del births[bisect.bisect_left(births, (record['birth_date'], record['tag']))]
+        totals = registry['class_totals'][record['product_name']]
+        totals['count'] -= 1
+        totals['cost'] -= record['cost']
+        if totals['count'] == 0:
+            del registry['class_totals'][record['product_name']]
+
+def _ensure_animal_sheet(wb):
+    if 'Animals' not in wb.sheetnames:
+        ws_animals = wb.create_sheet("Animals")
+        ws_animals.append(ANIMAL_SHEET_HEADER)
+    return wb['Animals']
+
+def load_animal_registry():
+    """Registri ternak terkini; sheet Animals hanya dibaca ulang jika file berubah"""
+    registry = get_animal_registry(current_tenant())
+    with registry['lock']:
+        mtime = os.path.getmtime(data_file())
+        if registry['mtime'] == mtime:
+            return registry
+        
+        registry['by_tag'].clear()
+        registry['tags_sorted'].clear()
+        registry['birth_index'].clear()
+        registry['class_totals'].clear()
+        
+        wb = openpyxl.load_workbook(data_file(), read_only=True)
+        if 'Animals' in wb.sheetnames:
+            records = []
+            for i, row in enumerate(wb['Animals'].iter_rows(min_row=2, values_only=True), 2):
+                if not row or not row[0]:
+                    continue
+                row = tuple(row) + (None,) * (8 - len(row))
+                tag, age_class, sex, birth_date, purchase_date, cost, status, status_date = row[:8]
+                records.append({
+                    'row_index': i,
+                    'tag': str(tag).strip(),
+                    'age_class': age_class,
+                    'sex': sex,
+                    'product_name': animal_product_name(age_class, sex),
+                    'birth_date': _animal_iso_date(birth_date),
+                    'purchase_date': _animal_iso_date(purchase_date),
+                    'cost': safe_parse_price(cost),
+                    'status': status or "Aktif",
+                    'status_date': _animal_iso_date(status_date),
+                })
+            # Bangun indeks terurut sekali, bukan insort per baris
+            for record in records:
+                registry['by_tag'][record['tag']] = record
+                if record['status'] == "Aktif":
+                    totals = registry['class_totals'].setdefault(record['product_name'], {'count': 0, 'cost': 0.0})
+                    totals['count'] += 1
+                    totals['cost'] += record['cost']
+            registry['tags_sorted'].extend(sorted(registry['by_tag']))
+            registry['birth_index'].extend(sorted(
+                (r['birth_date'], r['tag']) for r in records if r['status'] == "Aktif" and r['birth_date']
+            ))
+        wb.close()
+        
+        registry['mtime'] = mtime
+        return registry
+
+def registry_search(prefix, limit=50):
+    """Ear tag yang diawali prefix, memakai indeks terurut (O(log n + limit))"""
+    registry = load_animal_registry()
+    tags = registry['tags_sorted']
+    start = bisect.bisect_left(tags, prefix)
+    result = []
+    for tag in tags[start:start + limit]:
+        if not tag.startswith(prefix):
+            break
+        result.append(registry['by_tag'][tag])
+    return result
+
+def registry_class_totals():
+    """Jumlah ekor dan total biaya ternak aktif per kelas produk (O(1) per kelas)"""
+    registry = load_animal_registry()
+    with registry['lock']:
+        return {name: dict(totals) for name, totals in registry['class_totals'].items()}
+
+def untagged_stock_error(ws_inventory, demands, released=None):
+    """Stok tanpa ear tag yang dipakai transaksi per jumlah tidak boleh memakan ekor terdaftar di registri.
+    demands: nama produk -> total qty keluar; released: bagian dari qty itu yang berupa ekor ber-ear tag.
+    Return pesan error atau None"""
+    registry = load_animal_registry()
+    with registry['lock']:
+        tagged = {name.strip().lower(): totals['count'] for name, totals in registry['class_totals'].items()}
+    released = {name.strip().lower(): qty for name, qty in (released or {}).items()}
+    stock = {}
+    for row in ws_inventory.iter_rows(min_row=2, max_col=2, values_only=True):
+        if row[0]:
+            stock[str(row[0]).strip().lower()] = safe_parse_int_from_qtytext(row[1])
+    for product_name, quantity in demands.items():
+        key = product_name.strip().lower()
+        if not tagged.get(key):
+            continue
+        untagged = stock.get(key, 0) - tagged[key]
+        if untagged < quantity - released.get(key, 0):
+            return (f"Stok {product_name} tanpa ear tag hanya {max(untagged, 0)} ekor ({tagged[key]} ekor terdaftar "
+                    f"di registri); ternak ber-ear tag dijual/dipindah lewat Registri Ternak")
+    return None
+
+@st.cache_resource
+def get_location_index(tenant):
+    """Indeks stok per (produk, lokasi) in-memory per tenant, dibagi ke semua sesi farm tersebut.
+
+    - by_location: lokasi -> {produk: qty}  ("stok di kandang X", O(1))
+    - by_product: produk -> {lokasi: qty}   ("lokasi produk Y", O(1))
+    """
+    return {
+        'lock': threading.RLock(),
+        'mtime': None,
+        'by_location': {},
+        'by_product': {},
+        'names': {},
+    }
+
+def _location_index_apply(index, product_name, location, qty):
+    key = str(product_name).strip().lower()
+    index['names'].setdefault(key, str(product_name).strip())
+    by_product = index['by_product'].setdefault(key, {})
+    by_product[location] = by_product.get(location, 0) + qty
+    by_location = index['by_location'].setdefault(location, {})
+    by_location[key] = by_location.get(key, 0) + qty
+
+def _ensure_transfer_sheet(wb):
+    if 'Transfers' not in wb.sheetnames:
+        ws_transfers = wb.create_sheet("Transfers")
+        ws_transfers.append(TRANSFER_SHEET_HEADER)
+    return wb['Transfers']
+
+def load_location_index():
+    """Indeks lokasi terkini, dibangun dalam satu kali baca semua sheet mutasi jika file berubah"""
+    index = get_location_index(current_tenant())
+    with index['lock']:
+        mtime = os.path.getmtime(data_file())
+        if index['mtime'] == mtime:
+            return index
+        
+        index['by_location'].clear()
+        index['by_product'].clear()
+        index['names'].clear()
+        index['by_location'][DEFAULT_LOCATION] = {}
+        
+        wb = openpyxl.load_workbook(data_file(), read_only=True)
+        for sheet, sign in (('Purchases', 1), ('Sales', -1)):
+            for row in wb[sheet].iter_rows(min_row=2, values_only=True):
+                if row and row[1]:
+                    _location_index_apply(index, row[1], _row_location(row, 7),
+                                          sign * safe_parse_int_from_qtytext(row[2]))
+        if 'Reclassifications' in wb.sheetnames:
+            for row in wb['Reclassifications'].iter_rows(min_row=2, values_only=True):
+                if row and row[1] and row[2]:
+                    qty = safe_parse_int_from_qtytext(row[3])
+                    location = _row_location(row, 7)
+                    _location_index_apply(index, row[1], location, -qty)
+                    _location_index_apply(index, row[2], location, qty)
+        if 'Transfers' in wb.sheetnames:
+            for row in wb['Transfers'].iter_rows(min_row=2, values_only=True):
+                if row and row[1]:
+                    qty = safe_parse_int_from_qtytext(row[4])
+                    _location_index_apply(index, row[1], _row_location(row, 2), -qty)
+                    _location_index_apply(index, row[1], _row_location(row, 3), qty)
+        if 'Adjustments' in wb.sheetnames:
+            for row in wb['Adjustments'].iter_rows(min_row=2, values_only=True):
+                if row and row[1]:
+                    _location_index_apply(index, row[1], _row_location(row, 2), safe_parse_int_from_qtytext(row[3]))
+        wb.close()
+        
+        index['mtime'] = mtime
+        return index
+
+def stock_in_location(location):
+    """Stok semua produk di satu lokasi: {nama produk: qty}"""
+    index = load_location_index()
+    with index['lock']:
+        return {index['names'][key]: qty for key, qty in index['by_location'].get(location, {}).items() if qty}
+
+def product_locations(product_name):
+    """Lokasi yang menyimpan suatu produk: {lokasi: qty}"""
+    index = load_location_index()
+    with index['lock']:
+        return {loc: qty for loc, qty in index['by_product'].get(str(product_name).strip().lower(), {}).items() if qty}
+
+def list_locations():
+    """Semua lokasi yang pernah dipakai, kandang utama selalu ada"""
+    index = load_location_index()
+    with index['lock']:
+        return sorted(index['by_location'])
+
+def transfer_stock(product_name, from_location, to_location, quantity, transfer_date):
+    """Pindahkan stok antar kandang (mutasi internal tanpa jurnal). Return (berhasil, pesan)"""
+    if from_location == to_location:
+        return False, "Lokasi asal dan tujuan sama"
+    with write_lock():
+        # Indeks dimuat/diperbarui setelah write lock didapat agar cek stok dan mtime baru sesuai file
+        index = load_location_index()
+        with index['lock']:
+            available = index['by_product'].get(product_name.strip().lower(), {}).get(from_location, 0)
+            if available < quantity:
+                return False, f"Stok {product_name} di {from_location} hanya {available}"
+        
+            wb = openpyxl.load_workbook(data_file())
+            ws_transfers = _ensure_transfer_sheet(wb)
+            ws_transfers.append([
+                transfer_date.strftime('%Y-%m-%d'), product_name, from_location, to_location,
+                int(quantity), datetime.now().strftime('%Y-%m-%d %H:%M:%S'), DEFAULT_UNIT
+            ])
+            save_workbook(wb, data_file())
+            wb.close()
+        
+            _location_index_apply(index, product_name, from_location, -quantity)
+            _location_index_apply(index, product_name, to_location, quantity)
+            index['mtime'] = os.path.getmtime(data_file())
+            return True, f"{quantity} {product_name} dipindahkan dari {from_location} ke {to_location}"
+
+# ========== STOCK OPNAME (PERHITUNGAN FISIK) ==========
+STOCK_VARIANCE_ACCOUNT = "6-60800 - Beban Selisih Persediaan"
+
+def _ensure_adjustment_sheet(wb):
+    if 'Adjustments' not in wb.sheetnames:
+        ws_adjustments = wb.create_sheet("Adjustments")
+        ws_adjustments.append(ADJUSTMENT_SHEET_HEADER)
+    return wb['Adjustments']
+
+def build_stock_count_sheet():
+    """Stok buku per (produk, lokasi) beserta harga rata-rata, sebagai dasar lembar hitung"""
+    index = load_location_index()
+    with index['lock']:
+        rows = [
+            (index['names'][key], location, qty)
+            for key, locations in index['by_product'].items()
+            for location, qty in locations.items()
+            if qty
+        ]
+    book = pd.DataFrame(rows, columns=['Produk', 'Lokasi', 'Stok Buku'])
+    
+    inventory = _read_sheets(data_file(), ['Inventory'], [4])['Inventory'].dropna(subset=[0])
+    avg_price = pd.Series(parse_rupiah_column(inventory[2]).values,
+                          index=inventory[0].astype(str).str.strip().str.lower())
+    book['Harga Rata-rata'] = book['Produk'].str.lower().map(avg_price).fillna(0.0)
+    book['Jumlah Fisik'] = book['Stok Buku']
+    return book.sort_values(['Lokasi', 'Produk']).reset_index(drop=True)
+
+def apply_uploaded_counts(book, uploaded):
+    """Timpa Jumlah Fisik dengan hasil hitung dari file CSV (kolom Produk, Lokasi, Jumlah Fisik)"""
+    counts = pd.read_csv(uploaded)
+    missing = {'Produk', 'Lokasi', 'Jumlah Fisik'} - set(counts.columns)
+    if missing:
+        raise ValueError(f"Kolom CSV tidak lengkap: {', '.join(sorted(missing))}")
+    counts = counts[['Produk', 'Lokasi', 'Jumlah Fisik']].copy()
+    counts['Produk'] = counts['Produk'].astype(str).str.strip()
+    counts['Lokasi'] = counts['Lokasi'].astype(str).str.strip()
+    merged = book.drop(columns=['Jumlah Fisik']).merge(counts, on=['Produk', 'Lokasi'], how='outer')
+    merged['Stok Buku'] = merged['Stok Buku'].fillna(0).astype('int64')
+    merged['Harga Rata-rata'] = merged.groupby('Produk')['Harga Rata-rata'].transform('max').fillna(0.0)
+    merged['Jumlah Fisik'] = merged['Jumlah Fisik'].fillna(merged['Stok Buku'])
+    return merged.sort_values(['Lokasi', 'Produk']).reset_index(drop=True)
+
+def compute_stock_variances(counts):
+    """Selisih fisik vs buku untuk semua baris sekaligus (vectorized)"""
+    result = counts.copy()
+    result['Jumlah Fisik'] = pd.to_numeric(result['Jumlah Fisik'], errors='coerce').fillna(result['Stok Buku']).astype('int64')
+    result['Selisih'] = result['Jumlah Fisik'] - result['Stok Buku']
+    result['Nilai Selisih'] = (result['Selisih'] * result['Harga Rata-rata']).round(2)
+    return result
+
+def post_stock_opname(count_date, variances):
+    """Posting semua selisih opname dalam satu kali simpan dan satu jurnal majemuk. Return (berhasil, pesan)"""
+    variances = variances[variances['Selisih'] != 0]
+    if variances.empty:
+        return False, "Tidak ada selisih untuk diposting"
+    
+    date_str = count_date.strftime('%Y-%m-%d')
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    index = load_location_index()
+    with write_lock(), rollback_on_error(data_file()), index['lock']:
+        wb = openpyxl.load_workbook(data_file())
+        ws_inventory = wb['Inventory']
+        inventory_rows = {}
+        for row in ws_inventory.iter_rows(min_row=2, values_only=False):
+            if row[0].value:
+                inventory_rows[str(row[0].value).strip().lower()] = row
+        
+        per_product = variances.groupby('Produk').agg(qty=('Selisih', 'sum'), value=('Nilai Selisih', 'sum'))
+        for product_name, totals in per_product.iterrows():
+            row = inventory_rows.get(product_name.strip().lower())
+            if row is None:
+                if totals['qty'] < 0:
+                    wb.close()
+                    return False, f"{product_name} tidak ada di Inventory"
+                ws_inventory.append([product_name, 0, 0, 0, DEFAULT_UNIT])
+                row = tuple(ws_inventory[ws_inventory.max_row])
+            new_qty = safe_parse_int_from_qtytext(row[1].value) + int(totals['qty'])
+            if new_qty < 0:
+                wb.close()
+                return False, f"Stok {product_name} akan menjadi negatif"
+            new_total = (safe_parse_price(row[3].value) if row[3].value else 0) + totals['value']
+            row[1].value = new_qty
+            row[3].value = to_rupiah(new_total) if new_qty > 0 else 0
+        
+        ws_adjustments = _ensure_adjustment_sheet(wb)
+        for product_name, location, diff, price, value in zip(
+                variances['Produk'], variances['Lokasi'], variances['Selisih'],
+                variances['Harga Rata-rata'], variances['Nilai Selisih']):
+            ws_adjustments.append([
+                date_str, product_name, location, int(diff),
+                to_rupiah(price), to_rupiah(value), timestamp, DEFAULT_UNIT
+            ])
+        
+        # Jurnal majemuk: selisih per akun persediaan melawan akun beban selisih persediaan
+        account_sen = pd.Series(to_sen_column(variances['Nilai Selisih']), index=variances.index) \
+            .groupby(variances['Produk'].map(get_inventory_account)).sum()
+        lines = []
+        for account, sen in account_sen.items():
+            if sen > 0:
+                lines.append((account, from_sen(sen), 0))
+            elif sen < 0:
+                lines.append((account, 0, from_sen(-sen)))
+        net_sen = int(account_sen.sum())
+        if net_sen > 0:
+            lines.append((STOCK_VARIANCE_ACCOUNT, 0, from_sen(net_sen)))
+        elif net_sen < 0:
+            lines.append((STOCK_VARIANCE_ACCOUNT, from_sen(-net_sen), 0))
+        
+        create_journal_workbook()
+        wb_journal = load_workbook(journal_file())
+        if lines:
+            post_journal_entry(wb_journal, date_str, f"Stock opname {date_str} - {len(variances)} selisih", lines)
+        
+        save_workbook(wb, data_file())
+        wb.close()
+        save_journal_workbook(wb_journal)
+        wb_journal.close()
+        
+        index['mtime'] = None
+        return True, f"{len(variances)} selisih stock opname berhasil diposting"
+
+# ========== REKLASIFIKASI KELAS UMUR (BATCH) ==========
+# Umur minimum (bulan) untuk tiap kelas
+AGE_CLASS_MIN_MONTHS = {"Anak": 0, "Remaja": 12, "Dewasa": 24}
+
+def _shift_months(d, months):
+    month_index = d.year * 12 + d.month - 1 + months
+    year, month = divmod(month_index, 12)
+    day = d.day
+    while True:
+        try:
+            return date_type(year, month + 1, day)
+        except ValueError:
+            day -= 1
+
+def age_class_on(birth_date_iso, cutoff):
+    """Kelas umur ternak pada tanggal cutoff berdasarkan tanggal lahir"""
+    birth = datetime.strptime(birth_date_iso, '%Y-%m-%d').date()
+    months = (cutoff.year - birth.year) * 12 + cutoff.month - birth.month - (1 if cutoff.day < birth.day else 0)
+    result = AGE_CLASSES[0]
+    for age_class in AGE_CLASSES:
+        if months >= AGE_CLASS_MIN_MONTHS[age_class]:
+            result = age_class
+    return result
+
+def find_due_reclassifications(cutoff):
+    """Ternak aktif yang kelas umurnya harus naik per tanggal cutoff.
+    
+    Hanya ternak yang lahir sebelum (cutoff - umur Remaja) yang diperiksa,
+    dicari dengan bisect pada indeks tanggal lahir.
+    """
+    registry = load_animal_registry()
+    threshold = _shift_months(cutoff, -AGE_CLASS_MIN_MONTHS["Remaja"]).strftime('%Y-%m-%d')
+    moves = []
+    with registry['lock']:
+        births = registry['birth_index']
+        end = bisect.bisect_right(births, (threshold, '\uffff'))
+        for birth_date, tag in births[:end]:
+            record = registry['by_tag'][tag]
+            target = age_class_on(birth_date, cutoff)
+            if AGE_CLASSES.index(target) > AGE_CLASSES.index(record['age_class']):
+                moves.append({
+                    'tag': tag,
+                    'sex': record['sex'],
+                    'from_class': record['age_class'],
+                    'to_class': target,
+                    'from_product': record['product_name'],
+                    'to_product': animal_product_name(target, record['sex']),
+                    'cost': record['cost'],
+                })
+    return moves
+
+def _ensure_reclass_sheet(wb):
+    if 'Reclassifications' not in wb.sheetnames:
+        ws_reclass = wb.create_sheet("Reclassifications")
+        ws_reclass.append(RECLASS_SHEET_HEADER)
+    return wb['Reclassifications']
+
+def post_reclassification(cutoff, animal_moves, quantity_moves, location=DEFAULT_LOCATION):
+    """Posting reklasifikasi sebagai satu jurnal majemuk dan satu kali simpan persediaan.
+    
+    animal_moves: hasil find_due_reclassifications (dinilai sebesar biaya per ekor).
+    quantity_moves: list dict from_product, to_product, quantity untuk stok tanpa
+    ear tag (dinilai sebesar harga rata-rata persediaan asal).
+    location: kandang tempat ternak yang direklasifikasi berada.
+    Return (berhasil, pesan).
+    """
+    date_str = cutoff.strftime('%Y-%m-%d')
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    # Gabungkan per pasangan produk asal -> tujuan
+    transfers = {}
+    for move in animal_moves:
+        transfer = transfers.setdefault((move['from_product'], move['to_product']), {'qty': 0, 'cost': 0.0, 'tags': []})
+        transfer['qty'] += 1
+        transfer['cost'] += move['cost']
+        transfer['tags'].append(move['tag'])
+    
+    with write_lock(), rollback_on_error(data_file()):
+        registry = load_animal_registry()
+        with registry['lock']:
+            wb = openpyxl.load_workbook(data_file())
+            ws_inventory = wb['Inventory']
+            inventory_rows = {}
+            for row in ws_inventory.iter_rows(min_row=2, values_only=False):
+                if row[0].value:
+                    inventory_rows[str(row[0].value).strip().lower()] = row
+        
+            for move in quantity_moves:
+                if move['quantity'] <= 0 or move['from_product'] == move['to_product']:
+                    continue
+                row = inventory_rows.get(move['from_product'].strip().lower())
+                avg_price = safe_parse_price(row[2].value) if row and row[2].value else 0
+                transfer = transfers.setdefault((move['from_product'], move['to_product']), {'qty': 0, 'cost': 0.0, 'tags': []})
+                transfer['qty'] += move['quantity']
+                transfer['cost'] += avg_price * move['quantity']
+        
+            if not transfers:
+                wb.close()
+                return False, "Tidak ada ternak yang perlu direklasifikasi"
+        
+            # Validasi stok asal
+            needed = {}
+            for (from_product, _), transfer in transfers.items():
+                needed[from_product] = needed.get(from_product, 0) + transfer['qty']
+            # Perpindahan per jumlah hanya boleh memakai stok tanpa ear tag
+            tagged_moves = {}
+            for (from_product, _), transfer in transfers.items():
+                tagged_moves[from_product] = tagged_moves.get(from_product, 0) + len(transfer['tags'])
+            untagged_error = untagged_stock_error(ws_inventory, needed, tagged_moves)
+            if untagged_error:
+                wb.close()
+                return False, untagged_error
+            for from_product, qty in needed.items():
+                row = inventory_rows.get(from_product.strip().lower())
+                stock = safe_parse_int_from_qtytext(row[1].value) if row else 0
+                if stock < qty:
+                    wb.close()
+                    return False, f"Stok {from_product} di Inventory hanya {stock} ekor, reklasifikasi butuh {qty} ekor"
+                located = product_locations(from_product).get(location, 0)
+                if located < qty:
+                    wb.close()
+                    return False, f"Stok {from_product} di {location} hanya {located} ekor, reklasifikasi butuh {qty} ekor"
+        
+            # Update Inventory: kurangi asal, tambah tujuan (harga rata-rata dihitung ulang)
+            for (from_product, to_product), transfer in transfers.items():
+                for product, qty_delta, value_delta in ((from_product, -transfer['qty'], -transfer['cost']),
+                                                        (to_product, transfer['qty'], transfer['cost'])):
+                    row = inventory_rows.get(product.strip().lower())
+                    if row is None:
+                        ws_inventory.append([product, 0, 0, 0, DEFAULT_UNIT])
+                        row = tuple(ws_inventory[ws_inventory.max_row])
+                        inventory_rows[product.strip().lower()] = row
+                    new_qty = safe_parse_int_from_qtytext(row[1].value) + qty_delta
+                    new_total = (safe_parse_price(row[3].value) if row[3].value else 0) + value_delta
+                    row[1].value = new_qty
+                    row[2].value = to_rupiah(new_total / new_qty) if new_qty > 0 else 0
+                    row[3].value = to_rupiah(new_total) if new_qty > 0 else 0
+        
+            # Log reklasifikasi (dipakai kartu persediaan dan rekonsiliasi)
+            ws_reclass = _ensure_reclass_sheet(wb)
+            for (from_product, to_product), transfer in transfers.items():
+                ws_reclass.append([
+                    date_str, from_product, to_product, transfer['qty'],
+                    to_rupiah(transfer['cost']), timestamp, ", ".join(transfer['tags']), location, DEFAULT_UNIT
+                ])
+        
+            # Update kelas di registri
+            ws_animals = _ensure_animal_sheet(wb)
+            for move in animal_moves:
+                ws_animals.cell(row=registry['by_tag'][move['tag']]['row_index'], column=2, value=move['to_class'])
+        
+            # Jurnal majemuk: debit akun persediaan tujuan, kredit akun persediaan asal
+            account_totals = {}
+            for (from_product, to_product), transfer in transfers.items():
+                to_account = get_inventory_account(to_product)
+                from_account = get_inventory_account(from_product)
+                cost_sen = to_sen(transfer['cost'])
+                account_totals[to_account] = account_totals.get(to_account, 0) + cost_sen
+                account_totals[from_account] = account_totals.get(from_account, 0) - cost_sen
+            lines = []
+            for account in sorted(account_totals):
+                sen = account_totals[account]
+                if sen > 0:
+                    lines.append((account, from_sen(sen), 0))
+                elif sen < 0:
+                    lines.append((account, 0, from_sen(-sen)))
+        
+            create_journal_workbook()
+            wb_journal = load_workbook(journal_file())
+            total_qty = sum(transfer['qty'] for transfer in transfers.values())
+            if lines:
+                post_journal_entry(wb_journal, date_str, f"Reklasifikasi kelas umur per {date_str} - {total_qty} ekor", lines)
+        
+            save_workbook(wb, data_file())
+            wb.close()
+            save_journal_workbook(wb_journal)
+            wb_journal.close()
+        
+            # Perbarui kelas di indeks registri di tempat, tanpa membaca ulang sheet Animals
+            for move in animal_moves:
+                record = registry['by_tag'][move['tag']]
+                _registry_index_remove(registry, record)
+                _registry_index_add(registry, {**record, 'age_class': move['to_class'],
+                                               'product_name': move['to_product']})
+            registry['mtime'] = os.path.getmtime(data_file())
+            return True, f"{total_qty} ekor berhasil direklasifikasi per {date_str}"
+
+@st.cache_data(show_spinner=False)
+def _reconcile_inventory_cached(db_mtime, journal_mtime, db_path, journal_path):
+    return reconcile_inventory(db_path, journal_path)
+
+def reconcile_inventory(db_path=None, journal_path=None):
+    """Bandingkan Inventory, Pembelian-Penjualan, dan saldo akun Persediaan di Buku Besar.
+    
+    Return dict berisi DataFrame 'products' (selisih per produk), 'accounts'
+    (selisih per akun 1-12xxx) dan 'transactions' (transaksi terkait untuk ditelusuri).
+    """
+    db_path = db_path or data_file()
+    journal_path = journal_path or journal_file()
+    db = _read_sheets(db_path, ['Inventory', 'Purchases', 'Sales', 'Reclassifications', 'Adjustments'],
+                      [4, 6, 6, 7, 7])
+    reclass = db['Reclassifications'].dropna(subset=[1])
+    adjustments = db['Adjustments'].dropna(subset=[1])
+    if os.path.exists(journal_path):
+        ledger = _read_sheets(journal_path, ['Buku Besar'], [6])['Buku Besar']
+    else:
+        ledger = pd.DataFrame(columns=list(range(6)) + ['row'])
+
+    inventory = db['Inventory'].dropna(subset=[0])
+    inventory = pd.DataFrame({
+        'key': inventory[0].astype(str).str.strip().str.lower(),
+        'Produk': inventory[0].astype(str).str.strip(),
+        'Qty Inventory': parse_qty_column(inventory[1]),
+        'Nilai Inventory': parse_rupiah_column(inventory[3]),
+        'nilai_sen': to_sen_column(inventory[3]),
+    })
+
+    movements = []
+    for sheet, sign, label in (('Purchases', 1, 'Pembelian'), ('Sales', -1, 'Penjualan')):
+        df = db[sheet].dropna(subset=[1])
+        movements.append(pd.DataFrame({
+            'Sumber': label,
+            'Baris': df['row'],
+            'Tanggal': df[0].astype(str),
+            'key': df[1].astype(str).str.strip().str.lower(),
+            'Produk': df[1].astype(str).str.strip(),
+            'Qty': parse_qty_column(df[2]) * sign,
+            'Nominal': parse_rupiah_column(df[4]),
+        }))
+    for product_col, sign, label in ((1, -1, 'Reklasifikasi Keluar'), (2, 1, 'Reklasifikasi Masuk')):
+        movements.append(pd.DataFrame({
+            'Sumber': label,
+            'Baris': reclass['row'],
+            'Tanggal': reclass[0].astype(str),
+            'key': reclass[product_col].astype(str).str.strip().str.lower(),
+            'Produk': reclass[product_col].astype(str).str.strip(),
+            'Qty': parse_qty_column(reclass[3]) * sign,
+            'Nominal': parse_rupiah_column(reclass[4]),
+        }))
+    movements.append(pd.DataFrame({
+        'Sumber': 'Stock Opname',
+        'Baris': adjustments['row'],
+        'Tanggal': adjustments[0].astype(str),
+        'key': adjustments[1].astype(str).str.strip().str.lower(),
+        'Produk': adjustments[1].astype(str).str.strip(),
+        'Qty': parse_qty_column(adjustments[3]),
+        'Nominal': parse_rupiah_column(adjustments[5]),
+    }))
+    movements = pd.concat(movements, ignore_index=True)
+
+    qty_by_product = movements.pivot_table(index='key', columns='Sumber', values='Qty',
+                                           aggfunc='sum', fill_value=0)
+    qty_by_product = qty_by_product.reindex(
+        columns=['Pembelian', 'Penjualan', 'Reklasifikasi Masuk', 'Reklasifikasi Keluar', 'Stock Opname'], fill_value=0)
+    qty_by_product = pd.DataFrame({
+        'Qty Pembelian': qty_by_product['Pembelian'],
+        'Qty Penjualan': -qty_by_product['Penjualan'],
+        'Qty Reklasifikasi': qty_by_product['Reklasifikasi Masuk'] + qty_by_product['Reklasifikasi Keluar'],
+        'Qty Opname': qty_by_product['Stock Opname'],
+    })
+
+    names = pd.concat([inventory[['key', 'Produk']], movements[['key', 'Produk']]]).drop_duplicates('key')
+    products = (names.set_index('key')
+                .join(inventory.set_index('key')[['Qty Inventory', 'Nilai Inventory', 'nilai_sen']])
+                .join(qty_by_product)
+                .fillna({'Qty Inventory': 0, 'Nilai Inventory': 0.0, 'nilai_sen': 0, 'Qty Pembelian': 0,
+                         'Qty Penjualan': 0, 'Qty Reklasifikasi': 0, 'Qty Opname': 0}))
+    account_of = {key: get_inventory_account(name) for key, name in products['Produk'].items()}
+    products['Akun'] = products.index.map(account_of)
+    for col in ['Qty Inventory', 'Qty Pembelian', 'Qty Penjualan', 'Qty Reklasifikasi', 'Qty Opname', 'nilai_sen']:
+        products[col] = products[col].astype('int64')
+    products['Selisih Qty'] = products['Qty Inventory'] - (
+        products['Qty Pembelian'] - products['Qty Penjualan'] + products['Qty Reklasifikasi'] + products['Qty Opname'])
+
+    ledger = ledger.dropna(subset=[0])
+    ledger = pd.DataFrame({
+        'Sumber': 'Buku Besar',
+        'Baris': ledger['row'],
+        'Tanggal': ledger[1].astype(str),
+        'Akun': ledger[0].astype(str).str.strip(),
+        'Keterangan': ledger[2].fillna('').astype(str),
+        'Nominal': parse_rupiah_column(ledger[3]) - parse_rupiah_column(ledger[4]),
+        'nominal_sen': to_sen_column(ledger[3]) - to_sen_column(ledger[4]),
+    })
+    ledger = ledger[ledger['Akun'].str.startswith('1-12')]
+
+    # Saldo dijumlahkan dalam integer sen agar selisih eksak (tanpa toleransi pembulatan)
+    subledger_sen = products.groupby('Akun')['nilai_sen'].sum().rename('Nilai Inventory')
+    gl_sen = ledger.groupby('Akun')['nominal_sen'].sum().rename('Saldo Buku Besar')
+    accounts_sen = pd.concat([subledger_sen, gl_sen], axis=1).fillna(0).astype('int64')
+    accounts_sen['Selisih'] = accounts_sen['Nilai Inventory'] - accounts_sen['Saldo Buku Besar']
+    accounts = accounts_sen / 100
+    accounts.index.name = 'Akun'
+
+    movements['Akun'] = movements['key'].map(account_of)
+    movements['Keterangan'] = movements['Sumber'] + ' ' + movements['Produk']
+    transactions = pd.concat([
+        movements[['Sumber', 'Baris', 'Tanggal', 'Akun', 'Produk', 'Keterangan', 'Qty', 'Nominal']],
+        ledger.assign(Produk='', Qty=0)[['Sumber', 'Baris', 'Tanggal', 'Akun', 'Produk', 'Keterangan', 'Qty', 'Nominal']],
+    ], ignore_index=True)
+
+    return {
+        'products': products.reset_index(drop=True)[['Produk', 'Akun', 'Qty Inventory', 'Qty Pembelian',
+                                                     'Qty Penjualan', 'Qty Reklasifikasi', 'Qty Opname',
+                                                     'Selisih Qty', 'Nilai Inventory']],
+        'accounts': accounts.reset_index(),
+        'transactions': transactions,
+    }
+
+def get_reconciliation():
+    """Hasil rekonsiliasi, dihitung ulang hanya jika file data berubah"""
+    db_path, journal_path = data_file(), journal_file()
+    journal_mtime = os.path.getmtime(journal_path) if os.path.exists(journal_path) else 0
+    return _reconcile_inventory_cached(os.path.getmtime(db_path), journal_mtime, db_path, journal_path)
+
+def run_reconciliation_check():
+    """Jalankan rekonsiliasi setelah commit dan simpan ringkasannya di session state"""
+    try:
+        result = get_reconciliation()
+        st.session_state.reconciliation_issues = {
+            'products': int((result['products']['Selisih Qty'] != 0).sum()),
+            'accounts': int((result['accounts']['Selisih'] != 0).sum()),
+        }
+    except Exception as e:
+        st.session_state.reconciliation_issues = None
+        st.error(f"Error rekonsiliasi: {e}")
@@ -0,0 +1,51 @@
+"""Daftar halaman dan navigasi multipage (st.navigation)"""
+import streamlit as st
+
+from buffabook.auth import is_head_office, logout
+
+
+# key -> (judul, ikon, script halaman, tampil di menu sidebar)
+PAGES = {
+    "Dashboard": ("Dashboard", "📊", "app_pages/dashboard.py", True),
+    "Kartu Persediaan": ("Kartu Persediaan", "📦", "app_pages/kartu_persediaan.py", True),
+    "Ringkasan Penjualan": ("Ringkasan Penjualan", "📈", "app_pages/ringkasan_penjualan.py", True),
+    "Jurnal Umum": ("Input Jurnal Umum", "✍️", "app_pages/input_jurnal_umum.py", True),
+    "View Jurnal": ("Jurnal Umum", "📖", "app_pages/jurnal_umum.py", True),
+    "Buku Besar": ("Buku Besar", "📚", "app_pages/buku_besar.py", True),
+    "Neraca Saldo": ("Neraca Saldo", "⚖️", "app_pages/neraca_saldo.py", True),
+    "Jurnal Penyesuaian": ("Adjusting", "📘", "app_pages/jurnal_penyesuaian.py", True),
+    "Laporan Keuangan": ("Laporan Keuangan", "📋", "app_pages/laporan_keuangan.py", True),
+    "Laba Rugi": ("Laporan Laba Rugi", "📊", "app_pages/laba_rugi.py", False),
+    "Perubahan Modal": ("Laporan Perubahan Modal", "📈", "app_pages/perubahan_modal.py", False),
+    "Posisi Keuangan": ("Laporan Posisi Keuangan", "💰", "app_pages/posisi_keuangan.py", False),
+    "Konsolidasi": ("Konsolidasi Farm", "🏢", "app_pages/konsolidasi.py", False),
+}
+
+def build_navigation():
+    """Daftarkan semua halaman; menu bawaan disembunyikan karena sidebar punya menu sendiri"""
+    return st.navigation(
+        [st.Page(path, title=title, icon=icon, default=(key == "Dashboard"))
+         for key, (title, icon, path, _) in PAGES.items()],
+        position="hidden"
+    )
+
+def show_sidebar():
+    """Menu sidebar; page_link berpindah halaman tanpa rerun ganda"""
+    with st.sidebar:
+        st.markdown('<p class="sidebar-title">🐃 BuffaBook</p>', unsafe_allow_html=True)
+        st.markdown("---")
+        
+        for key, (title, icon, path, in_menu) in PAGES.items():
+            if in_menu:
+                st.page_link(path, label=title, icon=icon)
+        if is_head_office():
+            title, icon, path, _ = PAGES["Konsolidasi"]
+            st.page_link(path, label=title, icon=icon)
+        
+        st.markdown("---")
+        st.caption(f"👤 {st.session_state.user_email}")
+        st.button("🚪 Keluar", key="logout", on_click=logout, use_container_width=True)
+
+def open_page(key):
+    """Pindah ke halaman lain (dipakai tombol laporan dan drill-down)"""
+    st.switch_page(PAGES[key][2])
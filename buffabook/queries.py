@@ -0,0 +1,205 @@
+"""Indeks query (filter, urutan, paginasi) dan indeks pencarian transaksi"""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import os
+
+from buffabook.tenant import data_file, journal_file
+from buffabook.values import (
+    DEFAULT_UNIT, format_qty, format_rupiah, format_rupiah_column, parse_qty_column, parse_rupiah_column,
+    to_sen_column
+)
+from buffabook.storage import DEFAULT_LOCATION, _read_sheets
+from buffabook.accounting import create_journal_workbook
+
+
+# ========== QUERY LAYER: FILTER, URUTAN, PAGINASI ==========
+PAGE_SIZE_OPTIONS = [25, 50, 100, 250]
+# Dua versi file (lama/baru) untuk beberapa tenant aktif sekaligus
+TENANT_CACHE_ENTRIES = 16
+
+def _build_query_index(df, date_col, key_cols):
+    """Urutkan tabel berdasarkan tanggal sekali, lalu simpan indeks:
+    - dates: array tanggal terurut (rentang tanggal lewat searchsorted, O(log n))
+    - keys: kolom -> {nilai: posisi baris} (filter akun/produk/tipe tanpa scan)"""
+    df = df.assign(_date=df[date_col].fillna('').astype(str).str[:10])
+    df = df.sort_values(['_date', 'row'], kind='stable').reset_index(drop=True)
+    return {
+        'df': df.drop(columns='_date'),
+        'dates': df['_date'].to_numpy(dtype=str),
+        'date_col': date_col,
+        'keys': {col: {value: positions.astype('int64') for value, positions in df.groupby(col).indices.items()}
+                 for col in key_cols},
+    }
+
+def query_page(index, date_from=None, date_to=None, filters=None, sort_by=None, descending=True, offset=0, limit=50):
+    """Ambil satu halaman hasil query. Return (DataFrame halaman, jumlah baris yang cocok)"""
+    dates = index['dates']
+    lo = int(np.searchsorted(dates, date_from, side='left')) if date_from else 0
+    hi = int(np.searchsorted(dates, date_to, side='right')) if date_to else len(dates)
+    
+    positions = None
+    for col, value in (filters or {}).items():
+        if value is None:
+            continue
+        matched = index['keys'][col].get(value, np.empty(0, dtype='int64'))
+        positions = matched if positions is None else np.intersect1d(positions, matched, assume_unique=True)
+    if positions is None:
+        positions = np.arange(lo, hi)
+    else:
+        positions = positions[(positions >= lo) & (positions < hi)]
+    
+    if sort_by and sort_by != index['date_col']:
+        # Nilai kosong selalu di akhir, apa pun arah urutannya
+        values = pd.Series(index['df'][sort_by].to_numpy()[positions])
+        order = values.sort_values(ascending=not descending, kind='stable', na_position='last').index
+        positions = positions[order.to_numpy()]
+    elif descending:
+        positions = positions[::-1]
+    return index['df'].iloc[positions[offset:offset + limit]], len(positions)
+
+SEARCH_RESULT_LIMIT = 20
+
+def _amount_tokens(values):
+    """Nominal sebagai dua token: angka polos (1500000) dan bertitik (1.500.000)"""
+    amounts = pd.Series(np.rint(parse_rupiah_column(values).to_numpy()).astype('int64')).astype(str)
+    return amounts + ' ' + format_rupiah_column(values).str[3:]
+
+def _build_search_index(texts):
+    """Indeks token -> posisi baris. Token disimpan terurut sehingga pencarian prefix
+    (search-as-you-type) cukup dua kali searchsorted per kata, tanpa scan semua baris."""
+    tokens = pd.Series(texts, dtype=object).fillna('').str.lower().str.split().explode().dropna()
+    pairs = pd.DataFrame({'token': tokens.to_numpy(dtype=str), 'pos': tokens.index.to_numpy(dtype='int64')})
+    pairs = pairs.drop_duplicates().sort_values(['token', 'pos'], kind='stable')
+    return {'tokens': pairs['token'].to_numpy(dtype=str), 'positions': pairs['pos'].to_numpy()}
+
+def search_positions(search, query, within=None, limit=SEARCH_RESULT_LIMIT):
+    """Posisi baris yang memuat semua kata (sebagai prefix), maksimal limit, terbaru dulu"""
+    positions = within
+    for term in query.lower().split():
+        lo = np.searchsorted(search['tokens'], term, side='left')
+        hi = np.searchsorted(search['tokens'], term + '\uffff', side='left')
+        matched = np.unique(search['positions'][lo:hi])
+        positions = matched if positions is None else np.intersect1d(positions, matched, assume_unique=True)
+    return positions[-limit:][::-1]
+
+def transaction_label(row):
+    """Label pembelian/penjualan di picker hapus"""
+    return f"{row['Tanggal']} - {row['Produk']} - {format_qty(row['Kuantitas'], row['Satuan'])} - {format_rupiah(row['Total'])}"
+
+def history_delete_payload(row):
+    """Data baris riwayat dalam bentuk yang dipakai delete_purchase/sales_transaction"""
+    return {
+        'row_index': int(row['row']),
+        'date': row['Tanggal'],
+        'product_name': row['Produk'],
+        'quantity': row['Kuantitas'],
+        'price': row['Harga/Unit'],
+        'total': row['Total'],
+        'unit': row['Satuan'],
+    }
+
+@st.cache_resource(max_entries=TENANT_CACHE_ENTRIES, show_spinner=False)
+def _journal_query_index(journal_mtime, path):
+    journal = _read_sheets(path, ['Jurnal Umum'], [5])['Jurnal Umum']
+    journal = journal[journal[[0, 1, 2, 3]].notna().any(axis=1)]
+    # Baris bertanggal membuka transaksi baru; ID transaksi = nomor baris pertamanya
+    starts = journal[0].notna() & (journal[0].astype(str).str.strip() != '')
+    df = pd.DataFrame({
+        'ID': journal['row'].where(starts).ffill().fillna(journal['row']).astype('int64'),
+        'Tanggal': journal[0].where(starts).ffill().fillna('').astype(str).str[:10],
+        'Akun': journal[1].fillna('').astype(str),
+        'Debit': parse_rupiah_column(journal[2]).where(journal[2].notna() & (parse_rupiah_column(journal[2]) != 0)),
+        'Kredit': parse_rupiah_column(journal[3]).where(journal[3].notna() & (parse_rupiah_column(journal[3]) != 0)),
+        'Keterangan': journal[4].where(starts).ffill().fillna('').astype(str),
+        'row': journal['row'],
+    })
+    index = _build_query_index(df, 'Tanggal', ['Akun'])
+    index['total_debit_sen'] = int(to_sen_column(journal[2]).sum())
+    
+    # Satu baris per transaksi (urut posisi di jurnal) untuk picker hapus
+    by_txn = df.groupby('ID', sort=True)
+    groups = pd.DataFrame({
+        'tanggal': by_txn['Tanggal'].first(),
+        'keterangan': by_txn['Keterangan'].first().replace('', 'Transaksi tanpa keterangan'),
+        'jumlah_akun': by_txn.size(),
+        'total': by_txn['Debit'].sum(),
+    }).reset_index()
+    index['groups'] = groups
+    index['group_search'] = _build_search_index(
+        groups['tanggal'] + ' ' + groups['keterangan'] + ' ' + _amount_tokens(groups['total']))
+    index['total_kredit_sen'] = int(to_sen_column(journal[3]).sum())
+    return index
+
+@st.cache_data(max_entries=TENANT_CACHE_ENTRIES, show_spinner=False)
+def _journal_csv_cached(journal_mtime, path):
+    entries = _journal_query_index(journal_mtime, path)['df'].sort_values('row')
+    return entries[['Tanggal', 'Akun', 'Debit', 'Kredit', 'Keterangan']].to_csv(index=False).encode('utf-8')
+
+def journal_csv_export(path=None):
+    """CSV seluruh Jurnal Umum untuk tombol export"""
+    path = path or journal_file()
+    create_journal_workbook()
+    return _journal_csv_cached(os.path.getmtime(path), path)
+
+def load_journal_index(path=None):
+    """Indeks query Jurnal Umum, dibangun ulang hanya jika file berubah"""
+    path = path or journal_file()
+    create_journal_workbook()
+    return _journal_query_index(os.path.getmtime(path), path)
+
+@st.cache_resource(max_entries=TENANT_CACHE_ENTRIES, show_spinner=False)
+def _ledger_query_index(journal_mtime, path):
+    ledger = _read_sheets(path, ['Buku Besar'], [6])['Buku Besar']
+    ledger = ledger[ledger[0].notna() & (ledger[0].astype(str) != '')]
+    df = pd.DataFrame({
+        'Akun': ledger[0].astype(str),
+        'Tanggal': ledger[1].fillna('').astype(str).str[:10],
+        'Keterangan': ledger[2].fillna('').astype(str),
+        'Debit': parse_rupiah_column(ledger[3]).where(parse_rupiah_column(ledger[3]) != 0),
+        'Kredit': parse_rupiah_column(ledger[4]).where(parse_rupiah_column(ledger[4]) != 0),
+        'Saldo': parse_rupiah_column(ledger[5]),
+        'row': ledger['row'],
+    })
+    # Akun kredit (Liability, Equity, Revenue) ditampilkan dengan saldo positif
+    credit_normal = df['Akun'].str.split(' - ').str[0].str.startswith(('2', '3', '4'))
+    df['Saldo'] = df['Saldo'].where(~credit_normal, df['Saldo'].abs())
+    return _build_query_index(df, 'Tanggal', ['Akun'])
+
+def load_ledger_index(path=None):
+    """Indeks query Buku Besar, dibangun ulang hanya jika file berubah"""
+    path = path or journal_file()
+    create_journal_workbook()
+    return _ledger_query_index(os.path.getmtime(path), path)
+
+@st.cache_resource(max_entries=TENANT_CACHE_ENTRIES, show_spinner=False)
+def _history_query_index(db_mtime, path):
+    db = _read_sheets(path, ['Purchases', 'Sales'], [9, 9])
+    frames = []
+    for name, trans_type in (('Purchases', 'Pembelian'), ('Sales', 'Penjualan')):
+        sheet = db[name].dropna(subset=[0])
+        frames.append(pd.DataFrame({
+            'Tanggal': sheet[0].astype(str).str[:10],
+            'Tipe': trans_type,
+            'Produk': sheet[1].fillna('').astype(str),
+            'Lokasi': sheet[7].fillna(DEFAULT_LOCATION).astype(str),
+            'Kuantitas': parse_qty_column(sheet[2]),
+            'Satuan': sheet[8].fillna(DEFAULT_UNIT).astype(str),
+            'Harga/Unit': parse_rupiah_column(sheet[3]),
+            'Total': parse_rupiah_column(sheet[4]),
+            'Waktu': sheet[5].fillna('').astype(str).str.split(' ').str[1].fillna(''),
+            'row': sheet['row'],
+        }))
+    df = pd.concat(frames, ignore_index=True)
+    index = _build_query_index(df, 'Tanggal', ['Tipe', 'Produk'])
+    rows = index['df']
+    index['search'] = _build_search_index(
+        rows['Tanggal'] + ' ' + rows['Produk'] + ' ' + rows['Lokasi'] + ' ' + rows['Kuantitas'].astype(str)
+        + ' ' + _amount_tokens(rows['Total']))
+    index['totals_by_type'] = df.groupby('Tipe')['Total'].sum().to_dict()
+    return index
+
+def load_history_index(path=None):
+    """Indeks query riwayat pembelian + penjualan, dibangun ulang hanya jika file berubah"""
+    path = path or data_file()
+    return _history_query_index(os.path.getmtime(path), path)
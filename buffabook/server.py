@@ -0,0 +1,238 @@
+"""Layanan HTTP JSON lokal untuk posting dari aplikasi lain (timbangan, meja penjualan).
+
+POST /api/posting   satu objek atau list objek:
+    {"jenis": "pembelian", "produk": ..., "jumlah": 2, "harga": 9000000,
+     "satuan": "ekor", "metode": "Tunai", "lokasi": "Kandang Utama", "tanggal": "2025-12-10"}
+    {"jenis": "penjualan", ...field sama dengan pembelian...}
+    {"jenis": "jurnal", "tanggal": ..., "keterangan": ..., "baris": [{"akun": ..., "debit": 0, "kredit": 0}]}
+jumlah, harga, debit dan kredit harus angka JSON (bukan teks); jumlah bilangan bulat.
+Respons berisi txn_id = ID Transaksi di Jurnal Umum, tetap sama walau transaksi lain dihapus.
+GET  /api/status    antrian per farm
+
+Farm dipilih dengan ?farm=<id tenant> atau header X-Farm (kosong = data bersama).
+Permintaan dari semua klien digabung (group commit): selama satu grup ditulis, permintaan baru
+menunggu di antrian lalu ditulis bersama dengan satu kali simpan file Excel per farm.
+"""
+import hmac
+import json
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import tornado.concurrent
+import tornado.ioloop
+import tornado.queues
+import tornado.web
+
+from buffabook.api import (
+    AccountingError, JournalLine, JournalPosting, PostedEntry, PurchaseOrder, PurchaseResult, SaleBatchResult,
+    SaleOrder, ValidationError, post_group
+)
+from buffabook.storage import DEFAULT_LOCATION
+from buffabook.tenant import LEGACY_TENANT, list_tenants, use_tenant
+from buffabook.values import DEFAULT_UNIT
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8600
+MAX_REQUEST_OPERATIONS = 1000   # operasi per permintaan HTTP
+MAX_GROUP_OPERATIONS = 5000     # operasi per group commit
+
+logger = logging.getLogger('buffabook.server')
+
+
+# ========== JSON <-> API ==========
+def _amount(item, field, default=None):
+    """Nominal harus angka JSON yang finite dan >= 0; teks seperti "abc" atau "Rp 1.000" ditolak,
+    bukan diparse menjadi 0 seperti input form"""
+    value = item.get(field)
+    if value is None:
+        value = default
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+        raise ValidationError(f"Field {field} harus angka >= 0")
+    return value
+
+def _quantity(item, field):
+    """Jumlah ekor harus bilangan bulat (2 atau 2.0, bukan 2.9 atau "2")"""
+    value = _amount(item, field)
+    if value != int(value):
+        raise ValidationError(f"Field {field} harus bilangan bulat")
+    return int(value)
+
+def _text(item, field, default=''):
+    value = item.get(field)
+    if value is None:
+        return default
+    if not isinstance(value, str):
+        raise ValidationError(f"Field {field} harus berupa teks")
+    return value or default
+
+def parse_operation(item):
+    """Objek JSON -> PurchaseOrder / SaleOrder / JournalPosting (ValidationError jika tidak valid)"""
+    if not isinstance(item, dict):
+        raise ValidationError("Setiap posting harus berupa objek JSON")
+    jenis = item.get('jenis')
+    if jenis in ('pembelian', 'penjualan'):
+        if 'jumlah' not in item or 'harga' not in item:
+            raise ValidationError("Field jumlah dan harga wajib diisi")
+        fields = dict(
+            product_name=_text(item, 'produk'),
+            quantity=_quantity(item, 'jumlah'),
+            price=_amount(item, 'harga'),
+            unit=_text(item, 'satuan', DEFAULT_UNIT),
+            payment_method=_text(item, 'metode', "Tunai"),
+            location=_text(item, 'lokasi', DEFAULT_LOCATION),
+            date=_text(item, 'tanggal', None),
+        )
+        return PurchaseOrder(**fields) if jenis == 'pembelian' else SaleOrder(**fields)
+    if jenis == 'jurnal':
+        baris = item.get('baris')
+        if not isinstance(baris, list) or not all(isinstance(line, dict) for line in baris):
+            raise ValidationError("Field baris harus berupa list {akun, debit, kredit}")
+        lines = tuple(JournalLine(_text(line, 'akun'), _amount(line, 'debit', 0), _amount(line, 'kredit', 0))
+                      for line in baris)
+        return JournalPosting(_text(item, 'tanggal', None), _text(item, 'keterangan'), lines)
+    raise ValidationError("Field jenis harus salah satu dari pembelian, penjualan, jurnal")
+
+def _entry_json(entry):
+    return {'txn_id': entry.txn_id, 'tanggal': entry.date, 'keterangan': entry.keterangan}
+
+def result_json(result):
+    """Hasil post_group -> objek JSON respons"""
+    if isinstance(result, AccountingError):
+        return {'ok': False, 'error': str(result)}
+    if isinstance(result, PurchaseResult):
+        return {'ok': True, 'jenis': 'pembelian', **_entry_json(result.entry),
+                'total': result.total, 'harga_rata_rata': result.average_price}
+    if isinstance(result, SaleBatchResult):
+        return {'ok': True, 'jenis': 'penjualan', **_entry_json(result.entries[0]),
+                'total': result.total_sales, 'hpp': result.total_hpp}
+    if isinstance(result, PostedEntry):
+        return {'ok': True, 'jenis': 'jurnal', **_entry_json(result)}
+    raise TypeError(f"Hasil tidak dikenal: {type(result).__name__}")
+
+
+# ========== GROUP COMMIT ==========
+class GroupCommitter:
+    """Antrian posting satu farm. Satu penulis per farm: grup berikutnya berisi semua permintaan
+    yang masuk selama grup sebelumnya ditulis, sehingga ukuran grup naik mengikuti beban."""
+
+    def __init__(self, tenant):
+        self.tenant = tenant
+        self.queue = tornado.queues.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"buffabook-post-{tenant or 'default'}")
+        self.committed = 0
+        tornado.ioloop.IOLoop.current().spawn_callback(self._run)
+
+    def submit(self, operations):
+        """Masukkan operasi ke antrian; Future berisi list hasil post_group untuk operasi ini"""
+        future = tornado.concurrent.Future()
+        self.queue.put_nowait((operations, future))
+        return future
+
+    def _commit(self, operations):
+        with use_tenant(self.tenant):
+            return post_group(operations)
+
+    async def _run(self):
+        loop = tornado.ioloop.IOLoop.current()
+        while True:
+            group = [await self.queue.get()]
+            size = len(group[0][0])
+            while size < MAX_GROUP_OPERATIONS and self.queue.qsize():
+                group.append(self.queue.get_nowait())
+                size += len(group[-1][0])
+
+            operations = [op for ops, _ in group for op in ops]
+            try:
+                results = await loop.run_in_executor(self.executor, self._commit, operations)
+            except Exception as e:
+                # File tidak bisa dibuka/disimpan: seluruh grup gagal
+                logger.exception("Group commit %s gagal", self.tenant or 'data bersama')
+                for _, future in group:
+                    future.set_exception(e)
+                continue
+            self.committed += len(operations)
+            start = 0
+            for ops, future in group:
+                future.set_result(results[start:start + len(ops)])
+                start += len(ops)
+
+
+# ========== HTTP ==========
+class BaseHandler(tornado.web.RequestHandler):
+    def prepare(self):
+        token = self.settings.get('api_token')
+        if token:
+            supplied = self.request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+            if not hmac.compare_digest(supplied.encode(), token.encode()):
+                raise tornado.web.HTTPError(401, "Token tidak valid")
+
+    def write_error(self, status_code, **kwargs):
+        """Error juga dalam JSON; pesan dari HTTPError(status, pesan), bukan dari baris status HTTP"""
+        error = kwargs.get('exc_info', (None, None))[1]
+        if isinstance(error, tornado.web.HTTPError) and error.log_message:
+            message = error.log_message % error.args
+        else:
+            message = self._reason
+        self.finish({'ok': False, 'error': message})
+
+class PostingHandler(BaseHandler):
+    def committer(self):
+        tenant = self.get_argument('farm', None) or self.request.headers.get('X-Farm') or LEGACY_TENANT
+        committers = self.settings['committers']
+        if tenant not in committers:
+            if tenant not in list_tenants():
+                raise tornado.web.HTTPError(404, "Farm tidak ditemukan: %s", tenant)
+            committers[tenant] = GroupCommitter(tenant)
+        return committers[tenant]
+
+    async def post(self):
+        committer = self.committer()
+        try:
+            payload = json.loads(self.request.body)
+        except ValueError:
+            raise tornado.web.HTTPError(400, "Body bukan JSON yang valid")
+        single = not isinstance(payload, list)
+        items = [payload] if single else payload
+        if not items:
+            raise tornado.web.HTTPError(400, "Daftar posting kosong")
+        if len(items) > MAX_REQUEST_OPERATIONS:
+            raise tornado.web.HTTPError(413, "Maksimal %d posting per permintaan", MAX_REQUEST_OPERATIONS)
+
+        # Item yang tidak bisa diparse langsung ditolak; sisanya masuk antrian farm
+        results = []
+        operations = []
+        for item in items:
+            try:
+                operations.append(parse_operation(item))
+                results.append(None)
+            except ValidationError as e:
+                results.append(e)
+        if operations:
+            posted = iter(await committer.submit(operations))
+            results = [next(posted) if result is None else result for result in results]
+
+        body = [result_json(result) for result in results]
+        if single:
+            self.set_status(201 if body[0]['ok'] else 422)
+            self.finish(body[0])
+        else:
+            self.finish({'ok': all(item['ok'] for item in body), 'hasil': body})
+
+class StatusHandler(BaseHandler):
+    def get(self):
+        self.finish({'ok': True, 'farm': {
+            tenant or 'data bersama': {'antrian': committer.queue.qsize(), 'terposting': committer.committed}
+            for tenant, committer in self.settings['committers'].items()
+        }})
+
+def make_app(api_token=None):
+    return tornado.web.Application([
+        (r'/api/posting', PostingHandler),
+        (r'/api/status', StatusHandler),
+    ], api_token=api_token, committers={})
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, api_token=None):
+    """Jalankan layanan sampai dihentikan (Ctrl+C)"""
+    make_app(api_token).listen(port, address=host)
+    tornado.ioloop.IOLoop.current().start()
@@ -0,0 +1,225 @@
+"""Skema workbook databasesia.xlsx / journal_ledger.xlsx, migrasi dan pembacaan sheet"""
+import streamlit as st
+import openpyxl
+import pandas as pd
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, date as date_type
+
+from buffabook.tenant import data_file, tenant_dir, write_lock
+from buffabook.values import DEFAULT_UNIT, safe_parse_int_from_qtytext, to_rupiah
+
+
+INVENTORY_SHEET_HEADER = ['Product Name', 'Product Quantity', 'Product Price', 'Total Price', 'Unit']
+SALES_SHEET_HEADER = ['Date', 'Product Name', 'Product Quantity', 'Product Price', 'Total Sales', 'Timestamp', 'Payment Method', 'Location', 'Unit']
+PURCHASE_SHEET_HEADER = ['Date', 'Product Name', 'Product Quantity', 'Product Price', 'Total Price', 'Timestamp', 'Payment Method', 'Location', 'Unit']
+ANIMAL_SHEET_HEADER = ['Ear Tag', 'Class', 'Sex', 'Birth Date', 'Purchase Date', 'Cost', 'Status', 'Status Date']
+TRANSFER_SHEET_HEADER = ['Date', 'Product Name', 'From Location', 'To Location', 'Product Quantity', 'Timestamp', 'Unit']
+ADJUSTMENT_SHEET_HEADER = ['Date', 'Product Name', 'Location', 'Product Quantity', 'Unit Cost', 'Total Cost', 'Timestamp', 'Unit']
+RECLASS_SHEET_HEADER = ['Date', 'From Product', 'To Product', 'Product Quantity', 'Total Cost', 'Timestamp', 'Ear Tags', 'Location', 'Unit']
+
+# Posisi kolom per sheet: judul, jumlah, satuan, nominal, tanggal, timestamp
+TYPED_SCHEMA = {
+    'Inventory': {'header': INVENTORY_SHEET_HEADER, 'qty': 1, 'unit': 4, 'amounts': [2, 3], 'dates': [], 'timestamps': []},
+    'Purchases': {'header': PURCHASE_SHEET_HEADER, 'qty': 2, 'unit': 8, 'amounts': [3, 4], 'dates': [0], 'timestamps': [5]},
+    'Sales': {'header': SALES_SHEET_HEADER, 'qty': 2, 'unit': 8, 'amounts': [3, 4], 'dates': [0], 'timestamps': [5]},
+    'Transfers': {'header': TRANSFER_SHEET_HEADER, 'qty': 4, 'unit': 6, 'amounts': [], 'dates': [0], 'timestamps': [5]},
+    'Adjustments': {'header': ADJUSTMENT_SHEET_HEADER, 'qty': 3, 'unit': 7, 'amounts': [4, 5], 'dates': [0], 'timestamps': [6]},
+    'Reclassifications': {'header': RECLASS_SHEET_HEADER, 'qty': 3, 'unit': 8, 'amounts': [4], 'dates': [0], 'timestamps': [5]},
+    'Animals': {'header': ANIMAL_SHEET_HEADER, 'qty': None, 'unit': None, 'amounts': [5], 'dates': [3, 4, 7], 'timestamps': []},
+}
+
+def _row_unit(row, index):
+    """Satuan pada kolom index; baris tanpa satuan dianggap ekor"""
+    if len(row) > index and row[index]:
+        return str(row[index]).strip()
+    return DEFAULT_UNIT
+
+def _iso_date(value, with_time=False):
+    """Normalisasi tanggal (datetime atau teks) ke teks ISO"""
+    if isinstance(value, (datetime, date_type)):
+        if with_time and isinstance(value, datetime):
+            return value.strftime('%Y-%m-%d %H:%M:%S')
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, str) and value.strip():
+        text = value.strip()
+        for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y'):
+            try:
+                parsed = datetime.strptime(text, fmt)
+                return parsed.strftime('%Y-%m-%d %H:%M:%S' if with_time else '%Y-%m-%d')
+            except ValueError:
+                continue
+        return text
+    return value
+
+# Percobaan os.replace saat file tujuan terkunci pembaca (Windows), jeda 0,1 detik
+REPLACE_RETRIES = 50
+
+def _replace_atomically(path, write):
+    handle, temp_path = tempfile.mkstemp(prefix='.tmp-', suffix='.xlsx', dir=os.path.dirname(path) or '.')
+    os.close(handle)
+    try:
+        write(temp_path)
+        for attempt in range(REPLACE_RETRIES):
+            try:
+                os.replace(temp_path, path)
+                return
+            except PermissionError:
+                # Windows: file tujuan sedang dibuka pembaca; tunggu sebentar
+                if attempt == REPLACE_RETRIES - 1:
+                    raise
+                time.sleep(0.1)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def save_workbook(wb, path):
+    """Simpan ke file sementara di direktori yang sama lalu os.replace: pembaca (proses lain,
+    cache yang dibangun ulang) selalu melihat file lama atau file baru yang utuh, tidak pernah zip setengah tertulis"""
+    _replace_atomically(path, wb.save)
+
+@contextmanager
+def rollback_on_error(path):
+    """Jika blok gagal setelah file disimpan (mis. databasesia.xlsx tersimpan tapi jurnal gagal ditulis),
+    kembalikan file ke isi sebelum blok agar klien bisa mengulang tanpa stok tercatat dua kali"""
+    previous_mtime = os.path.getmtime(path)
+    with open(path, 'rb') as f:
+        previous = f.read()
+    try:
+        yield
+    except BaseException:
+        if os.path.getmtime(path) != previous_mtime:
+            def write(temp_path):
+                with open(temp_path, 'wb') as f:
+                    f.write(previous)
+            _replace_atomically(path, write)
+        raise
+
+def _migrate_sheet(ws, spec):
+    """Ubah satu sheet ke skema bertipe. Return True jika ada perubahan"""
+    if spec['unit'] is not None and ws.cell(row=1, column=spec['unit'] + 1).value == 'Unit':
+        return False
+    for row in ws.iter_rows(min_row=2):
+        if not row or row[0].value is None:
+            continue
+        values = [cell.value for cell in row]
+        if spec['qty'] is not None:
+            qty_value = values[spec['qty']] if len(values) > spec['qty'] else None
+            parts = str(qty_value).split() if isinstance(qty_value, str) else []
+            ws.cell(row=row[0].row, column=spec['qty'] + 1, value=safe_parse_int_from_qtytext(qty_value))
+            ws.cell(row=row[0].row, column=spec['unit'] + 1, value=parts[1] if len(parts) > 1 else DEFAULT_UNIT)
+        for col in spec['amounts']:
+            if len(values) > col and values[col] is not None:
+                ws.cell(row=row[0].row, column=col + 1, value=to_rupiah(values[col]))
+        for col in spec['dates']:
+            if len(values) > col and values[col] is not None:
+                ws.cell(row=row[0].row, column=col + 1, value=_iso_date(values[col]))
+        for col in spec['timestamps']:
+            if len(values) > col and values[col] is not None:
+                ws.cell(row=row[0].row, column=col + 1, value=_iso_date(values[col], with_time=True))
+    # Lengkapi judul kolom yang belum ada (termasuk 'Unit')
+    for col, title in enumerate(spec['header'], 1):
+        if ws.cell(row=1, column=col).value is None:
+            ws.cell(row=1, column=col, value=title)
+    return True
+
+@st.cache_resource
+def migrate_typed_schema(path):
+    """Migrasi satu kali: '10 ekor' -> 10 + Unit, 'Rp 1.000' -> 1000, tanggal -> ISO.
+    Sheet yang sudah punya kolom Unit dilewati, jadi aman dijalankan berulang.
+    Dicek di dalam kunci tulis: proses lain bisa saja sedang memigrasi file yang sama."""
+    with write_lock():
+        wb = openpyxl.load_workbook(path, read_only=True)
+        pending = [name for name, spec in TYPED_SCHEMA.items()
+                   if name in wb.sheetnames and spec['unit'] is not None
+                   and 'Unit' not in next(wb[name].iter_rows(max_row=1, values_only=True), ())]
+        wb.close()
+        if not pending:
+            return False
+        
+        wb = openpyxl.load_workbook(path)
+        for name in pending:
+            _migrate_sheet(wb[name], TYPED_SCHEMA[name])
+        if 'Animals' in wb.sheetnames:
+            _migrate_sheet(wb['Animals'], TYPED_SCHEMA['Animals'])
+        save_workbook(wb, path)
+        wb.close()
+    return True
+
+def create_workbook_if_not_exists():
+    if os.path.exists(data_file()):
+        return
+    with write_lock():
+        if not os.path.exists(data_file()):
+            tenant_dir(create=True)
+            wb = openpyxl.Workbook()
+            ws_inventory = wb.active
+            ws_inventory.title = "Inventory"
+            ws_inventory.append(INVENTORY_SHEET_HEADER)
+            ws_sales = wb.create_sheet("Sales")
+            ws_sales.append(SALES_SHEET_HEADER)
+            ws_purchases = wb.create_sheet("Purchases")
+            ws_purchases.append(PURCHASE_SHEET_HEADER)
+            ws_animals = wb.create_sheet("Animals")
+            ws_animals.append(ANIMAL_SHEET_HEADER)
+            save_workbook(wb, data_file())
+
+# ========== REGISTRI TERNAK PER EKOR (EAR TAG) ==========
+AGE_CLASSES = ["Anak", "Remaja", "Dewasa"]
+ANIMAL_SEXES = ["Jantan", "Betina"]
+ANIMAL_STATUSES = ["Aktif", "Terjual", "Mati"]
+
+def animal_product_name(age_class, sex):
+    """Nama produk Inventory untuk kelas umur dan jenis kelamin ternak"""
+    if age_class == "Anak":
+        return f"Anak Kerbau {sex}"
+    return f"Kerbau {age_class} {sex}"
+
+# ========== STOK PER LOKASI (KANDANG) ==========
+DEFAULT_LOCATION = "Kandang Utama"
+
+def _row_location(row, index):
+    """Lokasi pada kolom index; baris lama tanpa lokasi dianggap di kandang utama"""
+    if len(row) > index and row[index]:
+        return str(row[index]).strip()
+    return DEFAULT_LOCATION
+
+# ========== REKONSILIASI SUBLEDGER VS BUKU BESAR ==========
+def _read_sheets(path, sheet_names, widths):
+    """Baca beberapa sheet dari satu file sekaligus, kolom posisi 0..n, nomor baris Excel di 'row'.
+    Sheet yang belum ada dikembalikan sebagai DataFrame kosong."""
+    result = {}
+    with pd.ExcelFile(path) as xls:
+        for name, width in zip(sheet_names, widths):
+            if name in xls.sheet_names:
+                df = xls.parse(name, header=None, skiprows=1)
+            else:
+                df = pd.DataFrame()
+            df = df.reindex(columns=range(width))
+            df['row'] = df.index + 2
+            result[name] = df
+    return result
+
+def new_data_context():
+    """Konteks data per render: setiap sheet dibaca paling banyak sekali lalu dipakai bersama"""
+    return {'workbooks': {}, 'rows': {}}
+
+def context_rows(ctx, sheet_name, path=None):
+    """Baris data (tanpa judul) satu sheet; sheet yang belum ada dianggap kosong"""
+    path = path or data_file()
+    key = (path, sheet_name)
+    if key not in ctx['rows']:
+        if path not in ctx['workbooks']:
+            ctx['workbooks'][path] = openpyxl.load_workbook(path, read_only=True)
+        wb = ctx['workbooks'][path]
+        ctx['rows'][key] = (list(wb[sheet_name].iter_rows(min_row=2, values_only=True))
+                            if sheet_name in wb.sheetnames else [])
+    return ctx['rows'][key]
+
+def close_data_context(ctx):
+    """Tutup workbook yang dibuka selama render"""
+    for wb in ctx['workbooks'].values():
+        wb.close()
+    ctx['workbooks'].clear()
@@ -0,0 +1,141 @@
+"""Data per peternakan (tenant): setiap farm punya direktori sendiri berisi file Excel dan indeks pencarian"""
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+import hashlib
+import os
+import re
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+DATA_ROOT = 'data'
+DATA_FILE = 'databasesia.xlsx'
+JOURNAL_FILE = 'journal_ledger.xlsx'
+SEARCH_FILE = 'journal_search.db'
+# Kunci antar proses (aplikasi, python -m buffabook serve/import) di direktori data tenant
+LOCK_FILE = '.lock'
+# Akun lama (sebelum ada tenant) tetap memakai file bersama di direktori aplikasi
+LEGACY_TENANT = ''
+# ID tenant dari tenant_for_email: aman sebagai satu nama direktori di bawah data/
+TENANT_PATTERN = re.compile(r'[a-z0-9_]+')
+
+_override = threading.local()
+
+
+def tenant_for_email(email):
+    """ID tenant untuk akun baru: slug email + hash pendek (aman sebagai nama direktori)"""
+    email = email.strip().lower()
+    slug = re.sub(r'[^a-z0-9]+', '_', email.split('@')[0]).strip('_')[:24] or 'farm'
+    return f"{slug}_{hashlib.sha1(email.encode()).hexdigest()[:8]}"
+
+@contextmanager
+def use_tenant(tenant):
+    """Tetapkan tenant untuk thread ini (thread latar belakang tidak punya session_state)"""
+    previous = getattr(_override, 'tenant', None)
+    _override.tenant = tenant
+    try:
+        yield
+    finally:
+        _override.tenant = previous
+
+def current_tenant():
+    """Tenant aktif: override thread, atau tenant pengguna yang login di sesi ini"""
+    tenant = getattr(_override, 'tenant', None)
+    if tenant is not None:
+        return tenant
+    if get_script_run_ctx(suppress_warning=True) is None:
+        # Dipanggil di luar Streamlit (skrip/batch) tanpa use_tenant
+        return LEGACY_TENANT
+    return st.session_state.get('tenant') or LEGACY_TENANT
+
+def tenant_dir(tenant=None, create=False):
+    """Direktori data tenant; create=True hanya dari jalur yang menulis file baru"""
+    tenant = current_tenant() if tenant is None else tenant
+    if tenant == LEGACY_TENANT:
+        return '.'
+    if not TENANT_PATTERN.fullmatch(tenant):
+        raise ValueError(f"ID tenant tidak valid: {tenant!r}")
+    path = os.path.join(DATA_ROOT, tenant)
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return path
+
+def data_file(tenant=None):
+    """databasesia.xlsx milik tenant"""
+    return os.path.join(tenant_dir(tenant), DATA_FILE)
+
+def journal_file(tenant=None):
+    """journal_ledger.xlsx milik tenant"""
+    return os.path.join(tenant_dir(tenant), JOURNAL_FILE)
+
+def search_db_file(tenant=None):
+    """Indeks pencarian jurnal (SQLite FTS5) milik tenant"""
+    return os.path.join(tenant_dir(tenant), SEARCH_FILE)
+
+def list_tenants():
+    """Semua tenant yang sudah punya jurnal: data bersama di direktori aplikasi, lalu data/<tenant>/"""
+    tenants = [LEGACY_TENANT] if os.path.exists(JOURNAL_FILE) else []
+    if os.path.isdir(DATA_ROOT):
+        tenants += sorted(name for name in os.listdir(DATA_ROOT)
+                          if os.path.exists(os.path.join(DATA_ROOT, name, JOURNAL_FILE)))
+    return tenants
+
+def _lock_file(handle):
+    """Kunci eksklusif file (menunggu sampai proses lain melepas)"""
+    if fcntl:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        return
+    handle.seek(0)
+    while True:
+        try:
+            # LK_LOCK menyerah setelah ~10 detik; terus coba sampai penulis lain selesai
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+def _unlock_file(handle):
+    if fcntl:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    else:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+@st.cache_resource
+def _write_locks():
+    """Kunci tulis per tenant, dibagi semua sesi dan thread dalam proses ini"""
+    return {'lock': threading.Lock(), 'tenants': {}}
+
+@contextmanager
+def write_lock(tenant=None):
+    """Pegang selama load -> ubah -> save file Excel tenant agar penulis tidak saling menimpa.
+    Di dalam proses: RLock per tenant (reentrant, fungsi posting boleh saling memanggil).
+    Antar proses: file .lock di direktori tenant, dikunci saat kedalaman kunci thread 0 -> 1."""
+    tenant = current_tenant() if tenant is None else tenant
+    locks = _write_locks()
+    with locks['lock']:
+        state = locks['tenants'].setdefault(tenant, {'lock': threading.RLock(), 'depth': 0, 'file': None})
+    with state['lock']:
+        if state['depth'] == 0:
+            handle = open(os.path.join(tenant_dir(tenant, create=True), LOCK_FILE), 'a+b')
+            try:
+                _lock_file(handle)
+            except BaseException:
+                handle.close()
+                raise
+            state['file'] = handle
+        state['depth'] += 1
+        try:
+            yield
+        finally:
+            state['depth'] -= 1
+            if state['depth'] == 0:
+                handle, state['file'] = state['file'], None
+                _unlock_file(handle)
+                handle.close()
@@ -0,0 +1,84 @@
+"""Tema tampilan aplikasi (CSS)"""
+import streamlit as st
+
+
+def apply_theme():
+    """Suntikkan CSS aplikasi utama"""
+    st.markdown("""      
+    <style>
+        .main, .block-container {
+            background-color: #FDF3B9 ; 
+        }
+        [data-testid="stSidebar"] {
+            background-color: #80644B; 
+            padding-top: 0px;
+        }
+        [data-testid="stSidebar"] .stButton>button {
+            background-color: #C8A574;
+            color: white;
+            border-radius: 8px;
+            width: 100% ;
+            text-align: left ;
+            padding: 12px 16px ;
+            margin: 4px 0 ;
+        }
+
+        /* Optional: tambahkan hover effect */
+        [data-testid="stSidebar"] .stButton>button:hover {
+            background-color: #B8945F;
+            border-color: #A5834F;
+        }
+        [data-testid="stSidebar"] [data-testid="stPageLink"] a {
+            background-color: #C8A574;
+            border-radius: 8px;
+            padding: 12px 16px;
+            margin: 4px 0;
+        }
+        [data-testid="stSidebar"] [data-testid="stPageLink"] a:hover {
+            background-color: #B8945F;
+        }
+        [data-testid="stSidebar"] [data-testid="stPageLink"] a span {
+            color: white;
+        }
+        .sidebar-title {
+            color: #ffffff;      
+            font-weight: 700;    
+            font-size: 36px;     
+        }
+        .main-header {
+            background: linear-gradient(135deg, #80644B 0%, #8B6F47 100%);
+            padding: 1.5rem;
+            border-radius: 10px;
+            margin-bottom: 2rem;
+            color: white;
+        }
+        .card {
+            background: white;
+            padding: 1.5rem;
+            border-radius: 10px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            margin-bottom: 1rem;
+        }
+        .metric-card {
+            background: linear-gradient(135deg, #DDB27A 0%, #C8A574 100%);
+            padding: 1rem;
+            border-radius: 8px;
+            text-align: center;
+            color: white;
+        }
+        .stButton>button {
+            width: 100%;
+            background-color: #8B6F47;
+            color: white;
+            border-radius: 8px;
+            padding: 0.5rem 1rem;
+            border: none;
+        }
+        .stButton>button:hover {
+            background-color: #5A4634;
+        }
+        div[data-testid="stSidebar"] {
+            background-color: #DDB27A;
+        }     
+    </style>
+    """, unsafe_allow_html=True)
@@ -0,0 +1,98 @@
+"""Format dan parsing nominal Rupiah, sen dan kuantitas"""
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+
+# Helper Functions
+def format_rupiah(amount):
+    """Format angka ke format rupiah"""
+    try:
+        return f"Rp {float(amount):,.0f}".replace(',', '.')
+    except:
+        return "Rp 0"
+
+def safe_parse_int_from_qtytext(qty_text):
+    """Parse jumlah dari angka atau teks lama seperti '10 kg'"""
+    if qty_text is None:
+        return 0
+    try:
+        if isinstance(qty_text, (int, float)):
+            return int(qty_text)
+        parts = str(qty_text).split()
+        return int(float(parts[0])) if parts else 0
+    except:
+        return 0
+
+def safe_parse_price(price_value):
+    """Parse nominal dari angka atau teks lama seperti 'Rp 1.000,50'"""
+    if price_value is None:
+        return 0.0
+    try:
+        if isinstance(price_value, (int, float)):
+            return float(price_value)
+        price_str = str(price_value).replace('Rp', '').replace(' ', '').replace('.', '').replace(',', '.')
+        return float(price_str) if price_str else 0.0
+    except:
+        return 0.0
+
+def to_rupiah(amount):
+    """Nominal dalam Rupiah bulat (disimpan sebagai integer)"""
+    return int(round(safe_parse_price(amount)))
+
+def to_sen(amount):
+    """Nominal Rupiah -> integer sen (1/100 Rupiah) agar penjumlahan uang eksak"""
+    return int(round(safe_parse_price(amount) * 100))
+
+def from_sen(sen):
+    """Integer sen -> nilai Rupiah untuk disimpan/ditampilkan (int jika bulat)"""
+    sen = int(sen)
+    return sen // 100 if sen % 100 == 0 else sen / 100
+
+def format_qty(quantity, unit=None):
+    """Tampilkan jumlah beserta satuannya, mis. '10 ekor'"""
+    return f"{safe_parse_int_from_qtytext(quantity)} {unit or DEFAULT_UNIT}"
+
+# Kernel kolom: parse/format satu kolom utuh sekaligus, bukan per sel dalam loop Python
+def parse_qty_column(series):
+    """Kolom kuantitas sebagai int64; teks lama seperti '10 ekor' tetap terbaca"""
+    series = pd.Series(series)
+    quantities = pd.to_numeric(series, errors='coerce')
+    text_mask = quantities.isna() & series.notna()
+    if text_mask.any():
+        numbers = series[text_mask].astype(str).str.extract(r'^\s*(-?\d+(?:\.\d+)?)')[0]
+        quantities[text_mask] = pd.to_numeric(numbers, errors='coerce')
+    return quantities.fillna(0).astype('int64')
+
+def parse_rupiah_column(series):
+    """Kolom nominal sebagai float64 dari angka atau teks 'Rp 1.000'"""
+    series = pd.Series(series)
+    amounts = pd.to_numeric(series, errors='coerce')
+    text_mask = amounts.isna() & series.notna()
+    if text_mask.any():
+        text = (series[text_mask].astype(str)
+                .str.replace('Rp', '', regex=False)
+                .str.replace(' ', '', regex=False)
+                .str.replace('.', '', regex=False)
+                .str.replace(',', '.', regex=False))
+        amounts[text_mask] = pd.to_numeric(text, errors='coerce')
+    return amounts.fillna(0.0).astype('float64')
+
+def to_sen_column(series):
+    """Kolom nominal -> array int64 sen; sum() atas array ini eksak tanpa toleransi"""
+    return np.rint(parse_rupiah_column(series).to_numpy() * 100).astype('int64')
+
+def format_rupiah_column(values):
+    """Teks 'Rp 1.000' untuk satu kolom sekaligus (ekspor/teks; tabel cukup pakai rupiah_columns)"""
+    amounts = np.rint(parse_rupiah_column(values).to_numpy()).astype('int64')
+    digits = pd.Series(np.abs(amounts).astype(str)).str.replace(r'(\d)(?=(\d{3})+$)', r'\1.', regex=True)
+    return 'Rp ' + pd.Series(np.where(amounts < 0, '-', '')) + digits
+
+def rupiah_columns(*names):
+    """column_config untuk kolom nominal: data tetap numerik, format Rupiah dilakukan oleh grid"""
+    return {name: st.column_config.NumberColumn(name, format="localized") for name in names}
+
+# ========== SKEMA DATABASE (KOLOM BERTIPE) ==========
+# Jumlah disimpan sebagai integer dengan satuan di kolom 'Unit' (kolom terakhir, agar posisi kolom lama tetap),
+# nominal sebagai integer Rupiah, tanggal sebagai teks ISO (YYYY-MM-DD / YYYY-MM-DD HH:MM:SS)
+DEFAULT_UNIT = "ekor"
@@ -0,0 +1 @@
+"""Halaman aplikasi; dipanggil dari script tipis di app_pages/"""
@@ -0,0 +1,58 @@
+"""Halaman Dashboard"""
+import streamlit as st
+
+from buffabook.tenant import data_file
+from buffabook.values import format_rupiah, parse_rupiah_column
+from buffabook.storage import _read_sheets
+
+
+def show_dashboard():
+    st.markdown('<div class="main-header"><h1>🐃 Welcome to BuffaBook</h1><p>Sistem Pencatatan Peternakan Kerbau</p></div>', unsafe_allow_html=True)
+    
+    st.markdown("""
+    <div class="card">
+    <h3>Tentang BuffaBook</h3>
+    <p>Selamat datang di BuffaBook – Sistem Pencatatan Peternakan Kerbau.</p>
+    <p>Di sini Anda dapat mengelola inventory, pembelian, dan penjualan produk.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Quick Stats
+    col1, col2, col3 = st.columns(3)
+    
+    try:
+        db = _read_sheets(data_file(), ['Inventory', 'Purchases', 'Sales'], [4, 6, 6])
+        
+        # Total Inventory Items
+        total_items = len(db['Inventory'])
+        
+        # Total Purchases & Sales (kolom nominal dijumlah sekaligus)
+        total_purchases = parse_rupiah_column(db['Purchases'][4]).sum()
+        total_sales = parse_rupiah_column(db['Sales'][4]).sum()
+        
+        with col1:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h2>{total_items}</h2>
+                <p>Item Persediaan</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h2>{format_rupiah(total_purchases)}</h2>
+                <p>Total Pembelian</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col3:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h2>{format_rupiah(total_sales)}</h2>
+                <p>Total Penjualan</p>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    except Exception as e:
+        st.error(f"Error loading stats: {e}")
@@ -0,0 +1,952 @@
+"""Halaman Kartu Persediaan dan Ringkasan Penjualan"""
+import streamlit as st
+import openpyxl
+import pandas as pd
+from datetime import datetime
+
+from buffabook.tenant import data_file
+from buffabook.values import (
+    DEFAULT_UNIT, format_rupiah, parse_qty_column, parse_rupiah_column, rupiah_columns,
+    safe_parse_int_from_qtytext, safe_parse_price
+)
+from buffabook.storage import (
+    AGE_CLASSES, ANIMAL_SEXES, DEFAULT_LOCATION, _read_sheets, _row_location, _row_unit,
+    animal_product_name, close_data_context, context_rows, new_data_context
+)
+from buffabook.api import (
+    PAYMENT_METHODS, AccountingError, SaleOrder, post_purchase, post_sale_batch, register_animal, update_animal_status
+)
+from buffabook.queries import history_delete_payload, load_history_index, transaction_label
+from buffabook.inventory import (
+    apply_uploaded_counts, build_stock_count_sheet, compute_stock_variances,
+    delete_purchase_transaction, delete_sales_transaction, find_due_reclassifications, get_reconciliation,
+    list_locations, load_location_index, post_reclassification, post_stock_opname, product_locations,
+    registry_class_totals, registry_search, release_reservations, reserve_stock, run_reconciliation_check,
+    transfer_stock
+)
+from buffabook.widgets import show_paged_grid, show_search_picker
+
+
+def show_animal_registry():
+    st.markdown("### 🐃 Registri Ternak per Ekor")
+    
+    with st.form("form_registri_ternak", clear_on_submit=True):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            tag = st.text_input("Ear Tag")
+            age_class = st.selectbox("Kelas Umur", AGE_CLASSES)
+        with col2:
+            sex = st.selectbox("Jenis Kelamin", ANIMAL_SEXES)
+            cost = st.number_input("Biaya Perolehan (Rp)", min_value=0, value=0)
+        with col3:
+            birth_date = st.date_input("Tanggal Lahir", datetime.now(), key="animal_birth_date")
+            purchase_date = st.date_input("Tanggal Pembelian", datetime.now(), key="animal_purchase_date")
+        # Setiap ekor terdaftar harus ada di stok Inventory
+        source = st.radio("Asal Ternak", ["Stok Inventory yang belum ber-ear tag", "Pembelian baru"],
+                          horizontal=True, key="animal_source")
+        col1, col2 = st.columns(2)
+        with col1:
+            payment_method = st.selectbox("Metode Pembayaran (pembelian baru)", PAYMENT_METHODS, key="animal_payment")
+        with col2:
+            location = st.selectbox("Kandang (pembelian baru)", list_locations(), key="animal_location")
+        
+        if st.form_submit_button("✅ Daftarkan Ternak", use_container_width=True):
+            try:
+                register_animal(tag, age_class, sex, birth_date, purchase_date, cost,
+                                record_purchase=source == "Pembelian baru",
+                                payment_method=payment_method, location=location)
+                st.success(f"✅ Ear tag {tag.strip()} berhasil didaftarkan")
+            except AccountingError as e:
+                st.error(f"❌ {e}")
+    
+    try:
+        totals = registry_class_totals()
+        st.markdown("#### Jumlah Ternak Aktif per Kelas")
+        if totals:
+            st.dataframe(pd.DataFrame([
+                {'Kelas': name, 'Jumlah (ekor)': data['count'], 'Total Biaya': data['cost']}
+                for name, data in sorted(totals.items())
+            ]), use_container_width=True, hide_index=True, column_config=rupiah_columns('Total Biaya'))
+        else:
+            st.info("📝 Belum ada ternak terdaftar")
+        
+        st.markdown("#### Cari Ternak")
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            prefix = st.text_input("Awalan Ear Tag", key="animal_search_prefix")
+        matches = registry_search(prefix.strip()) if prefix.strip() else []
+        if matches:
+            st.dataframe(pd.DataFrame([{
+                'Ear Tag': r['tag'],
+                'Kelas': r['product_name'],
+                'Tanggal Lahir': r['birth_date'],
+                'Tanggal Beli': r['purchase_date'],
+                'Biaya': r['cost'],
+                'Status': r['status'],
+            } for r in matches]), use_container_width=True, hide_index=True, column_config=rupiah_columns('Biaya'))
+            
+            with col2:
+                selected_tag = st.selectbox("Ear Tag", [r['tag'] for r in matches], key="animal_status_tag")
+            # Terjual diposting sebagai penjualan, Mati sebagai pengeluaran stok ke beban selisih persediaan
+            col_status, col_date, col_location = st.columns(3)
+            with col_status:
+                new_status = st.selectbox("Status Baru", ["Terjual", "Mati"], key="animal_new_status")
+            with col_date:
+                status_date = st.date_input("Tanggal Status", datetime.now(), key="animal_status_date")
+            with col_location:
+                status_location = st.selectbox("Kandang", list_locations(), key="animal_status_location")
+            col_price, col_payment, col_btn = st.columns(3)
+            with col_price:
+                sale_price = st.number_input("Harga Jual (Rp)", min_value=0, value=0, key="animal_sale_price",
+                                             disabled=new_status != "Terjual")
+            with col_payment:
+                sale_payment = st.selectbox("Metode Pembayaran", PAYMENT_METHODS, key="animal_sale_payment",
+                                            disabled=new_status != "Terjual")
+            with col_btn:
+                if st.button("💾 Ubah Status", use_container_width=True):
+                    try:
+                        update_animal_status(selected_tag, new_status, status_date, price=sale_price,
+                                             payment_method=sale_payment, location=status_location)
+                        st.success(f"✅ Status {selected_tag} diubah menjadi {new_status}")
+                        st.rerun()
+                    except AccountingError as e:
+                        st.error(f"❌ {e}")
+        elif prefix.strip():
+            st.info("Tidak ada ear tag yang cocok")
+    
+    except Exception as e:
+        st.error(f"❌ Error registri ternak: {e}")
+
+def show_stock_transfer():
+    st.markdown("### 🚚 Pindah Kandang")
+    
+    index = load_location_index()
+    with index['lock']:
+        product_options = sorted(index['names'][key] for key, locs in index['by_product'].items() if any(locs.values()))
+    if not product_options:
+        st.info("📝 Belum ada stok untuk dipindahkan")
+        return
+    
+    with st.form("form_pindah_kandang"):
+        col1, col2 = st.columns(2)
+        with col1:
+            product_name = st.selectbox("Produk", product_options, key="transfer_product")
+            quantity = st.number_input("Jumlah", min_value=1, value=1, key="transfer_qty")
+            transfer_date = st.date_input("Tanggal Pindah", datetime.now(), key="transfer_date")
+        with col2:
+            locations = list_locations()
+            from_location = st.selectbox("Dari Kandang", locations, key="transfer_from")
+            to_location = st.selectbox("Ke Kandang", locations, key="transfer_to", accept_new_options=True)
+        
+        if st.form_submit_button("🚚 Pindahkan", use_container_width=True):
+            ok, message = transfer_stock(product_name, from_location, to_location.strip(), quantity, transfer_date)
+            if ok:
+                st.success(f"✅ {message}")
+                st.rerun()
+            else:
+                st.error(f"❌ {message}")
+
+def show_stock_opname():
+    st.markdown("### 🧮 Stock Opname")
+    
+    try:
+        col1, col2 = st.columns(2)
+        with col1:
+            count_date = st.date_input("Tanggal Opname", datetime.now(), key="opname_date")
+        with col2:
+            uploaded = st.file_uploader("Upload hasil hitung (CSV: Produk, Lokasi, Jumlah Fisik)", type="csv", key="opname_upload")
+        
+        book = build_stock_count_sheet()
+        if uploaded is not None:
+            book = apply_uploaded_counts(book, uploaded)
+        
+        if book.empty:
+            st.info("📝 Belum ada stok untuk dihitung")
+            return
+        
+        counts = st.data_editor(
+            book,
+            use_container_width=True,
+            hide_index=True,
+            key="opname_counts",
+            disabled=['Produk', 'Lokasi', 'Stok Buku', 'Harga Rata-rata'],
+            column_config={
+                "Harga Rata-rata": st.column_config.NumberColumn("Harga Rata-rata", format="localized"),
+                "Jumlah Fisik": st.column_config.NumberColumn("Jumlah Fisik", min_value=0, step=1),
+            }
+        )
+        
+        variances = compute_stock_variances(counts)
+        changed = variances[variances['Selisih'] != 0]
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Baris Selisih", len(changed))
+        with col2:
+            st.metric("Selisih Kurang", format_rupiah(-changed.loc[changed['Nilai Selisih'] < 0, 'Nilai Selisih'].sum()))
+        with col3:
+            st.metric("Selisih Lebih", format_rupiah(changed.loc[changed['Nilai Selisih'] > 0, 'Nilai Selisih'].sum()))
+        
+        if not changed.empty:
+            st.dataframe(changed[['Produk', 'Lokasi', 'Stok Buku', 'Jumlah Fisik', 'Selisih', 'Nilai Selisih']],
+                         use_container_width=True, hide_index=True, column_config=rupiah_columns('Nilai Selisih'))
+        
+        if st.button("💾 Posting Stock Opname", use_container_width=True, disabled=changed.empty):
+            ok, message = post_stock_opname(count_date, variances)
+            if ok:
+                run_reconciliation_check()
+                st.success(f"✅ {message}")
+                st.rerun()
+            else:
+                st.error(f"❌ {message}")
+    
+    except Exception as e:
+        st.error(f"❌ Error stock opname: {e}")
+
+def show_reclassification():
+    st.markdown("### 🔄 Reklasifikasi Kelas Umur")
+    st.caption("Anak → Remaja pada umur 12 bulan, Remaja → Dewasa pada umur 24 bulan. "
+               "Transfer dinilai sebesar biaya tercatat dan diposting sebagai satu jurnal.")
+    
+    try:
+        col1, col2 = st.columns(2)
+        with col1:
+            cutoff = st.date_input("Tanggal Cutoff", datetime.now(), key="reclass_cutoff")
+        with col2:
+            location = st.selectbox("Kandang", list_locations(), key="reclass_location")
+        moves = find_due_reclassifications(cutoff)
+        
+        st.markdown("#### Ternak Terdaftar yang Naik Kelas")
+        if moves:
+            st.dataframe(pd.DataFrame([{
+                'Ear Tag': m['tag'],
+                'Dari': m['from_product'],
+                'Ke': m['to_product'],
+                'Biaya Tercatat': m['cost'],
+            } for m in moves]), use_container_width=True, hide_index=True, column_config=rupiah_columns('Biaya Tercatat'))
+        else:
+            st.info("Tidak ada ternak terdaftar yang naik kelas pada tanggal ini")
+        
+        st.markdown("#### Stok Tanpa Ear Tag")
+        product_options = [animal_product_name(c, s) for c in AGE_CLASSES for s in ANIMAL_SEXES]
+        quantity_editor = st.data_editor(
+            pd.DataFrame({'Dari': pd.Series(dtype='str'), 'Ke': pd.Series(dtype='str'), 'Jumlah': pd.Series(dtype='int')}),
+            num_rows="dynamic",
+            use_container_width=True,
+            key="reclass_quantity_moves",
+            column_config={
+                "Dari": st.column_config.SelectboxColumn("Dari", options=product_options),
+                "Ke": st.column_config.SelectboxColumn("Ke", options=product_options),
+                "Jumlah": st.column_config.NumberColumn("Jumlah (ekor)", min_value=0, step=1),
+            }
+        )
+        quantity_moves = [
+            {'from_product': row['Dari'], 'to_product': row['Ke'], 'quantity': int(row['Jumlah'])}
+            for _, row in quantity_editor.dropna().iterrows()
+        ]
+        
+        if st.button("💾 Posting Reklasifikasi", use_container_width=True, disabled=not (moves or quantity_moves)):
+            ok, message = post_reclassification(cutoff, moves, quantity_moves, location)
+            if ok:
+                run_reconciliation_check()
+                st.success(f"✅ {message}")
+                st.rerun()
+            else:
+                st.error(f"❌ {message}")
+    
+    except Exception as e:
+        st.error(f"❌ Error reklasifikasi: {e}")
+
+def show_reconciliation():
+    st.markdown("### 🔍 Rekonsiliasi Persediaan vs Buku Besar")
+    
+    try:
+        result = get_reconciliation()
+        products = result['products']
+        accounts = result['accounts']
+        transactions = result['transactions']
+        
+        product_issues = products[products['Selisih Qty'] != 0]
+        account_issues = accounts[accounts['Selisih'] != 0]
+        
+        if product_issues.empty and account_issues.empty:
+            st.success("✅ Inventory, pembelian-penjualan, dan Buku Besar sudah sesuai")
+        else:
+            st.error(f"❌ {len(product_issues)} produk dan {len(account_issues)} akun persediaan tidak sesuai")
+        
+        st.markdown("#### Kuantitas per Produk (Inventory vs Pembelian - Penjualan)")
+        st.dataframe(products, use_container_width=True, hide_index=True, column_config=rupiah_columns('Nilai Inventory'))
+        
+        st.markdown("#### Nilai per Akun (Inventory vs Buku Besar)")
+        st.dataframe(accounts, use_container_width=True, hide_index=True,
+                     column_config=rupiah_columns('Nilai Inventory', 'Saldo Buku Besar', 'Selisih'))
+        
+        issue_options = ([f"Produk: {name}" for name in product_issues['Produk']] +
+                         [f"Akun: {account}" for account in account_issues['Akun']])
+        if issue_options:
+            selected = st.selectbox("Telusuri transaksi terkait:", issue_options, key="recon_drilldown")
+            kind, value = selected.split(": ", 1)
+            if kind == "Produk":
+                related = transactions[transactions['Produk'].str.lower() == value.lower()]
+            else:
+                related = transactions[transactions['Akun'] == value]
+            related = related.sort_values(['Tanggal', 'Sumber', 'Baris'])
+            st.dataframe(related, use_container_width=True, hide_index=True, column_config=rupiah_columns('Nominal'))
+    
+    except Exception as e:
+        st.error(f"❌ Error rekonsiliasi: {e}")
+
+KARTU_PERSEDIAAN_TABS = ["📝 Pembelian", "💰 Penjualan", "📋 Riwayat Transaksi", "📦 Kartu Persediaan",
+                         "🔍 Rekonsiliasi", "🐃 Registri Ternak", "🔄 Reklasifikasi", "🧮 Stock Opname"]
+
+def show_kartu_persediaan():
+    st.markdown('<div class="main-header"><h1>📦 Kartu Persediaan</h1></div>', unsafe_allow_html=True)
+    
+    # Predefined selling prices
+    SELLING_PRICE = {
+        "Kerbau Dewasa Jantan": 30000000,
+        "Kerbau Dewasa Betina": 27000000,
+        "Kerbau Remaja Jantan": 20000000,
+        "Kerbau Remaja Betina": 17000000,
+        "Anak Kerbau Jantan": 15000000,
+        "Anak Kerbau Betina": 12000000,
+    }
+    
+    issues = st.session_state.get('reconciliation_issues')
+    if issues and (issues['products'] or issues['accounts']):
+        st.warning(f"⚠️ Rekonsiliasi: {issues['products']} produk dan {issues['accounts']} akun persediaan tidak sesuai. Lihat tab Rekonsiliasi.")
+    
+    # Tab untuk navigasi: hanya tab aktif yang dijalankan, jadi kartu persediaan tidak dihitung
+    # ulang saat pengguna mengetik pembelian
+    active_tab = st.segmented_control("Menu", KARTU_PERSEDIAAN_TABS, default=KARTU_PERSEDIAAN_TABS[0],
+                                      key="kartu_persediaan_tab", label_visibility="collapsed")
+    active_tab = active_tab or KARTU_PERSEDIAAN_TABS[0]
+    ctx = new_data_context()
+    try:
+        _show_kartu_persediaan_tab(active_tab, ctx, SELLING_PRICE)
+    finally:
+        close_data_context(ctx)
+
+def _show_kartu_persediaan_tab(active_tab, ctx, SELLING_PRICE):
+    """Isi satu tab Kartu Persediaan; data dibaca lewat ctx"""
+    if active_tab == KARTU_PERSEDIAAN_TABS[0]:
+        st.markdown("### 🛒 Tambah Pembelian Baru")
+        
+        with st.form("form_pembelian"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                date = st.date_input("Tanggal", datetime.now())
+                product_name = st.text_input("Nama Produk")
+                # TAMBAHAN: Pilihan metode pembayaran
+                payment_method = st.selectbox("Metode Pembayaran", ["Tunai", "Kredit"])
+                location = st.selectbox("Lokasi Kandang", list_locations(), key="purchase_location", accept_new_options=True)
+                
+            with col2:
+                col_qty, col_unit = st.columns([2, 1])
+                with col_qty:
+                    quantity = st.number_input("Jumlah", min_value=1, value=1)
+                with col_unit:
+                    unit = st.selectbox("Unit", ["kg", "pcs", "karung", "ekor"])
+                
+                price = st.number_input("Harga per Unit (Rp)", min_value=0, value=0)
+            
+            submit = st.form_submit_button("✅ Submit Pembelian", use_container_width=True)
+            
+            if submit:
+                try:
+                    # Stok, riwayat pembelian dan jurnal ditulis oleh API akuntansi
+                    post_purchase(product_name, quantity, price, unit=unit, payment_method=payment_method,
+                                  location=location, date=date)
+                    run_reconciliation_check()
+                    st.success("✅ Produk berhasil ditambahkan ke persediaan dan jurnal dibuat otomatis!")
+                    st.rerun()
+                
+                except AccountingError as e:
+                    st.error(f"❌ {e}")
+                except Exception as e:
+                    st.error(f"❌ Error: {e}")
+        
+        # Riwayat Pembelian
+        st.markdown("### 📋 Riwayat Pembelian")
+        try:
+            rows = [row[:5] + (_row_unit(row, 8),) for row in context_rows(ctx, 'Purchases')
+                    if row and row[0]]
+            
+            if rows:
+                df = pd.DataFrame(rows, columns=['Tanggal', 'Nama Produk', 'Kuantitas', 'Harga Satuan', 'Total Harga', 'Unit'])
+                df['Kuantitas'] = parse_qty_column(df['Kuantitas'])
+                df['Harga Satuan'] = parse_rupiah_column(df['Harga Satuan'])
+                df['Total Harga'] = parse_rupiah_column(df['Total Harga'])
+                total_purchases = df['Total Harga'].sum()
+                st.dataframe(df, use_container_width=True, hide_index=True,
+                             column_config=rupiah_columns('Harga Satuan', 'Total Harga'))
+                
+                st.markdown(f"""
+                <div style="background: #10b981; color: white; padding: 1rem; border-radius: 8px; text-align: center; margin-top: 1rem;">
+                    <h3>💰 Total Pembelian: {format_rupiah(total_purchases)}</h3>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.info("📝 Belum ada data pembelian")
+        
+        except Exception as e:
+            st.error(f"❌ Error loading data: {e}")
+
+        st.markdown("### 🗑️ Hapus Pembelian")
+        
+        try:
+            history = load_history_index()
+            purchase_positions = history['keys']['Tipe'].get('Pembelian')
+            
+            if purchase_positions is not None:
+                # Cari lewat indeks riwayat; hanya top-N hasil yang dikirim ke browser
+                purchase_data = show_search_picker("Pembelian", "hapus_pembelian", history['df'], history['search'],
+                                                   transaction_label, within=purchase_positions)
+                
+                col1, col2 = st.columns([3, 1])
+                with col2:
+                    if st.button("🗑️ Hapus Pembelian Terpilih", type="secondary", use_container_width=True):
+                        if purchase_data:
+                            if delete_purchase_transaction(history_delete_payload(purchase_data)):
+                                run_reconciliation_check()
+                                st.success("✅ Pembelian berhasil dihapus dari semua sistem!")
+                                st.rerun()
+                            else:
+                                st.error("❌ Gagal menghapus pembelian!")
+            else:
+                st.info("📝 Tidak ada data pembelian untuk dihapus")
+                
+        except Exception as e:
+            st.error(f"❌ Error: {e}")
+
+    if active_tab == KARTU_PERSEDIAAN_TABS[1]:
+        st.markdown("### 💰 Tambah Penjualan Baru")
+        
+        with st.form("form_penjualan"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                date = st.date_input("Tanggal Penjualan", datetime.now())
+                product_name = st.selectbox("Nama Produk", list(SELLING_PRICE.keys()))
+                # TAMBAHAN: Pilihan metode pembayaran
+                payment_method = st.selectbox("Metode Pembayaran", ["Tunai", "Kredit"], key="sales_payment")
+                location = st.selectbox("Lokasi Kandang", list_locations(), key="sales_location")
+            
+            with col2:
+                quantity = st.number_input("Jumlah (ekor)", min_value=1, value=1, key="qty_sales")
+                
+                # Display price (readonly)
+                selling_price = SELLING_PRICE[product_name]
+                st.text_input("Harga Jual per Unit", value=format_rupiah(selling_price), disabled=True)
+            
+            add_to_list = st.form_submit_button("➕ Tambah ke Daftar", use_container_width=True)
+            
+            if add_to_list:
+                try:
+                    # Check inventory dan ambil HPP (hanya baca, stok ditahan di memori)
+                    wb = openpyxl.load_workbook(data_file(), read_only=True)
+                    ws_inv = wb['Inventory']
+                    
+                    product_found = False
+                    stock = 0
+                    hpp_price = 0
+                    for row in ws_inv.iter_rows(min_row=2, values_only=True):
+                        if row[0] and str(row[0]).strip().lower() == product_name.strip().lower():
+                            stock = safe_parse_int_from_qtytext(row[1])
+                            # Ambil HPP dari inventory
+                            hpp_price = safe_parse_price(row[2]) if row[2] else 0
+                            product_found = True
+                            break
+                    wb.close()
+                    
+                    if not product_found:
+                        st.error(f"❌ {product_name} tidak ditemukan di Inventory.")
+                    else:
+                        # Reservasi semua sesi (termasuk daftar ini) dihitung per produk dan per kandang
+                        reserved, available = reserve_stock(product_name, quantity, stock, location,
+                                                            product_locations(product_name).get(location, 0))
+                        if not reserved:
+                            st.error(f"❌ Stok {product_name} di {location} yang tersedia hanya {available} ekor!")
+                        else:
+                            # Hitung total
+                            total_sales = selling_price * quantity
+                            total_hpp = hpp_price * quantity
+                            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                            
+                            if 'order_list' not in st.session_state:
+                                st.session_state.order_list = []
+                            
+                            # Simpan HPP juga di session state
+                            st.session_state.order_list.append({
+                                'date': date.strftime('%Y-%m-%d'),
+                                'product_name': product_name,
+                                'quantity': quantity,
+                                'unit': DEFAULT_UNIT,
+                                'price': selling_price,
+                                'hpp_price': hpp_price,  # TAMBAHAN: Simpan HPP
+                                'total': total_sales,
+                                'total_hpp': total_hpp,  # TAMBAHAN: Simpan total HPP
+                                'payment_method': payment_method,  # TAMBAHAN: Simpan metode pembayaran
+                                'location': location,
+                                'timestamp': timestamp
+                            })
+                            
+                            st.success(f"✅ Penjualan {product_name} berhasil ditambahkan!")
+                            st.rerun()
+                
+                except Exception as e:
+                    st.error(f"❌ Error: {e}")
+
+        st.markdown("### 🛍️ Daftar Penjualan Sementara")
+        
+        if 'order_list' not in st.session_state:
+            st.session_state.order_list = []
+            
+        if st.session_state.order_list:
+            # Display order list
+            orders = pd.DataFrame(st.session_state.order_list)
+            df = pd.DataFrame({
+                'Tanggal': orders['date'],
+                'Nama Produk': orders['product_name'],
+                'Lokasi': orders['location'] if 'location' in orders else DEFAULT_LOCATION,
+                'Jumlah': parse_qty_column(orders['quantity']),
+                'Harga Jual': parse_rupiah_column(orders['price']),
+                'HPP': parse_rupiah_column(orders['hpp_price']),
+                'Total': parse_rupiah_column(orders['total'])
+            })
+            total_all_sales = df['Total'].sum()
+            total_all_hpp = parse_rupiah_column(orders['total_hpp']).sum()
+            st.dataframe(df, use_container_width=True, hide_index=True,
+                         column_config=rupiah_columns('Harga Jual', 'HPP', 'Total'))
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown(f"""
+                <div style="background: #3b82f6; color: white; padding: 1rem; border-radius: 8px; text-align: center; margin-top: 1rem;">
+                    <h3>💰 Total Penjualan: {format_rupiah(total_all_sales)}</h3>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col2:
+                st.markdown(f"""
+                <div style="background: #f59e0b; color: white; padding: 1rem; border-radius: 8px; text-align: center; margin-top: 1rem;">
+                    <h3>📊 Total HPP: {format_rupiah(total_all_hpp)}</h3>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            # Save all button - SEKARANG DI LUAR FORM
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("💾 Simpan Semua Penjualan", use_container_width=True):
+                    try:
+                        # Stok baru benar-benar dikurangi saat daftar disimpan; jurnal dibuat per penjualan
+                        post_sale_batch([
+                            SaleOrder(order['product_name'], safe_parse_int_from_qtytext(order['quantity']),
+                                      order['price'], payment_method=order['payment_method'],
+                                      location=order.get('location', DEFAULT_LOCATION),
+                                      unit=order.get('unit', DEFAULT_UNIT), date=order['date'],
+                                      timestamp=order['timestamp'])
+                            for order in st.session_state.order_list
+                        ])
+                        
+                        st.session_state.order_list = []
+                        release_reservations()
+                        run_reconciliation_check()
+                        st.success("✅ Semua penjualan berhasil disimpan dan jurnal dibuat otomatis!")
+                        st.rerun()
+                    
+                    except AccountingError as e:
+                        st.error(f"❌ {e}")
+                    except Exception as e:
+                        st.error(f"❌ Error: {e}")
+            
+            with col2:
+                if st.button("🗑️ Hapus Semua Penjualan", use_container_width=True):
+                    st.session_state.order_list = []
+                    release_reservations()
+                    st.success("✅ Daftar penjualan berhasil dihapus!")
+                    st.rerun()
+        else:
+            st.info("📝 Belum ada penjualan dalam daftar")
+
+        st.markdown("### 🗑️ Hapus Penjualan")
+        
+        try:
+            history = load_history_index()
+            sales_positions = history['keys']['Tipe'].get('Penjualan')
+            
+            if sales_positions is not None:
+                # Cari lewat indeks riwayat; hanya top-N hasil yang dikirim ke browser
+                sale_data = show_search_picker("Penjualan", "hapus_penjualan", history['df'], history['search'],
+                                               transaction_label, within=sales_positions)
+                
+                col1, col2 = st.columns([3, 1])
+                with col2:
+                    if st.button("🗑️ Hapus Penjualan Terpilih", type="secondary", use_container_width=True):
+                        if sale_data:
+                            if delete_sales_transaction(history_delete_payload(sale_data)):
+                                run_reconciliation_check()
+                                st.success("✅ Penjualan berhasil dihapus dari semua sistem!")
+                                st.rerun()
+                            else:
+                                st.error("❌ Gagal menghapus penjualan!")
+            else:
+                st.info("📝 Tidak ada data penjualan untuk dihapus")
+
+        except Exception as e:
+            st.error(f"❌ Error: {e}")
+
+    if active_tab == KARTU_PERSEDIAAN_TABS[2]:
+        st.markdown("### 📋 Riwayat Transaksi Lengkap")
+        
+        try:
+            history = load_history_index()
+            
+            if not history['df'].empty:
+                # Query berjalan di server; hanya halaman yang tampil yang dikirim ke browser
+                show_paged_grid('history', history, filter_columns=['Tipe', 'Produk'],
+                                column_config=rupiah_columns('Harga/Unit', 'Total'))
+                
+                # Summary dihitung sekali saat indeks dibangun
+                total_pembelian = history['totals_by_type'].get('Pembelian', 0.0)
+                total_penjualan = history['totals_by_type'].get('Penjualan', 0.0)
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Total Pembelian", format_rupiah(total_pembelian))
+                with col2:
+                    st.metric("Total Penjualan", format_rupiah(total_penjualan))
+                
+            else:
+                st.info("📝 Belum ada data transaksi")
+        
+        except Exception as e:
+            st.error(f"❌ Error loading transaction data: {e}")
+
+    if active_tab == KARTU_PERSEDIAAN_TABS[3]:
+        st.markdown("### 📊 Kartu Persediaan Detail")
+        
+        try:
+            # Satu kali baca setiap sheet mutasi, dikelompokkan per produk dan per lokasi sekaligus
+            movements_by_product = {}
+            location_stock = {}
+            
+            def add_movement(product_key, location, qty, trans=None):
+                if trans is not None:
+                    movements_by_product.setdefault(product_key, []).append(trans)
+                product_locations_qty = location_stock.setdefault(product_key, {})
+                product_locations_qty[location] = product_locations_qty.get(location, 0) + qty
+            
+            for sheet_rows, trans_type, sign in ((context_rows(ctx, 'Purchases'), 'Pembelian', 1),
+                                                 (context_rows(ctx, 'Sales'), 'Penjualan', -1)):
+                for mutation_row in sheet_rows:
+                    if not mutation_row or not mutation_row[1]:
+                        continue
+                    trans_qty = sign * safe_parse_int_from_qtytext(mutation_row[2])
+                    add_movement(str(mutation_row[1]).strip().lower(), _row_location(mutation_row, 7), trans_qty, {
+                        'tanggal': mutation_row[0],
+                        'timestamp': mutation_row[5] if len(mutation_row) > 5 else "",
+                        'type': trans_type,
+                        'qty': trans_qty,
+                        'price': safe_parse_price(mutation_row[3]),
+                        'total': safe_parse_price(mutation_row[4])
+                    })
+            
+            for reclass_row in context_rows(ctx, 'Reclassifications'):
+                if not reclass_row or not reclass_row[1] or not reclass_row[2]:
+                    continue
+                qty_reclass = safe_parse_int_from_qtytext(reclass_row[3])
+                total_reclass = safe_parse_price(reclass_row[4])
+                for product_col, trans_type, sign in ((1, 'Reklasifikasi Keluar', -1), (2, 'Reklasifikasi Masuk', 1)):
+                    trans_qty = sign * qty_reclass
+                    add_movement(str(reclass_row[product_col]).strip().lower(), _row_location(reclass_row, 7), trans_qty, {
+                        'tanggal': reclass_row[0],
+                        'timestamp': reclass_row[5] if len(reclass_row) > 5 else "",
+                        'type': trans_type,
+                        'qty': trans_qty,
+                        'price': total_reclass / qty_reclass if qty_reclass else 0,
+                        'total': total_reclass
+                    })
+            
+            for adjustment_row in context_rows(ctx, 'Adjustments'):
+                if not adjustment_row or not adjustment_row[1]:
+                    continue
+                trans_qty = safe_parse_int_from_qtytext(adjustment_row[3])
+                add_movement(str(adjustment_row[1]).strip().lower(), _row_location(adjustment_row, 2), trans_qty, {
+                    'tanggal': adjustment_row[0],
+                    'timestamp': adjustment_row[6] if len(adjustment_row) > 6 else "",
+                    'type': 'Stock Opname',
+                    'qty': trans_qty,
+                    'price': safe_parse_price(adjustment_row[4]),
+                    'total': abs(safe_parse_price(adjustment_row[5]))
+                })
+            
+            # Pindah kandang hanya mengubah lokasi, bukan saldo produk
+            for transfer_row in context_rows(ctx, 'Transfers'):
+                if not transfer_row or not transfer_row[1]:
+                    continue
+                product_key = str(transfer_row[1]).strip().lower()
+                qty_transfer = safe_parse_int_from_qtytext(transfer_row[4])
+                add_movement(product_key, _row_location(transfer_row, 2), -qty_transfer)
+                add_movement(product_key, _row_location(transfer_row, 3), qty_transfer)
+            
+            # Ambil semua produk dari inventory
+            products = []
+            for row in context_rows(ctx, 'Inventory'):
+                if row and row[0]:
+                    product_name = row[0]
+                    price_balance = safe_parse_price(row[2])
+                    total_balance = safe_parse_price(row[3])
+                    qty_balance = safe_parse_int_from_qtytext(row[1])
+                    unit_balance = _row_unit(row, 4)
+                    
+                    product_key = str(product_name).strip().lower()
+                    all_transactions = list(movements_by_product.get(product_key, []))
+                    
+                    # Urutkan berdasarkan tanggal DAN timestamp
+                    all_transactions.sort(key=lambda x: (
+                        x['tanggal'] if x['tanggal'] else "0000-00-00",
+                        x['timestamp'] if x['timestamp'] else "00:00:00"
+                    ))
+                    
+                    # Hitung running balance dengan metode average
+                    running_qty = 0
+                    running_avg_price = 0
+                    running_total = 0
+                    
+                    transaction_details = []
+                    
+                    for trans in all_transactions:
+                        if trans['qty'] > 0:  # Stok masuk (pembelian, reklasifikasi masuk, selisih lebih)
+                            # Metode Average
+                            if running_qty == 0:
+                                running_avg_price = trans['price']
+                            else:
+                                total_value_before = running_qty * running_avg_price
+                                total_value_new = trans['qty'] * trans['price']
+                                running_avg_price = (total_value_before + total_value_new) / (running_qty + trans['qty'])
+                            
+                            running_qty += trans['qty']
+                            running_total = running_qty * running_avg_price
+                        
+                        else:  # Stok keluar (penjualan, reklasifikasi keluar, selisih kurang)
+                            # Untuk penjualan, harga pakai average price yang ada
+                            running_qty += trans['qty']  # trans['qty'] sudah negative
+                            running_total = running_qty * running_avg_price
+                        
+                        # Format timestamp untuk display
+                        display_time = ""
+                        if trans['timestamp']:
+                            try:
+                                if ' ' in trans['timestamp']:
+                                    date_part, time_part = trans['timestamp'].split(' ')
+                                    display_time = time_part
+                                else:
+                                    display_time = trans['timestamp']
+                            except:
+                                display_time = trans['timestamp']
+                        
+                        is_stock_in = trans['qty'] > 0
+                        transaction_details.append({
+                            'Tanggal': trans['tanggal'],
+                            'Waktu': display_time,
+                            'Tipe': trans['type'],
+                            'Qty_Pembelian': trans['qty'] if is_stock_in else 0,
+                            'Harga_Pembelian': trans['price'] if is_stock_in else None,
+                            'Total_Pembelian': trans['total'] if is_stock_in else None,
+                            'Qty_Penjualan': abs(trans['qty']) if not is_stock_in else 0,
+                            'Harga_Penjualan': trans['price'] if not is_stock_in else None,
+                            'Total_Penjualan': trans['total'] if not is_stock_in else None,
+                            'Qty_Balance': running_qty,
+                            'Harga_Balance': running_avg_price,
+                            'Total_Balance': running_total
+                        })
+                    
+                    # Tambahkan balance akhir jika ada transaksi
+                    if not transaction_details and qty_balance > 0:
+                        transaction_details.append({
+                            'Tanggal': '-',
+                            'Waktu': '',
+                            'Tipe': 'Balance Awal',
+                            'Qty_Pembelian': 0,
+                            'Harga_Pembelian': None,
+                            'Total_Pembelian': None,
+                            'Qty_Penjualan': 0,
+                            'Harga_Penjualan': None,
+                            'Total_Penjualan': None,
+                            'Qty_Balance': qty_balance,
+                            'Harga_Balance': price_balance,
+                            'Total_Balance': total_balance
+                        })
+                    
+                    products.append({
+                        'product_name': product_name,
+                        'unit': unit_balance,
+                        'current_stock': qty_balance,
+                        'current_value': total_balance,
+                        'locations': {loc: qty for loc, qty in location_stock.get(product_key, {}).items() if qty},
+                        'transactions': transaction_details
+                    })
+            
+            # Tampilkan summary persediaan
+            st.markdown("### 📈 Summary Persediaan")
+            # Stok dan nilai selalu dari Inventory; jumlah ekor ber-ear tag ditampilkan di kolom sendiri
+            registry_totals = registry_class_totals()
+            if products or registry_totals:
+                summary_data = []
+                
+                for product in products:
+                    registry_class = registry_totals.pop(product['product_name'], None)
+                    summary_data.append({
+                        'Nama Produk': product['product_name'],
+                        'Stok Saat Ini': product['current_stock'],
+                        'Satuan': product['unit'],
+                        'Nilai Persediaan': product['current_value'],
+                        'Ekor Terdaftar': registry_class['count'] if registry_class else 0
+                    })
+                
+                # Kelas yang hanya ada di registri (data lama sebelum registri terhubung ke Inventory)
+                for class_name, registry_class in sorted(registry_totals.items()):
+                    summary_data.append({
+                        'Nama Produk': class_name,
+                        'Stok Saat Ini': 0,
+                        'Satuan': DEFAULT_UNIT,
+                        'Nilai Persediaan': 0.0,
+                        'Ekor Terdaftar': registry_class['count']
+                    })
+                
+                df_summary = pd.DataFrame(summary_data)
+                st.dataframe(df_summary, use_container_width=True, hide_index=True,
+                             column_config=rupiah_columns('Nilai Persediaan'))
+                over_registered = df_summary[df_summary['Ekor Terdaftar'] > df_summary['Stok Saat Ini']]
+                if not over_registered.empty:
+                    st.warning("⚠️ Ekor terdaftar melebihi stok Inventory: "
+                               + ", ".join(over_registered['Nama Produk']))
+                
+                st.metric("Total Nilai Persediaan", format_rupiah(df_summary['Nilai Persediaan'].sum()))
+                
+                # Tampilkan detail kartu persediaan per produk
+                # Stok per lokasi dari pengelompokan yang sama
+                st.markdown("### 🏠 Stok per Lokasi")
+                location_data = [
+                    {'Lokasi': location, 'Nama Produk': product['product_name'], 'Stok': qty, 'Satuan': product['unit']}
+                    for product in products
+                    for location, qty in product.get('locations', {}).items()
+                ]
+                if location_data:
+                    df_location = pd.DataFrame(location_data).sort_values(['Lokasi', 'Nama Produk'])
+                    st.dataframe(df_location, use_container_width=True, hide_index=True)
+                else:
+                    st.info("📝 Belum ada stok per lokasi")
+                
+                show_stock_transfer()
+                
+                st.markdown("### 📋 Detail Kartu Persediaan per Produk")
+                for product in products:
+                    with st.expander(f"📦 {product['product_name']} ({product['unit']}) - Stok: {product['current_stock']}"):
+                        if product.get('locations'):
+                            st.caption("Lokasi: " + " · ".join(
+                                f"{location}: {qty}" for location, qty in sorted(product['locations'].items())))
+                        if product['transactions']:
+                            df_detail = pd.DataFrame(product['transactions'])
+                            
+                            # Rename kolom untuk tampilan yang lebih baik
+                            df_display = df_detail.rename(columns={
+                                'Qty_Pembelian': 'Qty Pembelian',
+                                'Harga_Pembelian': 'Harga/Unit Pembelian', 
+                                'Total_Pembelian': 'Total Pembelian',
+                                'Qty_Penjualan': 'Qty Penjualan',
+                                'Harga_Penjualan': 'Harga/Unit Penjualan',
+                                'Total_Penjualan': 'Total Penjualan',
+                                'Qty_Balance': 'Qty Balance',
+                                'Harga_Balance': 'Harga/Unit Balance',
+                                'Total_Balance': 'Total Balance'
+                            })
+                            
+                            st.dataframe(df_display, use_container_width=True, hide_index=True,
+                                         column_config=rupiah_columns(
+                                             'Harga/Unit Pembelian', 'Total Pembelian', 'Harga/Unit Penjualan',
+                                             'Total Penjualan', 'Harga/Unit Balance', 'Total Balance'))
+                        else:
+                            st.info("Belum ada transaksi untuk produk ini")
+            else:
+                st.info("📝 Belum ada data persediaan")
+        
+        except Exception as e:
+            st.error(f"❌ Error loading inventory data: {e}")
+
+    if active_tab == KARTU_PERSEDIAAN_TABS[4]:
+        show_reconciliation()
+
+    if active_tab == KARTU_PERSEDIAAN_TABS[5]:
+        show_animal_registry()
+
+    if active_tab == KARTU_PERSEDIAAN_TABS[6]:
+        show_reclassification()
+
+    if active_tab == KARTU_PERSEDIAAN_TABS[7]:
+        show_stock_opname()
+
+def show_ringkasan_penjualan():
+    st.markdown('<div class="main-header"><h1>📈 Ringkasan Penjualan</h1></div>', unsafe_allow_html=True)
+    
+    try:
+        db = _read_sheets(data_file(), ['Inventory', 'Sales'], [4, 6])
+        inventory = db['Inventory'].dropna(subset=[0])
+        sales = db['Sales'].dropna(subset=[1])
+        
+        if not sales.empty:
+            # HPP per unit dari inventory, dipetakan ke seluruh kolom penjualan sekaligus
+            hpp_by_product = pd.Series(parse_rupiah_column(inventory[2]).values, index=inventory[0].values)
+            hpp_by_product = hpp_by_product[~hpp_by_product.index.duplicated(keep='last')]
+            df = pd.DataFrame({
+                'Tanggal': sales[0].values,
+                'Produk': sales[1].values,
+                'Qty': parse_qty_column(sales[2]).values,
+                'Harga Jual': parse_rupiah_column(sales[3]).values,
+                'HPP/Unit': sales[1].map(hpp_by_product).fillna(0.0).values,
+                'Total Income': parse_rupiah_column(sales[4]).values,
+            })
+            df['Total HPP'] = df['HPP/Unit'] * df['Qty']
+            df['Gross Profit'] = df['Total Income'] - df['Total HPP']
+            
+            total_income_all = df['Total Income'].sum()
+            total_HPP_all = df['Total HPP'].sum()
+            total_profit_all = df['Gross Profit'].sum()
+            
+            st.dataframe(df, use_container_width=True, hide_index=True,
+                         column_config=rupiah_columns('Harga Jual', 'HPP/Unit', 'Total Income', 'Total HPP', 'Gross Profit'))
+            
+            # Summary
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.markdown(f"""
+                <div style="background: #10b981; color: white; padding: 1rem; border-radius: 8px; text-align: center;">
+                    <h4>Total Income</h4>
+                    <h2>{format_rupiah(total_income_all)}</h2>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col2:
+                st.markdown(f"""
+                <div style="background: #f59e0b; color: white; padding: 1rem; border-radius: 8px; text-align: center;">
+                    <h4>Total HPP</h4>
+                    <h2>{format_rupiah(total_HPP_all)}</h2>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col3:
+                profit_color = "#10b981" if total_profit_all > 0 else "#ef4444"
+                st.markdown(f"""
+                <div style="background: {profit_color}; color: white; padding: 1rem; border-radius: 8px; text-align: center;">
+                    <h4>Profit</h4>
+                    <h2>{format_rupiah(total_profit_all)}</h2>
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.info("Belum ada data penjualan")
+    
+    except Exception as e:
+        st.error(f"Error: {e}")
@@ -0,0 +1,494 @@
+"""Halaman jurnal: input jurnal, jurnal umum, buku besar, neraca saldo"""
+import streamlit as st
+from openpyxl import Workbook, load_workbook
+import pandas as pd
+import numpy as np
+import os
+from datetime import datetime
+import uuid
+
+from buffabook.tenant import current_tenant, journal_file, write_lock
+from buffabook.values import format_rupiah, from_sen, rupiah_columns, to_sen_column
+from buffabook.accounting import (
+    ACCOUNTS, JOURNAL_HEADER, create_journal_workbook, delete_journal_transaction, ledger_running_balances_sen,
+    load_ledger_balances, recalculate_all_ledger_balances, save_journal_workbook
+)
+from buffabook.api import AccountingError, UnbalancedEntryError, post_journal
+from buffabook.queries import journal_csv_export, load_journal_index, load_ledger_index
+from buffabook.widgets import open_ledger_account, show_journal_search, show_paged_grid, show_search_picker
+
+
+JOURNAL_EDITORS = {
+    'umum': {
+        'prefix': '',
+        'date_label': "Tanggal",
+        'keterangan_label': "Keterangan Transaksi",
+        'placeholder': "Contoh: Pembelian perlengkapan kantor",
+        'submit_label': "💾 Simpan Jurnal",
+        'keterangan_format': "{}",
+        'require_keterangan': False,
+        'success': "✅ Jurnal berhasil disimpan ke Jurnal Umum dan Buku Besar!",
+    },
+    'penyesuaian': {
+        'prefix': 'adj_',
+        'date_label': "Tanggal Penyesuaian",
+        'keterangan_label': "Keterangan Penyesuaian",
+        'placeholder': "Contoh: Penyesuaian penyusutan kendaraan, Penyesuaian beban dibayar di muka, dll.",
+        'submit_label': "💾 Simpan Jurnal Penyesuaian",
+        'keterangan_format': "[PENYESUAIAN] {}",
+        'require_keterangan': True,
+        'success': "✅ Jurnal Penyesuaian berhasil disimpan ke Jurnal Umum dan Buku Besar!",
+    },
+}
+
+def _new_journal_line():
+    """Satu baris akun di editor jurnal; id tetap supaya widget tidak tertukar saat baris dihapus"""
+    return {'id': uuid.uuid4().hex[:8], 'account': '', 'amount': 0}
+
+def _add_journal_line(state_key):
+    st.session_state[state_key].append(_new_journal_line())
+
+def _remove_journal_line(state_key, line_id):
+    st.session_state[state_key] = [line for line in st.session_state[state_key] if line['id'] != line_id]
+
+@st.fragment
+def journal_entry_editor(kind):
+    """Editor debit/kredit dinamis. Tambah/hapus baris dan cek balance hanya merender ulang
+    fragment ini; rerun penuh hanya setelah jurnal berhasil disimpan."""
+    config = JOURNAL_EDITORS[kind]
+    prefix = config['prefix']
+    sides = {'debit': f"{prefix}debit_accounts", 'credit': f"{prefix}credit_accounts"}
+    for state_key in sides.values():
+        if state_key not in st.session_state:
+            st.session_state[state_key] = [_new_journal_line()]
+    # Versi form naik setiap kali tersimpan, sehingga tanggal dan keterangan kembali kosong
+    version = st.session_state.setdefault(f"{prefix}journal_form_version", 0)
+    account_options = [f"{code} - {name}" for code, name in ACCOUNTS.items()]
+    
+    # Tambah/hapus baris lewat callback, dijalankan sebelum fragment dirender ulang
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button("➕ Tambah Akun Debit", key=f"{prefix}add_debit",
+                  on_click=_add_journal_line, args=(sides['debit'],))
+    with col2:
+        st.button("➕ Tambah Akun Kredit", key=f"{prefix}add_credit",
+                  on_click=_add_journal_line, args=(sides['credit'],))
+    
+    date = st.date_input(config['date_label'], datetime.now(), key=f"{prefix}journal_date_{version}")
+    
+    totals = {}
+    for side, title in (('debit', 'Debit'), ('credit', 'Kredit')):
+        st.markdown(f"**Akun {title}**")
+        lines = st.session_state[sides[side]]
+        for i, line in enumerate(lines):
+            st.markdown(f"**{title} {i+1}**")
+            col_acc, col_amt, col_del = st.columns([2, 1, 0.5])
+            with col_acc:
+                line['account'] = st.selectbox(f"Pilih Akun {title}", account_options,
+                                               key=f"{prefix}{side}_acc_{line['id']}")
+            with col_amt:
+                line['amount'] = st.number_input(f"Nominal {title}", min_value=0, value=line['amount'],
+                                                 key=f"{prefix}{side}_amt_{line['id']}")
+            with col_del:
+                if i > 0:  # Hanya tampilkan tombol hapus untuk akun tambahan
+                    st.button("❌", type="secondary", key=f"{prefix}del_{side}_{line['id']}",
+                              on_click=_remove_journal_line, args=(sides[side], line['id']))
+        totals[side] = sum(line['amount'] for line in lines if line['account'])
+        st.markdown("---")
+    
+    # Cek balance langsung saat nominal diubah
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Debit", format_rupiah(totals['debit']))
+    with col2:
+        st.metric("Total Kredit", format_rupiah(totals['credit']))
+    with col3:
+        if totals['debit'] and totals['debit'] == totals['credit']:
+            st.success("✅ Balance")
+        else:
+            st.warning("⚠️ Belum balance")
+    
+    keterangan = st.text_input(config['keterangan_label'], placeholder=config['placeholder'],
+                               key=f"{prefix}journal_keterangan_{version}")
+    
+    if st.button(config['submit_label'], use_container_width=True, key=f"{prefix}journal_submit"):
+        if config['require_keterangan'] and not keterangan:
+            st.error("Keterangan penyesuaian harus diisi")
+            return
+        try:
+            # Debit lebih dulu lalu kredit; validasi balance dilakukan oleh API akuntansi
+            lines = ([(acc['account'], acc['amount'], 0) for acc in st.session_state[sides['debit']]]
+                     + [(acc['account'], 0, acc['amount']) for acc in st.session_state[sides['credit']]])
+            post_journal(date, config['keterangan_format'].format(keterangan), lines)
+            st.success(config['success'])
+            
+            # Reset form setelah berhasil simpan
+            st.session_state[sides['debit']] = [_new_journal_line()]
+            st.session_state[sides['credit']] = [_new_journal_line()]
+            st.session_state[f"{prefix}journal_form_version"] = version + 1
+            st.rerun()
+        
+        except UnbalancedEntryError as e:
+            st.error(f"**{e}**")
+        except AccountingError as e:
+            st.error(str(e))
+        except Exception as e:
+            st.error(f"Error: {e}")
+
+def show_jurnal_umum():
+    st.markdown('<div class="main-header"><h1>📒 Input Jurnal Umum</h1></div>', unsafe_allow_html=True)
+    
+    create_journal_workbook()
+    
+    st.markdown("### Input Transaksi Baru")
+    journal_entry_editor('umum')
+
+def show_view_jurnal():
+    st.markdown('<div class="main-header"><h1>📖 Lihat Jurnal Umum</h1></div>', unsafe_allow_html=True)
+
+    try:
+        journal = load_journal_index()
+        entries = journal['df']
+
+        if not entries.empty:
+            # Total dijumlah dalam sen (int64) saat indeks dibangun, jadi pengecekan balance bisa eksak
+            total_debit_sen = journal['total_debit_sen']
+            total_kredit_sen = journal['total_kredit_sen']
+            total_debit = from_sen(total_debit_sen)
+            total_kredit = from_sen(total_kredit_sen)
+            
+            # Pencarian full-text, langsung menampilkan baris transaksi yang cocok
+            results = show_journal_search('jurnal')
+            if results is not None and not results.empty:
+                rank = pd.Series(np.arange(len(results)), index=results['txn_id'].to_numpy())
+                matched = entries[entries['ID'].isin(rank.index)]
+                matched = matched.assign(_rank=matched['ID'].map(rank)).sort_values(['_rank', 'row'])
+                st.dataframe(matched[['Tanggal', 'Akun', 'Debit', 'Kredit', 'Keterangan']],
+                             use_container_width=True, hide_index=True,
+                             column_config=rupiah_columns('Debit', 'Kredit'))
+                st.markdown("---")
+            
+            # Filter tanggal/akun dan paginasi di server, hanya satu halaman yang dirender
+            show_paged_grid('jurnal', journal, filter_columns=['Akun'],
+                            display_columns=['Tanggal', 'Akun', 'Debit', 'Kredit', 'Keterangan'],
+                            column_config=rupiah_columns('Debit', 'Kredit'))
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Total Debit", format_rupiah(total_debit))
+            with col2:
+                st.metric("Total Kredit", format_rupiah(total_kredit))
+            with col3:
+                if total_debit_sen == total_kredit_sen:
+                    st.success("✅ Jurnal Balance!")
+                else:
+                    st.error("❌ Jurnal Tidak Balance!")
+
+            # Export seluruh jurnal (bukan hanya halaman aktif), dibuat sekali per versi file
+            st.download_button(
+                label="📥 Export ke Excel",
+                data=journal_csv_export(),
+                file_name=f"jurnal_umum_{datetime.now().strftime('%Y%m%d')}.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
+            
+            # ========== FITUR HAPUS JURNAL ==========
+            st.markdown("---")
+            st.markdown("### 🗑️ Hapus Transaksi Jurnal")
+            
+            # HAPUS PER TRANSAKSI (SEMUA AKUN DALAM SATU TRANSAKSI)
+            groups = journal['groups']
+            if not groups.empty:
+                col1, col2 = st.columns([2, 1])
+                
+                with col1:
+                    # Cari lewat indeks transaksi; hanya top-N hasil yang dikirim ke browser
+                    selected_transaction = show_search_picker(
+                        "Transaksi", "pilih_transaksi_hapus", groups, journal['group_search'],
+                        lambda group: f"{group['tanggal']} - {group['keterangan']} ({group['jumlah_akun']} akun)")
+                
+                transaction_rows = entries.iloc[0:0]
+                if selected_transaction:
+                    transaction_rows = entries[entries['ID'].to_numpy() == selected_transaction['ID']].sort_values('row')
+                
+                with col2:
+                    if st.button("🗑️ Hapus Transaksi", type="secondary", use_container_width=True):
+                        if selected_transaction:
+                            row_indices_to_delete = transaction_rows['row'].tolist()
+                            
+                            if delete_journal_transaction(selected_transaction['keterangan'], row_indices_to_delete):
+                                st.success(f"✅ Transaksi berhasil dihapus!")
+                                st.rerun()
+                            else:
+                                st.error("❌ Gagal menghapus transaksi!")
+                        else:
+                            st.error("❌ Pilih transaksi yang akan dihapus!")
+                
+                # Tampilkan detail transaksi terpilih
+                if selected_transaction:
+                    st.info(f"**Detail Transaksi yang Dipilih:**")
+                    st.write(f"**Tanggal:** {selected_transaction['tanggal']}")
+                    st.write(f"**Keterangan:** {selected_transaction['keterangan']}")
+                    st.write(f"**Jumlah Akun:** {selected_transaction['jumlah_akun']}")
+                    
+                    st.write("**Daftar Akun:**")
+                    for akun, debit, kredit in zip(transaction_rows['Akun'], transaction_rows['Debit'],
+                                                   transaction_rows['Kredit']):
+                        if pd.notna(debit):
+                            st.write(f"• {akun} - Debit: {format_rupiah(debit)}")
+                        else:
+                            st.write(f"• {akun} - Kredit: {format_rupiah(kredit) if pd.notna(kredit) else ''}")
+            
+            else:
+                st.info("📝 Tidak ada transaksi untuk dihapus")
+                
+        else:
+            st.info("📝 Belum ada transaksi jurnal")
+
+    except Exception as e:
+        st.error(f"Error: {e}")
+
+    # Tombol untuk clear data SEMUA (fungsi lama tetap ada)
+    st.markdown("---")
+    st.markdown("### ⚠️ Hapus Semua Data Jurnal")
+    st.warning("Tindakan ini akan menghapus SEMUA data jurnal dan tidak dapat dikembalikan!")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("🗑️ Hapus Semua Data Jurnal", type="secondary", use_container_width=True):
+            try:
+                wb = Workbook()
+                ws_journal = wb.active
+                ws_journal.title = "Jurnal Umum"
+                ws_journal.append(JOURNAL_HEADER)
+
+                ws_ledger = wb.create_sheet("Buku Besar")
+                ws_ledger.append(["Akun", "Tanggal", "Keterangan", "Debit", "Kredit", "Saldo"])
+
+                with write_lock():
+                    save_journal_workbook(wb)
+                st.success("Data jurnal berhasil direset!")
+                st.rerun()
+            except Exception as e:
+                st.error(f"Error: {e}")
+    
+    with col2:
+        if st.button("🔄 Hitung Ulang Saldo Buku Besar", type="secondary", use_container_width=True):
+            if recalculate_all_ledger_balances():
+                st.success("✅ Saldo Buku Besar berhasil dihitung ulang!")
+            else:
+                st.error("❌ Gagal menghitung ulang saldo!")
+
+@st.cache_resource
+def _ledger_check_state(tenant):
+    """mtime journal_ledger.xlsx terakhir yang saldo Buku Besarnya sudah diverifikasi"""
+    return {'mtime': None}
+
+def _select_ledger_account(accounts):
+    """Callback klik baris di daftar akun Buku Besar"""
+    rows = st.session_state['buku_besar_index']['selection']['rows']
+    if rows:
+        st.session_state['buku_besar_akun'] = accounts[rows[0]]
+
+def show_buku_besar():
+    st.markdown('<div class="main-header"><h1>📚 Buku Besar</h1></div>', unsafe_allow_html=True)
+    
+    # Pastikan file sudah ada sebelum memuat
+    create_journal_workbook()
+    
+    try:
+        # Verifikasi saldo berjalan hanya saat file jurnal berubah, bukan di setiap tampilan
+        check = _ledger_check_state(current_tenant())
+        if check['mtime'] != os.path.getmtime(journal_file()):
+            with write_lock():
+                wb = load_workbook(journal_file())
+        
+                # Cek apakah sheet Buku Besar ada
+                if 'Buku Besar' not in wb.sheetnames:
+                    # Buat sheet Buku Besar jika tidak ada
+                    ws_ledger = wb.create_sheet("Buku Besar")
+                    ws_ledger.append(["Akun", "Tanggal", "Keterangan", "Debit", "Kredit", "Saldo"])
+                    save_journal_workbook(wb)
+                    st.info("Sheet Buku Besar berhasil dibuat")
+        
+                ws = wb['Buku Besar']
+        
+                # OTOMATIS HITUNG ULANG SEMUA SALDO
+                # Saldo berjalan per akun dihitung sekaligus dalam sen, dibandingkan eksak dengan saldo tersimpan
+                rows = [row for row in ws.iter_rows(min_row=2) if row[0].value]
+                saldo_updated = False
+                if rows:
+                    balances = ledger_running_balances_sen(
+                        [row[0].value for row in rows],
+                        to_sen_column([row[3].value for row in rows]),
+                        to_sen_column([row[4].value for row in rows]))
+                    stored = to_sen_column([row[5].value for row in rows])
+                    for i in np.flatnonzero(stored != balances):
+                        rows[i][5].value = from_sen(balances[i])
+                        saldo_updated = True
+        
+                # Simpan jika ada perubahan
+                if saldo_updated:
+                    save_journal_workbook(wb)
+                    st.success("✅ Saldo berhasil dihitung ulang secara otomatis!")
+        
+                wb.close()
+            check['mtime'] = os.path.getmtime(journal_file())
+        
+        ledger = load_ledger_index()
+        
+        if not ledger['df'].empty:
+            # Pencarian full-text: baris Buku Besar dari transaksi yang cocok (tanggal + keterangan)
+            results = show_journal_search('buku_besar')
+            if results is not None and not results.empty:
+                pairs = results[['tanggal', 'keterangan']].drop_duplicates()
+                matched = ledger['df'].merge(pairs.rename(columns={'tanggal': 'Tanggal', 'keterangan': 'Keterangan'}),
+                                             on=['Tanggal', 'Keterangan'])
+                st.dataframe(matched.sort_values('row')[['Tanggal', 'Akun', 'Keterangan', 'Debit', 'Kredit', 'Saldo']],
+                             use_container_width=True, hide_index=True,
+                             column_config=rupiah_columns('Debit', 'Kredit', 'Saldo'))
+                st.markdown("---")
+            
+            # Indeks akun: hanya daftar akun dan saldo akhir; buku besar akun dimuat saat dipilih
+            balances = load_ledger_balances().sort_values('account_num').reset_index(drop=True)
+            accounts = balances['account'].tolist()
+            credit_normal = balances['account_num'].str.startswith(('2', '3', '4')).to_numpy()  # Liability, Equity, Revenue
+            ending_sen = np.where(credit_normal, balances['saldo_sen'].abs(), balances['saldo_sen'])
+            
+            st.markdown("### 🗂️ Daftar Akun")
+            st.dataframe(
+                pd.DataFrame({
+                    'No Akun': balances['account_num'],
+                    'Nama Akun': balances['account_name'],
+                    'Jumlah Baris': [len(ledger['keys']['Akun'].get(account, ())) for account in accounts],
+                    'Saldo Akhir': ending_sen / 100,
+                    'Saldo Normal': np.where(credit_normal, 'Kredit', 'Debit'),
+                }),
+                use_container_width=True, hide_index=True, key="buku_besar_index",
+                on_select=lambda: _select_ledger_account(accounts), selection_mode="single-row",
+                column_config=rupiah_columns('Saldo Akhir')
+            )
+            st.caption("Klik baris akun untuk membuka buku besarnya")
+            
+            options = ["Semua Akun"] + accounts
+            if st.session_state.get('buku_besar_akun') not in options:
+                st.session_state.pop('buku_besar_akun', None)
+            selected_account = st.selectbox("Akun", options, index=None, key="buku_besar_akun",
+                                            placeholder="Pilih akun untuk melihat buku besar")
+            
+            if selected_account:
+                account = None if selected_account == "Semua Akun" else selected_account
+                st.markdown(f"### {selected_account}")
+                
+                # Filter tanggal dan paginasi di server, hanya satu halaman yang dirender
+                show_paged_grid('buku_besar', ledger, fixed_filters={'Akun': account},
+                                display_columns=['Tanggal', 'Akun', 'Keterangan', 'Debit', 'Kredit', 'Saldo'],
+                                column_config=rupiah_columns('Debit', 'Kredit', 'Saldo'))
+                
+                if account:
+                    position = accounts.index(account)
+                    saldo_type = "Kredit" if credit_normal[position] else "Debit"
+                    
+                    st.markdown(f"""
+                    <div style="background: #10b981; color: white; padding: 0.5rem 1rem; border-radius: 5px; margin-bottom: 1rem;">
+                        <strong>Saldo Akhir: {format_rupiah(from_sen(ending_sen[position]))} ({saldo_type})</strong>
+                    </div>
+                    """, unsafe_allow_html=True)
+        else:
+            st.info("Belum ada data buku besar. Silakan input transaksi di menu Jurnal Umum terlebih dahulu.")
+    
+    except Exception as e:
+        st.error(f"Error: {e}")
+
+    # Tombol untuk reset data buku besar saja
+    st.markdown("---")
+    if st.button("🗑️ Reset Data Buku Besar", type="secondary", use_container_width=True):
+        try:
+            wb = Workbook()
+            ws_journal = wb.active
+            ws_journal.title = "Jurnal Umum"
+            ws_journal.append(JOURNAL_HEADER)
+            
+            ws_ledger = wb.create_sheet("Buku Besar")
+            ws_ledger.append(["Akun", "Tanggal", "Keterangan", "Debit", "Kredit", "Saldo"])
+            
+            with write_lock():
+                save_journal_workbook(wb)
+            st.success("Data buku besar berhasil direset!")
+            st.rerun()
+        except Exception as e:
+            st.error(f"Error: {e}")
+
+def show_neraca_saldo():
+    st.markdown('<div class="main-header"><h1>⚖️ Neraca Saldo</h1></div>', unsafe_allow_html=True)
+    
+    try:
+        # Saldo terakhir per akun (sen): positif -> Debit, negatif -> Kredit
+        balances = load_ledger_balances()
+        debit_sen = balances['saldo_sen'].clip(lower=0).to_numpy()
+        kredit_sen = (-balances['saldo_sen']).clip(lower=0).to_numpy()
+        total_debit_sen = int(debit_sen.sum())
+        total_kredit_sen = int(kredit_sen.sum())
+        total_debit = from_sen(total_debit_sen)
+        total_kredit = from_sen(total_kredit_sen)
+        
+        df = pd.DataFrame({
+            'Akun': balances['account'],
+            'No Akun': balances['account_num'],
+            'Nama Akun': balances['account_name'],
+            'Debit': np.where(debit_sen > 0, debit_sen / 100, np.nan),
+            'Kredit': np.where(kredit_sen > 0, kredit_sen / 100, np.nan),
+        }).sort_values('No Akun').reset_index(drop=True)
+        
+        if not df.empty:
+            # Tampilkan dataframe dengan kolom sesuai permintaan; klik baris -> buku besar akun tersebut
+            selection = st.dataframe(
+                df[['No Akun', 'Nama Akun', 'Debit', 'Kredit']],
+                use_container_width=True,
+                hide_index=True,
+                key="neraca_saldo_table",
+                on_select="rerun",
+                selection_mode="single-row",
+                column_config={
+                    "No Akun": st.column_config.TextColumn("No Akun", width="small"),
+                    "Nama Akun": st.column_config.TextColumn("Nama Akun", width="medium"),
+                    "Debit": st.column_config.NumberColumn("Debit", width="medium", format="localized"),
+                    "Kredit": st.column_config.NumberColumn("Kredit", width="medium", format="localized")
+                }
+            )
+            st.caption("Klik baris akun untuk membuka buku besarnya")
+            if selection.selection.rows:
+                open_ledger_account(df['Akun'].iloc[selection.selection.rows[0]])
+            
+            # Total row dengan layout yang lebih baik
+            st.markdown("---")
+            col1, col2, col3, col4 = st.columns([2, 2, 1, 1])
+            with col1:
+                st.markdown("**TOTAL**")
+            with col2:
+                st.markdown("")  # Spacer untuk Nama Akun
+            with col3:
+                st.markdown(f"**{format_rupiah(total_debit)}**")
+            with col4:
+                st.markdown(f"**{format_rupiah(total_kredit)}**")
+            
+            # Balance check
+            is_balanced = total_debit_sen == total_kredit_sen
+            st.markdown("---")
+            if is_balanced:
+                st.success("✅ NERACA SALDO SEIMBANG")
+            else:
+                st.error(f"❌ NERACA SALDO TIDAK SEIMBANG - Selisih: {format_rupiah(from_sen(abs(total_debit_sen - total_kredit_sen)))}")
+        else:
+            st.info("Belum ada data neraca saldo. Silakan input transaksi di menu Jurnal Umum terlebih dahulu.")
+    
+    except Exception as e:
+        st.error(f"Error: {e}")
+
+def show_jurnal_penyesuaian():
+    st.markdown('<div class="main-header"><h1>📘 Input Jurnal Penyesuaian</h1></div>', unsafe_allow_html=True)
+    create_journal_workbook() 
+    
+    st.markdown("### Input Jurnal Penyesuaian Baru")
+    journal_entry_editor('penyesuaian')
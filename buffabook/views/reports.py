@@ -0,0 +1,686 @@
+"""Halaman laporan keuangan"""
+import streamlit as st
+import pandas as pd
+
+from buffabook.auth import is_head_office, tenant_owners
+from buffabook.tenant import LEGACY_TENANT, journal_file, list_tenants
+from buffabook.navigation import open_page
+from buffabook.values import format_rupiah, from_sen, rupiah_columns
+from buffabook.accounting import ledger_balance_dict, load_ledger_balances, statement_totals_sen
+from buffabook.consolidation import consolidate
+from buffabook.widgets import show_ledger_drilldown
+
+
+def show_laporan_keuangan():
+    st.markdown('<div class="main-header"><h1>📋 Laporan Keuangan</h1></div>', unsafe_allow_html=True)
+    
+    st.markdown("### Pilih Jenis Laporan")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        if st.button("📊 Laporan Laba Rugi", use_container_width=True):
+            open_page("Laba Rugi")
+    
+    with col2:
+        if st.button("📈 Laporan Perubahan Modal", use_container_width=True):
+            open_page("Perubahan Modal")
+    
+    with col3:
+        if st.button("💰 Laporan Posisi Keuangan", use_container_width=True):
+            open_page("Posisi Keuangan")
+
+def show_laba_rugi():
+    st.markdown('<div class="main-header"><h1>📊 Laporan Laba Rugi</h1></div>', unsafe_allow_html=True)
+    
+    if st.button("← Kembali ke Laporan Keuangan"):
+        open_page("Laporan Keuangan")
+    
+    try:
+        # Saldo terakhir per akun; total tiap kelompok dijumlah eksak dalam sen (int64)
+        balances = load_ledger_balances()
+        account_balances = ledger_balance_dict(balances)
+        totals = statement_totals_sen(balances)
+        
+        # Kelompokkan akun berdasarkan kategori
+        pendapatan_akun = []
+        hpp_akun = []
+        beban_akun = []
+        
+        for account, data in account_balances.items():
+            account_num = data['account_num']
+            saldo = data['latest_saldo']
+            
+            # Ambil kode utama (angka sebelum - atau spasi)
+            if '-' in account_num:
+                main_code = account_num.split('-')[0].strip()
+            elif ' ' in account_num:
+                main_code = account_num.split()[0].strip()
+            else:
+                main_code = account_num
+            
+            # Klasifikasi akun berdasarkan kode
+            if main_code.startswith('4'):  # Pendapatan
+                pendapatan_akun.append({
+                    'nama': data['account_name'],
+                    'nominal': abs(saldo)  # Untuk akun pendapatan, ambil nilai absolut
+                })
+            elif main_code.startswith('5'):  # HPP
+                hpp_akun.append({
+                    'nama': data['account_name'],
+                    'nominal': abs(saldo)  # Untuk akun HPP, ambil nilai absolut
+                })
+            elif main_code.startswith('6'):  # Beban
+                beban_akun.append({
+                    'nama': data['account_name'],
+                    'nominal': abs(saldo)  # Untuk akun beban, ambil nilai absolut
+                })
+        
+        # Hitung total masing-masing kategori (dari total sen yang eksak)
+        total_pendapatan = from_sen(totals['pendapatan'])
+        total_hpp = from_sen(totals['hpp'])
+        total_beban = from_sen(totals['beban'])
+        
+        # Hitung laba kotor dan laba bersih
+        laba_kotor = from_sen(totals['pendapatan'] - totals['hpp'])
+        laba_bersih = from_sen(totals['pendapatan'] - totals['hpp'] - totals['beban'])
+        
+        # Tampilkan Laporan Laba Rugi
+        st.markdown("### A. Pendapatan Usaha")
+        
+        if pendapatan_akun:
+            for akun in pendapatan_akun:
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.write(akun['nama'])
+                with col2:
+                    st.write(format_rupiah(akun['nominal']))
+        else:
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.write("Pendapatan")
+            with col2:
+                st.write(format_rupiah(0))
+        
+        st.markdown("---")
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown("**Total Pendapatan**")
+        with col2:
+            st.markdown(f"**{format_rupiah(total_pendapatan)}**")
+        
+        st.markdown("### B. Harga Pokok Penjualan (HPP)")
+        
+        if hpp_akun:
+            for akun in hpp_akun:
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.write(akun['nama'])
+                with col2:
+                    st.write(format_rupiah(akun['nominal']))
+        else:
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.write("Harga Pokok Penjualan")
+            with col2:
+                st.write(format_rupiah(0))
+        
+        st.markdown("---")
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown("**Total HPP**")
+        with col2:
+            st.markdown(f"**{format_rupiah(total_hpp)}**")
+        
+        st.markdown("---")
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown("**Laba Kotor**")
+        with col2:
+            laba_kotor_color = "green" if laba_kotor >= 0 else "red"
+            st.markdown(f"<span style='color: {laba_kotor_color}; font-weight: bold;'>{format_rupiah(laba_kotor)}</span>", unsafe_allow_html=True)
+        
+        st.markdown("### C. Beban Usaha")
+        
+        if beban_akun:
+            for akun in beban_akun:
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.write(akun['nama'])
+                with col2:
+                    st.write(format_rupiah(akun['nominal']))
+        else:
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.write("Beban Usaha")
+            with col2:
+                st.write(format_rupiah(0))
+        
+        st.markdown("---")
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown("**Total Beban**")
+        with col2:
+            st.markdown(f"**{format_rupiah(total_beban)}**")
+        
+        # Hasil Akhir
+        st.markdown("---")
+        laba_bersih_color = "green" if laba_bersih >= 0 else "red"
+        st.markdown(f"""
+        <div style="background: {laba_bersih_color}; color: white; padding: 1.5rem; border-radius: 10px; text-align: center; margin-top: 2rem;">
+            <h2>Laba Bersih Sebelum Pajak</h2>
+            <h1>{format_rupiah(laba_bersih)}</h1>
+            <p>{'Perusahaan mengalami laba' if laba_bersih >= 0 else 'Perusahaan mengalami rugi'}</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        show_ledger_drilldown(balances, ('4', '5', '6'), 'laba_rugi')
+    
+    except Exception as e:
+        st.error(f"Error: {e}")
+
+def show_perubahan_modal():
+    st.markdown('<div class="main-header"><h1>📈 Laporan Perubahan Modal</h1></div>', unsafe_allow_html=True)
+    
+    if st.button("← Kembali ke Laporan Keuangan"):
+        open_page("Laporan Keuangan")
+    
+    try:
+        # Saldo terakhir per akun; total tiap kelompok dijumlah eksak dalam sen (int64)
+        balances = load_ledger_balances()
+        totals = statement_totals_sen(balances)
+        
+        # Modal Awal (3-30000), Prive (3-40000), dan Laba Bersih dari Laporan Laba Rugi
+        laba_bersih_sen = totals['pendapatan'] - totals['hpp'] - totals['beban']
+        modal_awal = from_sen(totals['modal_awal'])
+        prive = from_sen(totals['prive'])
+        laba_bersih = from_sen(laba_bersih_sen)
+        
+        # Hitung Modal Akhir
+        modal_akhir = from_sen(totals['modal_awal'] + laba_bersih_sen - totals['prive'])
+        
+        # Tampilkan Laporan Perubahan Modal
+        st.markdown("### Laporan Perubahan Modal")
+        
+        # Modal Awal
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.write("Modal Awal")
+        with col2:
+            st.write(format_rupiah(modal_awal))
+        
+        # Laba/Rugi Bersih
+        laba_color = "green" if laba_bersih >= 0 else "red"
+        laba_text = "Laba Bersih" if laba_bersih >= 0 else "Rugi Bersih"
+        
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown(f"**{laba_text}**")
+        with col2:
+            st.markdown(f"<span style='color: {laba_color}'>{format_rupiah(abs(laba_bersih))}</span>", unsafe_allow_html=True)
+        
+        # Prive
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown("**Prive**")
+        with col2:
+            st.markdown(f"<span style='color: red'>({format_rupiah(prive)})</span>", unsafe_allow_html=True)
+        
+        st.markdown("---")
+        
+        # Modal Akhir
+        modal_color = "green" if modal_akhir >= 0 else "red"
+        st.markdown(f"""
+        <div style="background: {modal_color}; color: white; padding: 1.5rem; border-radius: 10px; text-align: center; margin-top: 1rem;">
+            <h2>Modal Akhir</h2>
+            <h1>{format_rupiah(modal_akhir)}</h1>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        show_ledger_drilldown(balances, ('3',), 'perubahan_modal')
+        
+    except Exception as e:
+        st.error(f"Error: {e}")
+
+def show_neraca():
+    st.markdown('<div class="main-header"><h1>📋 Laporan Posisi Keuangan (Neraca)</h1></div>', unsafe_allow_html=True)
+    
+    if st.button("← Kembali ke Laporan Keuangan"):
+        open_page("Laporan Keuangan")
+    
+    try:
+        def is_accumulation_account(account_name):
+            """Cek apakah akun termasuk akun akumulasi"""
+            if not account_name:
+                return False
+            accumulation_keywords = ['akumulasi', 'accumulation', 'penyusutan', 'depreciation']
+            account_lower = str(account_name).lower()
+            return any(keyword in account_lower for keyword in accumulation_keywords)
+        
+        # Saldo terakhir per akun; total tiap kelompok dijumlah eksak dalam sen (int64)
+        balances = load_ledger_balances()
+        account_balances = ledger_balance_dict(balances)
+        totals = statement_totals_sen(balances)
+        
+        # Hitung Modal Akhir (sama seperti Laporan Perubahan Modal), dalam sen
+        laba_bersih_sen = totals['pendapatan'] - totals['hpp'] - totals['beban']
+        modal_akhir_sen = totals['modal_awal'] + laba_bersih_sen - totals['prive']
+        modal_akhir = from_sen(modal_akhir_sen)
+        
+        # PERBAIKAN: Kelompokkan akun dengan handling akumulasi penyusutan yang benar
+        aset_lancar = []
+        aset_tetap_bruto = []      
+        akumulasi_penyusutan = []  
+        liabilitas_pendek = []
+        liabilitas_panjang = []
+        
+        for account, data in account_balances.items():
+            account_num = data['account_num']
+            saldo = data['latest_saldo']
+            nominal = abs(saldo)
+            
+            # Klasifikasi berdasarkan kode akun
+            if account_num.startswith('1-1') or account_num.startswith('11'):  # Aset Lancar
+                aset_lancar.append({
+                    'nama': data['account_name'],
+                    'nominal': nominal
+                })
+            elif account_num.startswith('1-2') or account_num.startswith('12'):  # Aset Tetap Bruto
+                # Pisahkan antara aset tetap dan akumulasi penyusutan
+                if is_accumulation_account(data['account_name']):
+                    akumulasi_penyusutan.append({
+                        'nama': data['account_name'],
+                        'nominal': nominal
+                    })
+                else:
+                    aset_tetap_bruto.append({
+                        'nama': data['account_name'],
+                        'nominal': nominal
+                    })
+            elif account_num.startswith('2-1') or account_num.startswith('21'):  # Liabilitas Jangka Pendek
+                liabilitas_pendek.append({
+                    'nama': data['account_name'],
+                    'nominal': nominal
+                })
+            elif account_num.startswith('2-2') or account_num.startswith('22'):  # Liabilitas Jangka Panjang
+                liabilitas_panjang.append({
+                    'nama': data['account_name'],
+                    'nominal': nominal
+                })
+        
+        # PERBAIKAN: Hitung aset tetap NETO (Bruto - Akumulasi Penyusutan), semua dalam sen
+        aset_tetap_neto_sen = totals['aset_tetap_bruto'] - totals['akumulasi_penyusutan']
+        total_aset_sen = totals['aset_lancar'] + aset_tetap_neto_sen
+        total_liabilitas_sen = totals['liabilitas_pendek'] + totals['liabilitas_panjang']
+        total_liabilitas_ekuitas_sen = total_liabilitas_sen + modal_akhir_sen
+        
+        subtotal_aset_lancar = from_sen(totals['aset_lancar'])
+        subtotal_aset_tetap_bruto = from_sen(totals['aset_tetap_bruto'])
+        total_akumulasi_penyusutan = from_sen(totals['akumulasi_penyusutan'])
+        subtotal_aset_tetap_neto = from_sen(aset_tetap_neto_sen)
+        
+        # Total Aset = Aset Lancar + Aset Tetap Neto
+        total_aset = from_sen(total_aset_sen)
+        
+        subtotal_liabilitas_pendek = from_sen(totals['liabilitas_pendek'])
+        subtotal_liabilitas_panjang = from_sen(totals['liabilitas_panjang'])
+        total_liabilitas = from_sen(total_liabilitas_sen)
+        
+        total_ekuitas = modal_akhir
+        total_liabilitas_ekuitas = from_sen(total_liabilitas_ekuitas_sen)
+        
+        # Tampilkan Laporan Posisi Keuangan dengan format yang benar
+        st.markdown("""
+        <style>
+        .neraca-container {
+            display: flex;
+            justify-content: space-between;
+            gap: 2rem;
+        }
+        .neraca-column {
+            flex: 1;
+            background: white;
+            padding: 1.5rem;
+            border-radius: 10px;
+            border: 1px solid #e2e8f0;
+        }
+        .neraca-header {
+            text-align: center;
+            font-weight: bold;
+            font-size: 1.2rem;
+            margin-bottom: 1.5rem;
+            padding-bottom: 0.5rem;
+            border-bottom: 2px solid #DDB27A;
+        }
+        .neraca-item {
+            display: flex;
+            justify-content: space-between;
+            padding: 0.5rem 0;
+            border-bottom: 1px solid #f1f5f9;
+        }
+        .neraca-subtotal {
+            display: flex;
+            justify-content: space-between;
+            font-weight: bold;
+            padding: 0.75rem 0;
+            border-top: 2px solid #e2e8f0;
+            border-bottom: 2px solid #e2e8f0;
+            margin: 0.5rem 0;
+        }
+        .neraca-total {
+            display: flex;
+            justify-content: space-between;
+            font-weight: bold;
+            font-size: 1.1rem;
+            padding: 1rem 0;
+            border-top: 3px double #DDB27A;
+            border-bottom: 3px double #DDB27A;
+            margin: 1rem 0;
+            background: #FDF3B9;
+        }
+        .neraca-group {
+            margin-bottom: 1.5rem;
+        }
+        .group-title {
+            font-weight: bold;
+            color: #475569;
+            margin-bottom: 0.5rem;
+            padding-left: 0.5rem;
+            border-left: 3px solid #DDB27A;
+        }
+        .akumulasi-item {
+            display: flex;
+            justify-content: space-between;
+            padding: 0.5rem 0;
+            border-bottom: 1px solid #f1f5f9;
+            color: #666;
+            font-style: italic;
+            padding-left: 1rem;
+        }
+        </style>
+        """, unsafe_allow_html=True)
+        
+        # Container utama untuk dua kolom
+        st.markdown('<div class="neraca-container">', unsafe_allow_html=True)
+        
+        # KOLOM KIRI - ASET
+        st.markdown('<div class="neraca-column">', unsafe_allow_html=True)
+        st.markdown('<div class="neraca-header">ASET</div>', unsafe_allow_html=True)
+        
+        # Aset Lancar
+        st.markdown('<div class="neraca-group">', unsafe_allow_html=True)
+        st.markdown('<div class="group-title">Aset Lancar</div>', unsafe_allow_html=True)
+        
+        if aset_lancar:
+            for akun in aset_lancar:
+                st.markdown(f"""
+                <div class="neraca-item">
+                    <span>{akun['nama']}</span>
+                    <span>{format_rupiah(akun['nominal'])}</span>
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.markdown("""
+            <div class="neraca-item">
+                <span>Tidak ada aset lancar</span>
+                <span>-</span>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Subtotal Aset Lancar
+        st.markdown(f"""
+        <div class="neraca-subtotal">
+            <span>Subtotal Aset Lancar</span>
+            <span>{format_rupiah(subtotal_aset_lancar)}</span>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Aset Tetap - PERBAIKAN: Tampilkan Bruto, Akumulasi, dan Neto
+        st.markdown('<div class="neraca-group">', unsafe_allow_html=True)
+        st.markdown('<div class="group-title">Aset Tetap</div>', unsafe_allow_html=True)
+        
+        if aset_tetap_bruto:
+            for akun in aset_tetap_bruto:
+                st.markdown(f"""
+                <div class="neraca-item">
+                    <span>{akun['nama']}</span>
+                    <span>{format_rupiah(akun['nominal'])}</span>
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.markdown("""
+            <div class="neraca-item">
+                <span>Tidak ada aset tetap</span>
+                <span>-</span>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Tampilkan Akumulasi Penyusutan sebagai pengurang
+        if akumulasi_penyusutan:
+            st.markdown('<div style="margin-top: 0.5rem;">', unsafe_allow_html=True)
+            for akun in akumulasi_penyusutan:
+                st.markdown(f"""
+                <div class="akumulasi-item">
+                    <span>{akun['nama']}</span>
+                    <span>({format_rupiah(akun['nominal'])})</span>
+                </div>
+                """, unsafe_allow_html=True)
+            st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Subtotal Aset Tetap Bruto
+        st.markdown(f"""
+        <div class="neraca-subtotal">
+            <span>Aset Tetap Bruto</span>
+            <span>{format_rupiah(subtotal_aset_tetap_bruto)}</span>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Akumulasi Penyusutan
+        if akumulasi_penyusutan:
+            st.markdown(f"""
+            <div class="neraca-item">
+                <span>Akumulasi Penyusutan</span>
+                <span>({format_rupiah(total_akumulasi_penyusutan)})</span>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Subtotal Aset Tetap Neto
+        st.markdown(f"""
+        <div class="neraca-subtotal">
+            <span>Aset Tetap Neto</span>
+            <span>{format_rupiah(subtotal_aset_tetap_neto)}</span>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Total Aset
+        st.markdown(f"""
+        <div class="neraca-total">
+            <span>TOTAL ASET</span>
+            <span>{format_rupiah(total_aset)}</span>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)  # Tutup kolom aset
+        
+        # KOLOM KANAN - LIABILITAS & EKUITAS
+        st.markdown('<div class="neraca-column">', unsafe_allow_html=True)
+        st.markdown('<div class="neraca-header">LIABILITAS & EKUITAS</div>', unsafe_allow_html=True)
+        
+        # Liabilitas Jangka Pendek
+        st.markdown('<div class="neraca-group">', unsafe_allow_html=True)
+        st.markdown('<div class="group-title">Liabilitas Jangka Pendek</div>', unsafe_allow_html=True)
+        
+        if liabilitas_pendek:
+            for akun in liabilitas_pendek:
+                st.markdown(f"""
+                <div class="neraca-item">
+                    <span>{akun['nama']}</span>
+                    <span>{format_rupiah(akun['nominal'])}</span>
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.markdown("""
+            <div class="neraca-item">
+                <span>Tidak ada liabilitas jangka pendek</span>
+                <span>-</span>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Subtotal Liabilitas Jangka Pendek
+        st.markdown(f"""
+        <div class="neraca-subtotal">
+            <span>Subtotal Liabilitas Jangka Pendek</span>
+            <span>{format_rupiah(subtotal_liabilitas_pendek)}</span>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Liabilitas Jangka Panjang
+        st.markdown('<div class="neraca-group">', unsafe_allow_html=True)
+        st.markdown('<div class="group-title">Liabilitas Jangka Panjang</div>', unsafe_allow_html=True)
+        
+        if liabilitas_panjang:
+            for akun in liabilitas_panjang:
+                st.markdown(f"""
+                <div class="neraca-item">
+                    <span>{akun['nama']}</span>
+                    <span>{format_rupiah(akun['nominal'])}</span>
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.markdown("""
+            <div class="neraca-item">
+                <span>Tidak ada liabilitas jangka panjang</span>
+                <span>-</span>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Subtotal Liabilitas Jangka Panjang
+        st.markdown(f"""
+        <div class="neraca-subtotal">
+            <span>Subtotal Liabilitas Jangka Panjang</span>
+            <span>{format_rupiah(subtotal_liabilitas_panjang)}</span>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Total Liabilitas
+        st.markdown(f"""
+        <div class="neraca-subtotal">
+            <span>Total Liabilitas</span>
+            <span>{format_rupiah(total_liabilitas)}</span>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Ekuitas
+        st.markdown('<div class="neraca-group">', unsafe_allow_html=True)
+        st.markdown('<div class="group-title">Ekuitas</div>', unsafe_allow_html=True)
+        
+        st.markdown(f"""
+        <div class="neraca-item">
+            <span>Modal Akhir</span>
+            <span>{format_rupiah(modal_akhir)}</span>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Subtotal Ekuitas
+        st.markdown(f"""
+        <div class="neraca-subtotal">
+            <span>Total Ekuitas</span>
+            <span>{format_rupiah(total_ekuitas)}</span>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Total Liabilitas & Ekuitas
+        st.markdown(f"""
+        <div class="neraca-total">
+            <span>TOTAL LIABILITAS & EKUITAS</span>
+            <span>{format_rupiah(total_liabilitas_ekuitas)}</span>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)  # Tutup kolom liabilitas & ekuitas
+        st.markdown('</div>', unsafe_allow_html=True)  # Tutup container utama
+        
+        # Balance Check
+        is_balanced = total_aset_sen == total_liabilitas_ekuitas_sen
+        st.markdown("---")
+        if is_balanced:
+            st.success("✅ NERACA SEIMBANG - Total Aset = Total Liabilitas & Ekuitas")
+        else:
+            st.error(f"❌ NERACA TIDAK SEIMBANG - Selisih: {format_rupiah(from_sen(abs(total_aset_sen - total_liabilitas_ekuitas_sen)))}")
+            
+            # Debug info untuk membantu troubleshooting
+            st.warning("🔍 **Debug Info:**")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write(f"Total Aset: {format_rupiah(total_aset)}")
+                st.write(f"- Aset Lancar: {format_rupiah(subtotal_aset_lancar)}")
+                st.write(f"- Aset Tetap Bruto: {format_rupiah(subtotal_aset_tetap_bruto)}")
+                st.write(f"- Akumulasi Penyusutan: {format_rupiah(total_akumulasi_penyusutan)}")
+                st.write(f"- Aset Tetap Neto: {format_rupiah(subtotal_aset_tetap_neto)}")
+            with col2:
+                st.write(f"Total Liabilitas & Ekuitas: {format_rupiah(total_liabilitas_ekuitas)}")
+                st.write(f"- Liabilitas: {format_rupiah(total_liabilitas)}")
+                st.write(f"- Ekuitas: {format_rupiah(total_ekuitas)}")
+        
+        show_ledger_drilldown(balances, ('1', '2', '3'), 'neraca')
+    
+    except Exception as e:
+        st.error(f"Error: {e}")
+
+def _statement_summary_sen(totals):
+    """Angka utama laporan (sen) dari statement_totals_sen: laba rugi dan posisi keuangan"""
+    laba_bersih = totals['pendapatan'] - totals['hpp'] - totals['beban']
+    return {
+        'Pendapatan': totals['pendapatan'],
+        'HPP': totals['hpp'],
+        'Beban': totals['beban'],
+        'Laba Bersih': laba_bersih,
+        'Total Aset': totals['aset_lancar'] + totals['aset_tetap_bruto'] - totals['akumulasi_penyusutan'],
+        'Total Liabilitas': totals['liabilitas_pendek'] + totals['liabilitas_panjang'],
+        'Modal Akhir': totals['modal_awal'] + laba_bersih - totals['prive'],
+    }
+
+def show_konsolidasi():
+    st.markdown('<div class="main-header"><h1>🏢 Laporan Keuangan Konsolidasi</h1></div>', unsafe_allow_html=True)
+    
+    if not is_head_office():
+        st.warning("⚠️ Laporan konsolidasi hanya tersedia untuk akun kantor pusat.")
+        return
+    
+    tenants = list_tenants()
+    owners = tenant_owners()
+    labels = {tenant: "Kantor Pusat" if tenant == LEGACY_TENANT else owners.get(tenant, tenant) for tenant in tenants}
+    selected = st.multiselect("Farm", tenants, default=tenants, format_func=labels.get, key="konsolidasi_farm")
+    if not selected:
+        st.info("Pilih minimal satu farm untuk dikonsolidasi.")
+        return
+    
+    try:
+        # Neraca saldo tiap farm dihitung paralel; penjumlahan per akun vectorized
+        balances, by_entity = consolidate({labels[tenant]: journal_file(tenant) for tenant in selected})
+        
+        summary = pd.DataFrame({
+            name: _statement_summary_sen(statement_totals_sen(balances.assign(saldo_sen=by_entity[name].values)))
+            for name in by_entity.columns
+        }).T
+        summary.loc['Konsolidasi'] = _statement_summary_sen(statement_totals_sen(balances))
+        
+        total = summary.loc['Konsolidasi']
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Pendapatan", format_rupiah(from_sen(total['Pendapatan'])))
+        col2.metric("Laba Bersih", format_rupiah(from_sen(total['Laba Bersih'])))
+        col3.metric("Total Aset", format_rupiah(from_sen(total['Total Aset'])))
+        col4.metric("Modal Akhir", format_rupiah(from_sen(total['Modal Akhir'])))
+        
+        st.markdown("### Ringkasan per Farm")
+        st.dataframe((summary / 100).rename_axis('Farm'), use_container_width=True,
+                     column_config=rupiah_columns(*summary.columns))
+        
+        st.markdown("### Neraca Saldo Konsolidasi")
+        trial_balance = (by_entity / 100).assign(Konsolidasi=balances['saldo_sen'].values / 100)
+        trial_balance.insert(0, 'Nama Akun', balances['account_name'].values)
+        st.dataframe(trial_balance.rename_axis('No Akun'), use_container_width=True,
+                     column_config=rupiah_columns(*by_entity.columns, 'Konsolidasi'))
+    
+    except Exception as e:
+        st.error(f"Error: {e}")
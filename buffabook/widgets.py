@@ -0,0 +1,109 @@
+"""Komponen UI bersama: grid berhalaman, picker pencarian, drill-down buku besar"""
+import streamlit as st
+import numpy as np
+
+from buffabook.navigation import open_page
+from buffabook.accounting import search_journal
+from buffabook.queries import PAGE_SIZE_OPTIONS, SEARCH_RESULT_LIMIT, query_page, search_positions
+
+
+def show_journal_search(key):
+    """Kotak pencarian transaksi jurnal. Return hasil (DataFrame) atau None jika kosong"""
+    query = st.text_input("🔎 Cari Transaksi", key=f"{key}_fts",
+                          placeholder="Kata di keterangan, nama akun atau produk (misal: jual dewasa)")
+    if not query.strip():
+        return None
+    results = search_journal(query)
+    if results.empty:
+        st.info("🔍 Tidak ada transaksi yang cocok")
+    else:
+        st.caption(f"{len(results)} transaksi cocok (maksimal 50, urut relevansi)")
+    return results
+
+def show_paged_grid(key, index, filter_columns=(), fixed_filters=None, display_columns=None, column_config=None):
+    """Grid dengan filter tanggal/kolom, urutan dan paginasi; hanya halaman aktif yang dikirim ke browser.
+    Return (DataFrame halaman, jumlah baris yang cocok)"""
+    display_columns = display_columns or [c for c in index['df'].columns if c != 'row']
+    
+    cols = st.columns(2 + len(filter_columns))
+    with cols[0]:
+        date_from = st.date_input("Dari Tanggal", value=None, key=f"{key}_from")
+    with cols[1]:
+        date_to = st.date_input("Sampai Tanggal", value=None, key=f"{key}_to")
+    filters = dict(fixed_filters or {})
+    for col, column in zip(cols[2:], filter_columns):
+        with col:
+            choice = st.selectbox(column, ["Semua"] + sorted(index['keys'][column], key=str), key=f"{key}_{column}")
+            filters[column] = None if choice == "Semua" else choice
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        sort_by = st.selectbox("Urutkan", display_columns, index=display_columns.index(index['date_col']),
+                               key=f"{key}_sort")
+    with col2:
+        descending = st.radio("Arah", ["Terbaru/Terbesar", "Terlama/Terkecil"], horizontal=True,
+                              key=f"{key}_order") == "Terbaru/Terbesar"
+    with col3:
+        page_size = st.selectbox("Baris per Halaman", PAGE_SIZE_OPTIONS, index=1, key=f"{key}_size")
+    
+    date_from = date_from.strftime('%Y-%m-%d') if date_from else None
+    date_to = date_to.strftime('%Y-%m-%d') if date_to else None
+    
+    # Filter/urutan berubah -> kembali ke halaman 1
+    signature = (date_from, date_to, tuple(sorted(filters.items(), key=str)), sort_by, descending, page_size)
+    if st.session_state.get(f"{key}_signature") != signature:
+        st.session_state[f"{key}_signature"] = signature
+        st.session_state[f"{key}_page"] = 1
+    
+    _, total = query_page(index, date_from, date_to, filters, limit=0)
+    pages = max(1, -(-total // page_size))
+    st.session_state[f"{key}_page"] = min(st.session_state.get(f"{key}_page", 1), pages)
+    page = st.number_input(f"Halaman (dari {pages})", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+    
+    offset = (page - 1) * page_size
+    rows, total = query_page(index, date_from, date_to, filters, sort_by, descending, offset, page_size)
+    st.dataframe(rows[display_columns], use_container_width=True, hide_index=True, column_config=column_config)
+    if total:
+        st.caption(f"Menampilkan {offset + 1}–{offset + len(rows)} dari {total} baris")
+    else:
+        st.caption("Tidak ada baris yang cocok dengan filter")
+    return rows, total
+
+def show_search_picker(label, key, frame, search, make_label, within=None, limit=SEARCH_RESULT_LIMIT):
+    """Picker transaksi: cari lewat indeks, hanya top-N hasil yang dikirim ke browser.
+    Return baris terpilih (dict) atau None"""
+    query = st.text_input(f"🔍 Cari {label}", key=f"{key}_query",
+                          placeholder="Ketik tanggal, produk, jumlah, nominal atau keterangan")
+    if query.strip():
+        positions = search_positions(search, query, within, limit)
+    else:
+        positions = (np.arange(len(frame)) if within is None else within)[-limit:][::-1]
+    
+    if not len(positions):
+        st.info("🔍 Tidak ada transaksi yang cocok")
+        return None
+    
+    matches = frame.iloc[positions].to_dict('records')
+    choice = st.selectbox(f"Pilih {label} yang akan dihapus:", range(len(matches)),
+                          format_func=lambda i: make_label(matches[i]), key=f"{key}_choice")
+    st.caption(f"Menampilkan {len(matches)} transaksi terbaru yang cocok; persempit kata kunci untuk transaksi lain")
+    return matches[choice]
+
+def open_ledger_account(account):
+    """Drill-down: buka Buku Besar langsung pada satu akun"""
+    st.session_state['buku_besar_akun'] = account
+    open_page("Buku Besar")
+
+def show_ledger_drilldown(balances, code_prefixes, key):
+    """Pilihan akun laporan untuk membuka buku besarnya"""
+    accounts = balances.loc[balances['account_num'].str.startswith(code_prefixes), 'account'].tolist()
+    if not accounts:
+        return
+    st.markdown("---")
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        account = st.selectbox("🔎 Rincian akun di Buku Besar", sorted(accounts), key=f"{key}_drilldown")
+    with col2:
+        st.markdown("<br>", unsafe_allow_html=True)
+        if st.button("📚 Lihat Buku Besar", key=f"{key}_drilldown_open", use_container_width=True):
+            open_ledger_account(account)